@@ -1 +1,2 @@
-from pymeasurement.measurement import *
\ No newline at end of file
+from pymeasurement.measurement import *
+from pymeasurement.util.profiler import profile
\ No newline at end of file
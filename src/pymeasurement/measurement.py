@@ -1,5 +1,8 @@
 from pymeasurement.sigfig import SigFig
+from pymeasurement.util import profiler
+import itertools
 import math
+import os
 
 class Measurement:
   """
@@ -35,10 +38,34 @@ class Measurement:
   :param UN: The units of the measurement as a string.
   :type UN: str
   """
+  correlated = False # Whether operations track correlations between Measurement objects. See Measurement.setCorrelated.
+  strictUnits = False # Whether apply_func rejects expressions with dimension errors. See Measurement.setStrictUnits.
+  inputIds = itertools.count(int.from_bytes(os.urandom(6), 'big') << 20) # Identifiers of independent inputs, offset randomly per process so that pickled inputs from different processes do not collide.
+
+  def setStrictUnits(value):
+    """
+    Sets whether apply_func and the NumPy ufuncs reject expressions with dimension errors, such as the log of a length or the sum of a length and a time. When disabled, these expressions emit a UnitWarning and give a result without units, or with the units given by passing a "units" kwarg. When enabled, they raise, as do given units that do not match the derived units. See :func:`pymeasurement.util.units.resultUnits`.
+
+    :param value: Whether to check units strictly.
+    :type value: bool
+    """
+    Measurement.strictUnits = value
+
+  def setCorrelated(value):
+    """
+    Sets whether operations track correlations between Measurement objects. When enabled, every derived Measurement object carries a sparse sensitivity vector holding the contribution of each independent input to its absolute uncertainty, and its uncertainty is the root sum of squares of the vector. A Measurement object used twice is then correlated with itself, so x - x has zero uncertainty and x * x has twice the relative uncertainty of x. Operators, Measurement.sum, Measurement.to, Measurement.apply_func, compiled formulas, NumPy ufuncs and derived MeasurementTable columns propagate sensitivities, and a deepCopy is fully correlated with its original.
+
+    :param value: Whether to track correlations.
+    :type value: bool
+    """
+    Measurement.correlated = value
+
   def __init__(self, sample, precision=None, uncertainty=None, uncertaintyPercent=False, digital=False, analog=False, units=None, P=None, U=None, UP=False, D=False, A=False, UN=None):
     """
     Measurement Constructor
     """
+    if profiler.active is not None:
+      profiler.active.count('Measurement')
     if P is not None:
       precision = P
     if U is not None:
@@ -88,46 +115,10 @@ class Measurement:
       self.uncertainty = SigFig(str(self.uncertainty.decimalValue), sigfigs=(2 if self.uncertainty < SigFig('2', constant=True) else 1))
 
     #Determine Units
-    #Will use units class to allow for conversions later.
-    self.units = units
-    self.nUnits = [i.strip('() ') for i in self.units.split('*')] if self.units is not None else []
-    self.dUnits = []
-    if self.units is not None:
-      if '/' in units:
-        nUnitsStr, dUnitsStr = self.units.split('/')
-        nUnitsStr = nUnitsStr.strip('() ')
-        dUnitsStr = dUnitsStr.strip('() ')
-        self.nUnits = [i.strip('() ') for i in nUnitsStr.split('*')]
-        self.dUnits = [i.strip('() ') for i in dUnitsStr.split('*')]
-        if '^' in nUnitsStr:
-          newNUnits = []
-          for i in self.nUnits:
-            if '^' in i:
-              i, repeat = i.split('^')
-              for n in range(int(repeat)-1):
-                newNUnits.append(i)
-            newNUnits.append(i)
-          self.nUnits = newNUnits
-        if '^' in dUnitsStr:
-          newDUnits = []
-          for i in self.dUnits:
-            if '^' in i:
-              i, repeat = i.split('^')
-              for n in range(int(repeat)-1):
-                newDUnits.append(i)
-            newDUnits.append(i)
-          self.dUnits = newDUnits
-    newNUnits = self.nUnits
-    newDUnits = self.dUnits
-    for i in self.nUnits:
-      if i in newDUnits:
-        newNUnits.remove(i)
-        newDUnits.remove(i)
-    #Sort units alphabetically
-    self.nUnits=sorted(newNUnits)
-    self.dUnits=sorted(newDUnits)
+    self.nUnits, self.dUnits = (list(u) for u in Measurement.parseUnits(units))
     #Reformat units string
     self.units = Measurement.formatUnits(self.nUnits, self.dUnits)
+    self.sensitivities = None #Contribution of each independent input to the absolute uncertainty, in correlated mode.
 
   def fromStr(string):
     """Creates a Measurement object from a string.
@@ -193,6 +184,24 @@ class Measurement:
     """
     return Measurement.fromStr(f'{f}c {units}')
   
+  def fromEstimate(value, uncertainty, units=None):
+    """
+    Creates a Measurement from a computed estimate and its standard uncertainty, such as a fitted parameter. The uncertainty is rounded to 2 significant figures and the sample is rounded to the same decimal place. If the uncertainty is zero or not finite, the sample is kept at full float precision with no uncertainty.
+
+    :param value: The estimate.
+    :type value: float
+    :param uncertainty: The standard uncertainty of the estimate.
+    :type uncertainty: float
+    :param units: The units of the estimate.
+    :type units: str or None
+    :return: The Measurement created from the estimate.
+    :rtype: Measurement
+    """
+    if not math.isfinite(uncertainty) or uncertainty <= 0:
+      return Measurement(SigFig(repr(float(value))), units=units)
+    uncertainty = SigFig(repr(float(uncertainty)), sigfigs=2)
+    return Measurement(SigFig(repr(float(value)), decimals=uncertainty.decimals), uncertainty=uncertainty, units=units)
+
   def toAbsolute(self):
     """
     Converts the uncertainty to an absolute value. Note that this mutates the object.
@@ -239,16 +248,183 @@ class Measurement:
   
   def deepCopy(self):
     """
-    Returns a deep copy of the Measurement object.
+    Returns a deep copy of the Measurement object. The fields are copied directly, without parsing the units again. In correlated mode, the copy is the same quantity as the original, so it shares the sensitivities of the original and is fully correlated with it.
 
     :return: A deep copy of the Measurement object.
     :rtype: Measurement
     """
-    return Measurement(self.sample.deepCopy(), uncertainty = self.uncertainty.deepCopy() if self.uncertainty is not None else None, uncertaintyPercent = self.uncertaintyPercent, units=self.units)
+    if profiler.active is not None:
+      profiler.active.count('Measurement.deepCopy')
+    new = Measurement.__new__(Measurement)
+    new.sample = self.sample.deepCopy()
+    new.uncertainty = self.uncertainty.deepCopy() if self.uncertainty is not None else None
+    new.uncertaintyPercent = self.uncertaintyPercent
+    new.nUnits = list(self.nUnits)
+    new.dUnits = list(self.dUnits)
+    new.units = self.units
+    new.sensitivities = Measurement.copySensitivities(self)
+    return new
+
+  def copySensitivities(m):
+    """
+    Returns a copy of the sensitivities of a Measurement object, for a copy of it. In correlated mode, an independent input is given its identifier first, so that the copy is correlated with the original whether or not the original was used before.
+
+    :param m: The Measurement object.
+    :type m: Measurement
+    :return: The sensitivities.
+    :rtype: dict or None
+    """
+    if Measurement.correlated:
+      return dict(m.sensitivityVector())
+    return dict(m.sensitivities) if m.sensitivities is not None else None
+
+  def __getstate__(self):
+    """
+    Returns the minimal state of the Measurement object. The numerator and denominator units are recomputed from the units string.
+
+    :return: The state of the sample, the state of the uncertainty, whether the uncertainty is a percent, the units and the sensitivities.
+    :rtype: tuple
+    """
+    return (self.sample.__getstate__(), self.uncertainty.__getstate__() if self.uncertainty is not None else None, self.uncertaintyPercent, self.units, self.sensitivities)
+
+  def fromState(sample, uncertainty, uncertaintyPercent, units, sensitivities=None):
+    """
+    Creates a Measurement object from the state returned by __getstate__, without rounding the sample or uncertainty again.
+
+    :param sample: The state of the sample.
+    :type sample: tuple
+    :param uncertainty: The state of the uncertainty.
+    :type uncertainty: tuple or None
+    :param uncertaintyPercent: Whether the uncertainty is a percent.
+    :type uncertaintyPercent: bool
+    :param units: The units.
+    :type units: str or None
+    :param sensitivities: The sensitivities, in correlated mode.
+    :type sensitivities: dict or None
+    :return: The Measurement object.
+    :rtype: Measurement
+    """
+    new = Measurement.__new__(Measurement)
+    new.sample = SigFig.fromState(*sample)
+    new.uncertainty = SigFig.fromState(*uncertainty) if uncertainty is not None else None
+    new.uncertaintyPercent = uncertaintyPercent
+    new.nUnits, new.dUnits = (list(u) for u in Measurement.parseUnits(units))
+    new.units = units
+    new.sensitivities = sensitivities
+    return new
+
+  def __reduce__(self):
+    """
+    Returns the compact pickled form of the Measurement object.
+
+    :return: The function to rebuild the Measurement object and its arguments.
+    :rtype: tuple
+    """
+    return (Measurement.fromState, self.__getstate__())
+
+  def sensitivityVector(self):
+    """
+    Returns the sensitivities of the Measurement object, as used in correlated mode. A Measurement object that was not derived from others is an independent input, and is given a new identifier the first time it is used.
+
+    :return: The contribution of each independent input to the absolute uncertainty.
+    :rtype: dict
+    """
+    if self.sensitivities is None:
+      if self.uncertainty is None:
+        self.sensitivities = {}
+      else:
+        u = float(self.uncertainty.decimalValue)
+        if self.uncertaintyPercent:
+          u *= abs(float(self.sample.decimalValue)) / 100
+        self.sensitivities = {next(Measurement.inputIds): u}
+    return self.sensitivities
+
+  def correlate(self, terms):
+    """
+    Sets the sensitivities of a derived Measurement object to a linear combination of the sensitivities of its inputs, and sets its absolute uncertainty to their root sum of squares, rounded to the decimal place of the sample. Only the inputs present in any term are stored, so the vectors stay sparse.
+
+    :param terms: The (partial derivative, input Measurement object) pairs.
+    :type terms: Iterable<tuple>
+    :return: This Measurement object.
+    :rtype: Measurement
+    """
+    combined = {}
+    for derivative, m in terms:
+      for i, c in m.sensitivityVector().items():
+        combined[i] = combined.get(i, 0.0) + derivative * c
+    self.sensitivities = {i: c for i, c in combined.items() if c != 0}
+    if combined or self.uncertainty is not None:
+      u = math.sqrt(math.fsum(c * c for c in self.sensitivities.values()))
+      self.uncertainty = SigFig(repr(u), decimals=self.sample.decimals)
+      self.uncertaintyPercent = False
+    return self
+
+  def to(self, units):
+    """
+    Returns a copy of the Measurement converted to the given units. The conversion factor is treated as a constant, so the significant figures of the sample are kept. Percent uncertainties are unchanged and absolute uncertainties are converted with the sample.
+
+    :param units: The units to convert to.
+    :type units: str or None
+    :return: The converted Measurement object.
+    :rtype: Measurement
+    """
+    from pymeasurement.util.units import registry
+    return self.scale(registry.conversionFactor(self.units, units), units)
+
+  def scale(self, factor, units):
+    """
+    Returns a copy of the Measurement multiplied by an exact conversion factor and given new units.
+
+    :param factor: The conversion factor.
+    :type factor: Decimal
+    :param units: The units of the result.
+    :type units: str or None
+    :return: The scaled Measurement object.
+    :rtype: Measurement
+    """
+    if factor == 1:
+      scaled = Measurement(self.sample.deepCopy(), uncertainty=self.uncertainty.deepCopy() if self.uncertainty is not None else None, uncertaintyPercent=self.uncertaintyPercent, units=units)
+      scaled.sensitivities = Measurement.copySensitivities(self)
+      return scaled
+    derivative = float(factor)
+    factor = SigFig(str(factor), constant=True)
+    uncertainty = self.uncertainty
+    if uncertainty is not None and not self.uncertaintyPercent:
+      uncertainty = uncertainty * factor
+    scaled = Measurement(self.sample * factor, uncertainty=uncertainty, uncertaintyPercent=self.uncertaintyPercent, units=units)
+    if Measurement.correlated:
+      scaled.correlate([(derivative, self)])
+    return scaled
+
+  def formula(string):
+    """
+    Compiles a formula, such as "F = m * a / t**2", for evaluation over columns of Measurement objects. The formula follows the same rules as the Measurement operators, but is parsed and unit checked once instead of once per row.
+
+    :param string: The formula.
+    :type string: str
+    :return: The compiled formula, which is called with the column of each variable.
+    :rtype: pymeasurement.util.formula.Formula
+    """
+    from pymeasurement.util.formula import Formula
+    return Formula(string)
+
+  def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+    """
+    Implements the NumPy ufunc protocol, so that ufuncs such as np.sin and np.sqrt propagate uncertainty with the same rules as apply_func. See :func:`pymeasurement.util.array.ufunc`.
+    """
+    from pymeasurement.util.array import ufunc as arrayUfunc
+    return arrayUfunc(ufunc, method, *inputs, **kwargs)
+
+  def __array_function__(self, func, types, args, kwargs):
+    """
+    Implements the NumPy array function protocol. See :func:`pymeasurement.util.array.arrayFunction`.
+    """
+    from pymeasurement.util.array import arrayFunction
+    return arrayFunction(func, args, kwargs)
 
   def apply_func(func, **kwargs):
     """
-    Applies a function to the sample and uncertainty of the Measurement object. Based on the Generalized Uncertainty Propagation Formula. Suggest the units of the result by passing a "units" kwarg.
+    Applies a function to the sample and uncertainty of the Measurement object. Based on the Generalized Uncertainty Propagation Formula. The units of the result are derived from the units of the inputs. If units are given by passing a "units" kwarg, the result is converted to them. If the units cannot be derived, such as for the log of a length, or the given units do not match, a UnitWarning is emitted, unless strict units are on (see Measurement.setStrictUnits), in which case an exception raises. See :func:`pymeasurement.util.units.resultUnits`.
 
     :param func: The function expression to apply.
     :type func: string
@@ -261,51 +437,136 @@ class Measurement:
       units = kwargs.pop('units')
 
     # Convert the measurement kwargs to absolute uncertainties
+    inputs = dict(kwargs)
     for i in kwargs.keys():
       kwargs[i] = Measurement.absolute(kwargs[i])
 
+    # Derive the units of the result from the units of the inputs, and check them against the given units
+    from pymeasurement.util.units import registry, resultUnits, unitPowers
+    given = units
+    units = resultUnits(func, {i: kwargs[i].units for i in kwargs}, given)
+
+    # Evaluate the value, uncertainty and partial derivatives symbolically, reusing the derived expressions when the persistent cache is enabled
+    from pymeasurement.util import cache
+    expressions = Measurement.propagationExpressions(func, list(kwargs.keys())) if cache.active is not None else None
+    value, uncertainty, partials = Measurement.evaluateSymbolic(func, kwargs, expressions)
+    eval_func = SigFig(value, sigfigs=min((kwargs[i].sample.sigfigs for i in kwargs.keys())))
+    eval_uncertainty = SigFig(uncertainty, decimals=eval_func.decimals)
+
+    # Return the Measurement object with the function applied
+    result = Measurement(eval_func, uncertainty=eval_uncertainty, units=units)
+    if Measurement.correlated:
+      # Combine the sensitivities of the inputs, weighted by the evaluated partial derivatives
+      result.correlate([(partials[i], inputs[i]) for i in kwargs.keys()])
+    if given is not None and unitPowers(given) != unitPowers(units) and registry.compatible(units, given):
+      result = result.to(given)
+    return result
+
+  def deriveExpressions(func, variables):
+    """
+    Derives a function expression, its partial derivatives and its Generalized Uncertainty Propagation Formula with sympy.
+
+    :param func: The function expression.
+    :type func: string
+    :param variables: The names of the inputs.
+    :type variables: list
+    :return: The expression, the partial derivative with respect to each input and the uncertainty expression, in terms of a symbol per input and a symbol δ per input uncertainty.
+    :rtype: tuple
+    """
     # Generalized Uncertainty Propagation Formula
     # \delta f = \sqrt{\sum_{i=1}^{n} \left(\frac{\partial f}{\partial x_i}\right)^2 \delta x_i^2}
-    from sympy import Symbol, diff, sqrt, sympify
-    
-    # Define each of the kwargs as a symbol
-    symbols = {i: Symbol(i) for i in kwargs.keys()}
+    from sympy import Symbol, diff, sqrt
 
-    # Convert the function expression to a sympy expression
-    func = sympify(func)
+    # Define each of the inputs as a symbol
+    symbols = {i: Symbol(i) for i in variables}
 
-    # Evaluate the function with the given kwargs
-    eval_func = func
-    for i in kwargs.keys():
-      eval_func = eval_func.subs(symbols[i], float(kwargs[i].sample.value))
-    eval_func = SigFig(str(eval_func.evalf()), sigfigs=min((kwargs[i].sample.sigfigs for i in kwargs.keys())))
+    # Convert the function expression to a sympy expression
+    from pymeasurement.util.units import parseExpression
+    func = parseExpression(func, symbols)
+    if profiler.active is not None:
+      profiler.active.count('apply_func.sympify')
 
     # Calculate the partial derivative of the function with respect to each symbol
     partials = {i: diff(func, symbols[i]) for i in symbols}
+    if profiler.active is not None:
+      profiler.active.count('apply_func.diff', len(symbols))
 
     # Define each of the uncertainties as \delta x_i
-    uncertainties = {f'δ{i}': Symbol(f'δ{i}') for i in kwargs.keys()}
+    uncertainties = {f'δ{i}': Symbol(f'δ{i}') for i in variables}
 
     # Determine the general uncertainty propagation formula
     func_uncertainty = sqrt(sum([partials[i]**2 * uncertainties[f'δ{i}']**2 for i in partials]))
+    return func, partials, func_uncertainty
+
+  expressionsCache = {} # (expression, variables) -> derived expressions, partial derivatives and uncertainty expression.
+
+  def propagationExpressions(func, variables):
+    """
+    Returns the expressions of :meth:`deriveExpressions`, derived with sympy once per expression and variables. They are cached in memory and, when it is enabled, in the persistent cache (see :mod:`pymeasurement.util.cache`), so a warm start does no symbolic derivation. The expressions are still evaluated with sympy, so results are the same with and without the cache.
+
+    :param func: The function expression.
+    :type func: string
+    :param variables: The names of the inputs.
+    :type variables: list
+    :return: The expression, the partial derivatives and the uncertainty expression.
+    :rtype: tuple
+    """
+    key = (str(func), tuple(variables))
+    if key in Measurement.expressionsCache:
+      return Measurement.expressionsCache[key]
+    from pymeasurement.util import cache
+    expressions = cache.active.get('expressions', repr(key)) if cache.active is not None else None
+    if expressions is None:
+      expressions = Measurement.deriveExpressions(func, variables)
+      if cache.active is not None:
+        cache.active.put('expressions', repr(key), expressions)
+    if len(Measurement.expressionsCache) >= 4096:
+      Measurement.expressionsCache.clear()
+    Measurement.expressionsCache[key] = expressions
+    return expressions
+
+  def evaluateSymbolic(func, kwargs, expressions=None):
+    """
+    Evaluates a function expression and its uncertainty with sympy, substituting the inputs into the Generalized Uncertainty Propagation Formula.
+
+    :param func: The function expression.
+    :type func: string
+    :param kwargs: The inputs, with absolute uncertainties.
+    :type kwargs: dict
+    :param expressions: The expressions of :meth:`deriveExpressions`. If None, they are derived.
+    :type expressions: tuple or None
+    :return: The value and uncertainty as strings, and the value of each partial derivative if correlated mode is on.
+    :rtype: tuple
+    """
+    from sympy import Symbol
+    func, partials, func_uncertainty = expressions if expressions is not None else Measurement.deriveExpressions(func, list(kwargs.keys()))
+    symbols = {i: Symbol(i) for i in kwargs.keys()}
+    uncertainties = {f'δ{i}': Symbol(f'δ{i}') for i in kwargs.keys()}
+
+    # Evaluate the function with the given kwargs
+    eval_func = func
+    for i in kwargs.keys():
+      eval_func = eval_func.subs(symbols[i], float(kwargs[i].sample.value))
+    if profiler.active is not None:
+      profiler.active.count('apply_func.subs', len(kwargs))
+      profiler.active.count('apply_func.evalf')
+    eval_func = str(eval_func.evalf())
 
     # Evaluate the uncertainty with the given kwargs
     eval_uncertainty = func_uncertainty
     for i in kwargs.keys():
       eval_uncertainty = eval_uncertainty.subs(symbols[i], float(kwargs[i].sample.value))
       eval_uncertainty = eval_uncertainty.subs(uncertainties[f'δ{i}'], float(kwargs[i].uncertainty.value))
-    eval_uncertainty = SigFig(str(eval_uncertainty.evalf()), decimals=eval_func.decimals)
-
-    # Return the Measurement object with the function applied
-    # If the function is log, exp, or trig, units will be dimensionless.
-    # Otherwise, units will need to be determined based on the units of the input.
-    # Check if the function is log, exp, or trig
-    if func.func.__name__ not in ['log', 'exp', 'sin', 'cos', 'tan', 'asin', 'acos', 'atan', 'sinh', 'cosh', 'tanh', 'asinh', 'acosh', 'atanh']:
-      # TODO: Derive the units of the function
-      # For example if the function is f(x) = 2x, then the units of f(x) are the units of x.
-      # If the function is f(x) = 1/x, then the units of f(x) are the inverse of the units of x.
-      pass
-    return Measurement(eval_func, uncertainty=eval_uncertainty, units=units)
+    if profiler.active is not None:
+      profiler.active.count('apply_func.subs', 2 * len(kwargs))
+      profiler.active.count('apply_func.evalf')
+    eval_uncertainty = str(eval_uncertainty.evalf())
+
+    values = None
+    if Measurement.correlated:
+      substitutions = {symbols[i]: float(kwargs[i].sample.value) for i in kwargs.keys()}
+      values = {i: float(partials[i].subs(substitutions).evalf()) for i in partials}
+    return eval_func, eval_uncertainty, values
   
   def __str__(self):
     """
@@ -314,7 +575,7 @@ class Measurement:
     :return: A string representation of the Measurement object.
     :rtype: str
     """
-    return str(self.sample) + (f' +/- {self.uncertainty}' + ('%' if self.uncertaintyPercent else '') if isinstance(self.uncertainty, SigFig) else '') + (f' {Measurement.formatUnits(self.nUnits, self.dUnits)}' if self.units is not None else '')
+    return str(self.sample) + (f' +/- {self.uncertainty}' + ('%' if self.uncertaintyPercent else '') if isinstance(self.uncertainty, SigFig) else '') + (f' {self.units}' if self.units is not None else '')
 
   def __repr__(self):
     """
@@ -325,6 +586,59 @@ class Measurement:
     """
     return str(self)
 
+  unitsCache = {} # Parsed units strings, shared by all Measurement objects.
+
+  def parseUnits(units):
+    """
+    Parses a units string into numerator and denominator units. Powers are expanded into repeated units, units common to the numerator and denominator are cancelled and both are sorted alphabetically. Results are cached per units string.
+
+    :param units: The units string.
+    :type units: str or None
+    :return: The numerator and denominator units.
+    :rtype: tuple
+    """
+    if units is None:
+      return ((), ())
+    parsed = Measurement.unitsCache.get(units)
+    if parsed is not None:
+      return parsed
+    if profiler.active is not None:
+      profiler.active.count('units.parse')
+    if '/' in units:
+      nUnitsStr, dUnitsStr = units.split('/')
+    else:
+      nUnitsStr, dUnitsStr = units, None
+    nUnits = Measurement.expandUnits(nUnitsStr)
+    dUnits = Measurement.expandUnits(dUnitsStr) if dUnitsStr is not None else []
+    for i in list(nUnits):
+      if i in dUnits:
+        nUnits.remove(i)
+        dUnits.remove(i)
+    parsed = (tuple(sorted(nUnits)), tuple(sorted(dUnits)))
+    if len(Measurement.unitsCache) >= 4096:
+      Measurement.unitsCache.clear()
+    Measurement.unitsCache[units] = parsed
+    return parsed
+
+  def expandUnits(unitsStr):
+    """
+    Splits one side of a units string into a list of units, expanding integer powers into repeated units.
+
+    :param unitsStr: The numerator or denominator of a units string.
+    :type unitsStr: str
+    :return: The units.
+    :rtype: list
+    """
+    units = []
+    for i in unitsStr.strip('() ').split('*'):
+      i = i.strip('() ')
+      if '^' in i and i.split('^')[1].isdigit():
+        i, repeat = i.split('^')
+        units.extend([i] * int(repeat))
+      elif i != '1':
+        units.append(i)
+    return units
+
   def multUnits(nUnits1, dUnits1, nUnits2, dUnits2):
     """
     Multiplies two sets of units.
@@ -350,9 +664,31 @@ class Measurement:
         newDUnits.remove(i)
     return (sorted(newNUnits), sorted(newDUnits))
 
+  formattedUnitsCache = {} # Formatted units strings, shared by all Measurement objects.
+
   def formatUnits(nUnits, dUnits):
     """
-    Formats a set of units into a string.
+    Formats a set of units into a string. Results are cached per set of units.
+
+    :param nUnits: The numerator units.
+    :type nUnits: list
+    :param dUnits: The denominator units.
+    :type dUnits: list
+    :return: The formatted units.
+    :rtype: str
+    """
+    key = (tuple(nUnits), tuple(dUnits))
+    if key in Measurement.formattedUnitsCache:
+      return Measurement.formattedUnitsCache[key]
+    if len(Measurement.formattedUnitsCache) >= 4096:
+      Measurement.formattedUnitsCache.clear()
+    formatted = Measurement.formatUnitsUncached(nUnits, dUnits)
+    Measurement.formattedUnitsCache[key] = formatted
+    return formatted
+
+  def formatUnitsUncached(nUnits, dUnits):
+    """
+    Formats a set of units into a string without the cache.
 
     :param nUnits: The numerator units.
     :type nUnits: list
@@ -435,6 +771,8 @@ class Measurement:
     """
     neg = self.deepCopy()
     neg.sample = -self.sample
+    if Measurement.correlated:
+      neg.correlate([(-1.0, self)])
     return neg
 
   def __add__(self, other):
@@ -447,12 +785,18 @@ class Measurement:
     :rtype: Measurement
     """
     if self.nUnits != other.nUnits or self.dUnits != other.dUnits:
-      raise Exception(f'Measurement Error: Cannot add {self} and {other} with different units.')
+      try:
+        other = other.to(self.units)
+      except Exception:
+        raise Exception(f'Measurement Error: Cannot add {self} and {other} with different units.')
     uSum = SigFig('0', constant=True)
     uncertainties = [Measurement.absolute(i).uncertainty for i in [self, other] if i.uncertainty is not None]
     for u in uncertainties:
       uSum += u
-    return Measurement(self.sample + other.sample, uncertainty=uSum if uncertainties else None, units=self.units)
+    result = Measurement(self.sample + other.sample, uncertainty=uSum if uncertainties else None, units=self.units)
+    if Measurement.correlated:
+      result.correlate([(1.0, self), (1.0, other)])
+    return result
   
   def __radd__(self, other):
     """
@@ -474,6 +818,11 @@ class Measurement:
     :returns: The difference of the two Measurement objects.
     :rtype: Measurement
     """
+    if self.nUnits != other.nUnits or self.dUnits != other.dUnits:
+      try:
+        other = other.to(self.units)
+      except Exception:
+        raise Exception(f'Measurement Error: Cannot subtract {other} from {self} with different units.')
     return -other + self
 
   def __rsub__(self, other):
@@ -485,6 +834,11 @@ class Measurement:
     :returns: The difference of the two Measurement objects.
     :rtype: Measurement
     """
+    if isinstance(other, Measurement) and (self.nUnits != other.nUnits or self.dUnits != other.dUnits):
+      try:
+        return -self.to(other.units) + other
+      except Exception:
+        raise Exception(f'Measurement Error: Cannot subtract {self} from {other} with different units.')
     return -self + other
 
   def __mul__(self, other):
@@ -503,7 +857,10 @@ class Measurement:
     for u in uncertainties:
       uSum += u
     nUnits, dUnits = Measurement.multUnits(self.nUnits, self.dUnits, other.nUnits, other.dUnits)
-    return Measurement(self.sample * other.sample, uncertainty=uSum if uncertainties else None, uncertaintyPercent=True, units=Measurement.formatUnits(nUnits, dUnits))
+    result = Measurement(self.sample * other.sample, uncertainty=uSum if uncertainties else None, uncertaintyPercent=True, units=Measurement.formatUnits(nUnits, dUnits))
+    if Measurement.correlated:
+      result.correlate([(float(other.sample.decimalValue), self), (float(self.sample.decimalValue), other)])
+    return result
   
   def __rmul__(self, other):
     """
@@ -532,7 +889,12 @@ class Measurement:
     for u in uncertainties:
       uSum += u
     nUnits, dUnits = Measurement.multUnits(self.nUnits, self.dUnits, other.dUnits, other.nUnits)
-    return Measurement(self.sample / other.sample, uncertainty=uSum if uncertainties else None, uncertaintyPercent=True, units=Measurement.formatUnits(nUnits, dUnits))
+    result = Measurement(self.sample / other.sample, uncertainty=uSum if uncertainties else None, uncertaintyPercent=True, units=Measurement.formatUnits(nUnits, dUnits))
+    if Measurement.correlated:
+      a = float(self.sample.decimalValue)
+      b = float(other.sample.decimalValue)
+      result.correlate([(1 / b, self), (-a / b ** 2, other)])
+    return result
     
   def __rtruediv__(self, other):
     """
@@ -561,21 +923,95 @@ class Measurement:
       product *= self
     return product
 
-  def sum(measurements):
+  def sum(measurements, processes=None, chunkSize=100000):
     """
-    Returns the sum of the given list of Measurement objects.
+    Returns the sum of the given list of Measurement objects. Gives the same result as adding the Measurement objects from left to right, but without creating a Measurement object per addition. The samples and absolute uncertainties are summed exactly in chunks, and the partial sums of the chunks are combined pairwise. Measurement objects with different but compatible units are converted to the units of the first.
 
     :param measurements: The list of Measurement objects.
     :type measurements: list
+    :param processes: The number of worker processes to sum the chunks in. If None, the chunks are summed in this process.
+    :type processes: int or None
+    :param chunkSize: The number of Measurement objects per chunk.
+    :type chunkSize: int
     :returns: The sum of the given list of Measurement objects.
     :rtype: Measurement
     """
+    measurements = list(measurements)
     if not measurements:
       return Measurement.fromStr('0c')
-    s = measurements[0]
-    for i in measurements[1:]:
-      s += i
-    return s
+    if len(measurements) == 1:
+      return measurements[0]
+    units = measurements[0].units
+    chunks = [measurements[i:i + chunkSize] for i in range(0, len(measurements), chunkSize)]
+    if processes is not None and len(chunks) > 1:
+      from concurrent.futures import ProcessPoolExecutor
+      with ProcessPoolExecutor(processes) as pool:
+        partials = list(pool.map(Measurement.partialSum, chunks, [units] * len(chunks)))
+    else:
+      partials = [Measurement.partialSum(chunk, units) for chunk in chunks]
+    while len(partials) > 1:
+      partials = [Measurement.combinePartialSums(*partials[i:i + 2]) for i in range(0, len(partials), 2)]
+    total, decimals, uTotal, uDecimals = partials[0]
+    sample = SigFig(str(total), decimals=decimals, constant=decimals == float('-inf'))
+    uncertainty = SigFig(str(uTotal), decimals=uDecimals, constant=uDecimals == float('-inf')) if uTotal is not None else None
+    result = Measurement(sample, uncertainty=uncertainty, units=units)
+    if Measurement.correlated:
+      result.correlate((1.0, m if m.units == units else m.to(units)) for m in measurements)
+    return result
+
+  def partialSum(measurements, units):
+    """
+    Returns the exact partial sum of a chunk of Measurement objects, as used by Measurement.sum.
+
+    :param measurements: The chunk of Measurement objects.
+    :type measurements: list
+    :param units: The units to sum in.
+    :type units: str or None
+    :returns: The sum of the samples, the least precise decimal place of the samples, the sum of the absolute uncertainties (None if there are none) and the least precise decimal place of the absolute uncertainties.
+    :rtype: tuple
+    """
+    from decimal import localcontext, MAX_PREC
+    samples = []
+    decimals = float('-inf')
+    uncertainties = []
+    uDecimals = float('-inf')
+    for m in measurements:
+      if m.units != units:
+        try:
+          m = m.to(units)
+        except Exception:
+          raise Exception(f'Measurement Error: Cannot add {measurements[0]} and {m} with different units.')
+      samples.append(m.sample.decimalValue)
+      decimals = max(decimals, m.sample.decimals)
+      if m.uncertainty is not None:
+        u = Measurement.absolute(m).uncertainty if m.uncertaintyPercent else m.uncertainty
+        uncertainties.append(u.decimalValue)
+        uDecimals = max(uDecimals, u.decimals)
+    with localcontext() as context:
+      context.prec = MAX_PREC
+      total = sum(samples[1:], samples[0])
+      uTotal = sum(uncertainties[1:], uncertainties[0]) if uncertainties else None
+    return (total, decimals, uTotal, uDecimals)
+
+  def combinePartialSums(a, b=None):
+    """
+    Combines two partial sums returned by Measurement.partialSum.
+
+    :param a: The first partial sum.
+    :type a: tuple
+    :param b: The second partial sum. If None, the first is returned.
+    :type b: tuple or None
+    :returns: The combined partial sum.
+    :rtype: tuple
+    """
+    if b is None:
+      return a
+    from decimal import localcontext, MAX_PREC
+    with localcontext() as context:
+      context.prec = MAX_PREC
+      total = a[0] + b[0]
+      uTotal = a[2] if b[2] is None else (b[2] if a[2] is None else a[2] + b[2])
+    return (total, max(a[1], b[1]), uTotal, max(a[3], b[3]))
 
   def max(measurements):
     """
@@ -607,6 +1043,143 @@ class Measurement:
         m = i
     return m
 
+  def sortKeys(measurements, exact=True):
+    """
+    Returns the samples of the given Measurement objects packed into a NumPy float array. The array is the ranking key used by the vectorized selection methods, so it is extracted once instead of comparing SigFig objects through Decimal for every comparison. Samples that differ beyond the precision of a float round to the same float, so if any float keys tie while their samples differ, the samples are returned as a NumPy object array of Decimal keys instead, which rank exactly. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :param exact: Whether to fall back to Decimal keys when float keys tie. If False, float keys are always returned.
+    :type exact: bool
+    :returns: The packed samples.
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    measurements = list(measurements)
+    keys = np.fromiter((float(m.sample.decimal) for m in measurements), dtype=float, count=len(measurements))
+    if exact:
+      distinct = len(np.unique(keys))
+      if distinct < len(keys) and len(set(m.sample.decimal for m in measurements)) > distinct:
+        return np.array([m.sample.decimal for m in measurements], dtype=object)
+    return keys
+
+  def toArrays(measurements):
+    """
+    Packs the given Measurement objects into NumPy float arrays of samples and absolute uncertainties. Missing uncertainties are NaN. All Measurement objects must have the same units. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :returns: The samples, the absolute uncertainties and the units.
+    :rtype: tuple
+    """
+    import numpy as np
+    measurements = list(measurements)
+    units = set(m.units for m in measurements)
+    if len(units) > 1:
+      raise Exception(f'Measurement Error: Cannot pack measurements with different units {units}.')
+    samples = np.fromiter((float(m.sample.decimal) for m in measurements), dtype=float, count=len(measurements))
+    uncertainties = np.fromiter((float('nan') if m.uncertainty is None else float(m.uncertainty.decimal) for m in measurements), dtype=float, count=len(measurements))
+    percent = np.fromiter((m.uncertaintyPercent for m in measurements), dtype=bool, count=len(measurements))
+    uncertainties[percent] *= np.abs(samples[percent]) / 100
+    return samples, uncertainties, units.pop() if units else None
+
+  def argsort(measurements, reverse=False):
+    """
+    Returns the indices that would sort the given Measurement objects by sample. The sort is stable. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :param reverse: Whether to sort in descending order.
+    :type reverse: bool
+    :returns: The sorting indices.
+    :rtype: numpy.ndarray
+    """
+    import numpy as np
+    keys = Measurement.sortKeys(measurements)
+    if reverse:
+      return np.argsort(-keys, kind='stable')
+    return np.argsort(keys, kind='stable')
+
+  def argmax(measurements):
+    """
+    Returns the index of the maximum of the given Measurement objects. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :returns: The index of the maximum.
+    :rtype: int
+    """
+    return int(Measurement.sortKeys(measurements).argmax())
+
+  def argmin(measurements):
+    """
+    Returns the index of the minimum of the given Measurement objects. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :returns: The index of the minimum.
+    :rtype: int
+    """
+    return int(Measurement.sortKeys(measurements).argmin())
+
+  def percentile(measurements, q):
+    """
+    Returns the Measurement object at the given percentile of the given Measurement objects, using the nearest rank (the smallest Measurement object with at least q% of the Measurement objects at or below it) so that the result keeps its own uncertainty and units. Uses introselect, which runs in linear time. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :param q: The percentile from 0 to 100.
+    :type q: float
+    :returns: The Measurement object at the given percentile.
+    :rtype: Measurement
+    """
+    import numpy as np
+    if q < 0 or q > 100:
+      raise Exception('Measurement Error: Percentile must be from 0-100.')
+    measurements = list(measurements)
+    if not measurements:
+      raise Exception('Measurement Error: Cannot take the percentile of no measurements.')
+    keys = Measurement.sortKeys(measurements)
+    rank = max(math.ceil(q * len(keys) / 100) - 1, 0)
+    return measurements[int(np.argpartition(keys, rank)[rank])]
+
+  def median(measurements):
+    """
+    Returns the median of the given Measurement objects. For an even number of Measurement objects the lower median is returned, so that the result keeps its own uncertainty and units. Uses introselect, which runs in linear time. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :returns: The median of the given Measurement objects.
+    :rtype: Measurement
+    """
+    import numpy as np
+    measurements = list(measurements)
+    if not measurements:
+      raise Exception('Measurement Error: Cannot take the median of no measurements.')
+    rank = (len(measurements) - 1) // 2
+    return measurements[int(np.argpartition(Measurement.sortKeys(measurements), rank)[rank])]
+
+  def nlargest(measurements, n):
+    """
+    Returns the n largest of the given Measurement objects in descending order. Only the n largest are sorted after a linear time partition. Requires NumPy.
+
+    :param measurements: The collection of Measurement objects.
+    :type measurements: list or numpy.ndarray or pandas.core.series.Series
+    :param n: The number of Measurement objects to return.
+    :type n: int
+    :returns: The n largest Measurement objects.
+    :rtype: list
+    """
+    import numpy as np
+    measurements = list(measurements)
+    n = min(n, len(measurements))
+    if n <= 0:
+      return []
+    keys = -Measurement.sortKeys(measurements)
+    top = np.argpartition(keys, n - 1)[:n]
+    top = top[np.argsort(keys[top], kind='stable')]
+    return [measurements[int(i)] for i in top]
+
   def average(measurements):
     """
     Returns the average of the given list of Measurement objects. Uses (max - min) / (2 * sqrt(n)) as the uncertainty.
@@ -664,6 +1237,27 @@ class Measurement:
 
     return Measurement(SigFig(str(sample), decimals=-decimals if decimals is not None else None), uncertaintyPercent=uncertaintyPercent, uncertainty=str(uncertainty) if uncertainty is not None else None, precision=float('inf') if constant else None, units=units, analog=analog, digital=digital)
   
+  def convertColumn(column, units):
+    """
+    Converts a column of Measurement objects to the given units. The conversion factor is looked up once per distinct source units instead of once per Measurement.
+
+    :param column: The Measurement objects to convert.
+    :type column: pandas.core.series.Series or list
+    :param units: The units to convert to.
+    :type units: str or None
+    :return: The converted Measurement objects, as the same type of collection.
+    :rtype: pandas.core.series.Series or list
+    """
+    from pymeasurement.util.units import registry
+    factors = {}
+    def convert(m):
+      if m.units not in factors:
+        factors[m.units] = registry.conversionFactor(m.units, units)
+      return m.scale(factors[m.units], units)
+    if hasattr(column, 'apply'):
+      return column.apply(convert)
+    return [convert(m) for m in column]
+
   def importColumn(column, uncertaintyColumn=None, df=None, **kwargs):
     """
     Convert a numeric Pandas DataFrame column to Measurement objects.
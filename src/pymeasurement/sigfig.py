@@ -1,4 +1,5 @@
 from decimal import Decimal, Context
+from pymeasurement.util import profiler
 
 class SigFig:
   """A class for representing numbers with significant figures. SigFig objects are immutable. Internally, all numbers are stored as Decimal objects (fixed point numbers) for extra accuracy and precision. The central paradigm of this class is that the decimal value is the true value of the number, and the sigfigs and decimals are the precision of the number. The sigfigs and decimals are used to determine the precision of the number when it is printed.
@@ -15,6 +16,8 @@ class SigFig:
   def __init__(self, value, sigfigs=None, decimals=None, constant=False):
     """SigFig Constructor
     """
+    if profiler.active is not None:
+      profiler.active.count('SigFig')
     self.value = value
     try:
       self.decimalValue = Decimal(value) #True Value of Decimal including extra calculation precision.
@@ -66,6 +69,8 @@ class SigFig:
     :return: The number with the new number of significant figures.
     :rtype: Decimal
     """
+    if profiler.active is not None:
+      profiler.active.count('Context')
     sign, digits, exponent = Context(prec=sigfigs).create_decimal(value).as_tuple()
     if len(digits) < sigfigs:
       missing = sigfigs - len(digits)
@@ -74,19 +79,59 @@ class SigFig:
     return Decimal((sign, digits, exponent))
 
   def deepCopy(self):
-    """Returns a deep copy of the SigFig object.
+    """Returns a deep copy of the SigFig object. The fields are copied directly, without parsing the value again.
     
     :return: A deep copy of the SigFig object.
     :rtype: SigFig
     """
-    new = SigFig('0')
+    if profiler.active is not None:
+      profiler.active.count('SigFig.deepCopy')
+    new = SigFig.__new__(SigFig)
     new.value = self.value
     new.decimalValue = self.decimalValue
     new.decimal = self.decimal
     new.sigfigs = self.sigfigs
     new.decimals = self.decimals
     return new
-  
+
+  def __getstate__(self):
+    """Returns the minimal state of the SigFig object. The true value is recomputed from the value, and the rounded value is stored as a string.
+
+    :return: The value, rounded value, sigfigs and decimals.
+    :rtype: tuple
+    """
+    return (self.value, str(self.decimal), self.sigfigs, self.decimals)
+
+  def fromState(value, decimal, sigfigs, decimals):
+    """Creates a SigFig object from the state returned by __getstate__, without rounding the value again.
+
+    :param value: The value of the number.
+    :type value: str
+    :param decimal: The rounded value of the number.
+    :type decimal: str
+    :param sigfigs: The number of significant figures.
+    :type sigfigs: int or float
+    :param decimals: The number of decimal places.
+    :type decimals: int or float
+    :return: The SigFig object.
+    :rtype: SigFig
+    """
+    new = SigFig.__new__(SigFig)
+    new.value = value
+    new.decimalValue = Decimal(value)
+    new.decimal = Decimal(decimal)
+    new.sigfigs = sigfigs
+    new.decimals = decimals
+    return new
+
+  def __reduce__(self):
+    """Returns the compact pickled form of the SigFig object.
+
+    :return: The function to rebuild the SigFig object and its arguments.
+    :rtype: tuple
+    """
+    return (SigFig.fromState, self.__getstate__())
+
   def __str__(self):
     """Returns the string representation of the SigFig object.
 
@@ -0,0 +1,311 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.util.rounding import toSigFigs
+import numpy as np
+import numpy.lib.mixins
+import operator
+
+# NumPy ufuncs evaluated as apply_func expressions. The value and partial derivatives of each expression are derived with sympy once, compiled into NumPy functions, and then evaluated over whole arrays with the Generalized Uncertainty Propagation Formula, as in Measurement.apply_func.
+functions = {
+  'sin': 'sin(x)', 'cos': 'cos(x)', 'tan': 'tan(x)',
+  'arcsin': 'asin(x)', 'arccos': 'acos(x)', 'arctan': 'atan(x)', 'arctan2': 'atan2(x, y)',
+  'sinh': 'sinh(x)', 'cosh': 'cosh(x)', 'tanh': 'tanh(x)',
+  'arcsinh': 'asinh(x)', 'arccosh': 'acosh(x)', 'arctanh': 'atanh(x)',
+  'exp': 'exp(x)', 'expm1': 'exp(x) - 1', 'exp2': '2**x',
+  'log': 'log(x)', 'log10': 'log(x, 10)', 'log2': 'log(x, 2)', 'log1p': 'log(1 + x)',
+  'sqrt': 'sqrt(x)', 'square': 'x**2', 'cbrt': 'x**(1/3)', 'reciprocal': '1/x',
+  'absolute': 'Abs(x)', 'maximum': 'Max(x, y)', 'minimum': 'Min(x, y)', 'fmax': 'Max(x, y)', 'fmin': 'Min(x, y)',
+}
+
+# Partial derivatives given explicitly, for expressions whose sympy derivative cannot be compiled into NumPy.
+derivatives = {'absolute': ['sign(x)']}
+
+# NumPy ufuncs evaluated with the Measurement operators, following their significant figure and uncertainty rules exactly.
+operators = {
+  'add': operator.add, 'subtract': operator.sub, 'multiply': operator.mul, 'divide': operator.truediv, 'true_divide': operator.truediv,
+  'negative': operator.neg, 'positive': lambda x: x, 'power': operator.pow,
+  'equal': operator.eq, 'not_equal': operator.ne, 'less': operator.lt, 'less_equal': operator.le, 'greater': operator.gt, 'greater_equal': operator.ge,
+}
+
+kernelsCache = {} # ufunc name -> (variables, value function, partial derivative functions)
+
+def kernel(name):
+  """Compiles the value and partial derivatives of a ufunc's expression into NumPy functions. Results are cached per ufunc.
+
+  :param name: The name of the ufunc.
+  :type name: str
+  :return: The variables, the value function and the partial derivative function of each variable.
+  :rtype: tuple
+  """
+  if name not in kernelsCache:
+    from sympy import Symbol, diff, lambdify, sympify
+    expression = sympify(functions[name])
+    variables = [v for v in ['x', 'y'] if Symbol(v) in expression.free_symbols]
+    symbols = [Symbol(v) for v in variables]
+    value = lambdify(symbols, expression, 'numpy')
+    partials = [lambdify(symbols, sympify(d) if name in derivatives else diff(expression, s), 'numpy') for s, d in zip(symbols, derivatives.get(name, symbols))]
+    kernelsCache[name] = (variables, value, partials)
+  return kernelsCache[name]
+
+def column(value, shape):
+  """Converts an input of a ufunc into an object array of Measurement objects with the given shape.
+
+  :param value: The input.
+  :type value: Measurement or MeasurementArray or numpy.ndarray or float
+  :param shape: The shape to broadcast to.
+  :type shape: tuple
+  :return: The Measurement objects.
+  :rtype: numpy.ndarray
+  """
+  if isinstance(value, MeasurementArray):
+    value = value.measurements
+  if isinstance(value, Measurement) or np.isscalar(value):
+    array = np.empty((), dtype=object)
+    array[()] = value
+  else:
+    array = np.asarray(value, dtype=object)
+  convert = np.frompyfunc(lambda v: v if isinstance(v, Measurement) else Measurement.fromFloat(float(v)), 1, 1)
+  return np.broadcast_to(np.asarray(convert(array), dtype=object), shape)
+
+def evaluate(name, inputs, shape):
+  """Evaluates a ufunc from functions over arrays of Measurement objects.
+
+  :param name: The name of the ufunc.
+  :type name: str
+  :param inputs: The inputs of the ufunc.
+  :type inputs: list
+  :param shape: The shape of the result.
+  :type shape: tuple
+  :return: The results.
+  :rtype: numpy.ndarray
+  """
+  variables, value, partials = kernel(name)
+  columns = [column(i, shape).ravel() for i in inputs]
+  packed = [Measurement.toArrays(c) for c in columns]
+  from pymeasurement.util.units import resultUnits
+  units = resultUnits(functions[name], {v: p[2] for v, p in zip(variables, packed)})
+  samples = [p[0] for p in packed]
+  with np.errstate(all='ignore'):
+    results = np.broadcast_to(value(*samples), samples[0].shape)
+    variance = np.zeros(len(results))
+    derivatives = [np.broadcast_to(partial(*samples), results.shape) for partial in partials]
+    for derivative, (_, u, _) in zip(derivatives, packed):
+      variance += np.where(np.isnan(u), 0, derivative * u) ** 2
+  hasUncertainty = np.zeros(len(results), dtype=bool)
+  for _, u, _ in packed:
+    hasUncertainty |= ~np.isnan(u)
+  sigfigs = [min(c[i].sample.sigfigs for c in columns) for i in range(len(results))]
+  samples = toSigFigs(results, sigfigs=np.array(sigfigs, dtype=float))
+  uncertainties = iter(toSigFigs(np.sqrt(variance)[hasUncertainty], decimals=np.array([s.decimals for s, h in zip(samples, hasUncertainty) if h], dtype=float)))
+  out = np.empty(len(results), dtype=object)
+  for i, sample in enumerate(samples):
+    out[i] = Measurement(sample, uncertainty=next(uncertainties) if hasUncertainty[i] else None, units=units)
+  if Measurement.correlated:
+    # Combine the sensitivities of the inputs, weighted by the evaluated partial derivatives, as apply_func does
+    derivatives = [d.tolist() for d in derivatives]
+    for i in range(len(results)):
+      out[i].correlate([(d[i], c[i]) for d, c in zip(derivatives, columns)])
+  return out.reshape(shape)
+
+def ufunc(function, method, *inputs, **kwargs):
+  """Implements the NumPy ufunc protocol for Measurement and MeasurementArray objects. Arithmetic and comparisons use the Measurement operators, and the ufuncs in functions use vectorized propagation kernels.
+
+  :param function: The ufunc.
+  :type function: numpy.ufunc
+  :param method: The ufunc method, such as '__call__' or 'reduce'.
+  :type method: str
+  :param inputs: The inputs of the ufunc.
+  :type inputs: tuple
+  :return: The result, or NotImplemented if the ufunc is not supported.
+  :rtype: Measurement or MeasurementArray or numpy.ndarray
+  """
+  if kwargs.get('out') is not None:
+    return NotImplemented
+  name = function.__name__
+  if method == 'reduce':
+    reductions = {'add': Measurement.sum, 'maximum': Measurement.max, 'minimum': Measurement.min}
+    if name not in reductions or set(kwargs) - {'axis'} or not wholeArray(inputs[0], kwargs.get('axis', 0)):
+      return NotImplemented
+    return reductions[name](list(elements(inputs[0])))
+  if method != '__call__' or kwargs:
+    return NotImplemented
+  shape = np.broadcast_shapes(*[np.shape(i.measurements if isinstance(i, MeasurementArray) else i) if not isinstance(i, Measurement) else () for i in inputs])
+  if name == 'power':
+    if isinstance(inputs[1], (Measurement, MeasurementArray)):
+      return NotImplemented
+    result = np.frompyfunc(operator.pow, 2, 1)(column(inputs[0], shape), np.broadcast_to(np.asarray(inputs[1], dtype=object), shape)) # The exponent is passed through as an integer, as Measurement.__pow__ expects.
+  elif name in operators:
+    result = np.frompyfunc(operators[name], len(inputs), 1)(*[column(i, shape) for i in inputs])
+  elif name in functions:
+    result = evaluate(name, inputs, shape)
+  else:
+    return NotImplemented
+  if all(isinstance(i, (Measurement, int, float)) for i in inputs):
+    return result[()] if isinstance(result, np.ndarray) else result
+  if any(isinstance(i, MeasurementArray) for i in inputs):
+    return MeasurementArray(result)
+  return result
+
+def wholeArray(value, axis):
+  """Checks whether a reduction along an axis reduces a whole array to a single value, which is the only case the Measurement reductions handle.
+
+  :param value: The array.
+  :type value: MeasurementArray or numpy.ndarray
+  :param axis: The axis.
+  :type axis: int or None
+  :return: Whether the reduction covers the whole array.
+  :rtype: bool
+  """
+  return axis is None or (np.ndim(value.measurements if isinstance(value, MeasurementArray) else value) == 1 and axis in [0, -1])
+
+def elements(value):
+  """Returns the Measurement objects of a Measurement, MeasurementArray or array.
+
+  :param value: The Measurement objects.
+  :type value: Measurement or MeasurementArray or Iterable<Measurement>
+  :return: The Measurement objects.
+  :rtype: list
+  """
+  if isinstance(value, Measurement):
+    return [value]
+  if isinstance(value, MeasurementArray):
+    return value.measurements.ravel().tolist()
+  return np.asarray(value, dtype=object).ravel().tolist()
+
+def mean(measurements):
+  """Returns the mean of Measurement objects, propagating their uncertainties as Measurement.sum does.
+
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  :return: The mean.
+  :rtype: Measurement
+  """
+  measurements = list(measurements)
+  return Measurement.sum(measurements) / len(measurements)
+
+arrayFunctions = {
+  np.sum: Measurement.sum, np.mean: mean, np.average: mean, np.median: Measurement.median,
+  np.max: Measurement.max, np.amax: Measurement.max, np.min: Measurement.min, np.amin: Measurement.min,
+  np.argmax: Measurement.argmax, np.argmin: Measurement.argmin, np.argsort: Measurement.argsort,
+  np.percentile: Measurement.percentile,
+} # NumPy functions over whole arrays, using the Measurement reductions.
+
+def arrayFunction(function, args, kwargs):
+  """Implements the NumPy array function protocol for Measurement and MeasurementArray objects.
+
+  :param function: The NumPy function.
+  :type function: function
+  :param args: The positional arguments.
+  :type args: tuple
+  :param kwargs: The keyword arguments.
+  :type kwargs: dict
+  :return: The result, or NotImplemented if the function is not supported.
+  :rtype: object
+  """
+  if function is np.sort and not kwargs:
+    measurements = elements(args[0])
+    return MeasurementArray([measurements[i] for i in Measurement.argsort(measurements)])
+  if function is np.concatenate and len(args) == 1 and not kwargs:
+    return MeasurementArray([m for a in args[0] for m in elements(a)])
+  if function not in arrayFunctions or set(kwargs) - {'axis'} or not wholeArray(args[0], kwargs.get('axis')):
+    return NotImplemented
+  return arrayFunctions[function](elements(args[0]), *args[1:])
+
+class MeasurementArray(numpy.lib.mixins.NDArrayOperatorsMixin):
+  """A class to hold an array of Measurement objects that NumPy functions and ufuncs dispatch on. ``np.sin(a)``, ``np.sqrt(a)`` and the other ufuncs in functions are evaluated with vectorized propagation kernels, arithmetic uses the Measurement operators, and ``np.sum(a)``, ``np.mean(a)`` and the other functions in arrayFunctions use the Measurement reductions. Reductions only reduce a whole array, so ``axis`` may only be None, or 0 for a 1-D array. Other NumPy functions, such as ``np.std``, are not supported and raise NumPy's TypeError.
+
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  """
+  def __init__(self, measurements):
+    """MeasurementArray Constructor
+    """
+    if isinstance(measurements, MeasurementArray):
+      measurements = measurements.measurements
+    if isinstance(measurements, np.ndarray):
+      self.measurements = measurements.astype(object)
+    else:
+      self.measurements = np.empty(len(measurements), dtype=object)
+      self.measurements[:] = list(measurements)
+
+  def __array_ufunc__(self, function, method, *inputs, **kwargs):
+    """Implements the NumPy ufunc protocol. See :func:`ufunc`.
+    """
+    return ufunc(function, method, *inputs, **kwargs)
+
+  def __array_function__(self, function, types, args, kwargs):
+    """Implements the NumPy array function protocol. See :func:`arrayFunction`.
+    """
+    return arrayFunction(function, args, kwargs)
+
+  def __array__(self, dtype=None, copy=None):
+    """Returns the Measurement objects as an object array.
+
+    :return: The Measurement objects.
+    :rtype: numpy.ndarray
+    """
+    return self.measurements
+
+  def toArrays(self):
+    """Packs the Measurement objects into NumPy float arrays. See Measurement.toArrays.
+
+    :return: The samples, the absolute uncertainties and the units.
+    :rtype: tuple
+    """
+    return Measurement.toArrays(self.measurements.ravel())
+
+  def tolist(self):
+    """Returns the Measurement objects as a list.
+
+    :return: The Measurement objects.
+    :rtype: list
+    """
+    return self.measurements.tolist()
+
+  @property
+  def shape(self):
+    """The shape of the array.
+    """
+    return self.measurements.shape
+
+  def __len__(self):
+    """Returns the number of Measurement objects.
+
+    :return: The number of Measurement objects.
+    :rtype: int
+    """
+    return len(self.measurements)
+
+  def __getitem__(self, index):
+    """Returns a Measurement object, or a MeasurementArray for a slice.
+
+    :param index: The index.
+    :type index: int or slice or numpy.ndarray
+    :return: The Measurement object or objects.
+    :rtype: Measurement or MeasurementArray
+    """
+    result = self.measurements[index]
+    return MeasurementArray(result) if isinstance(result, np.ndarray) else result
+
+  def __iter__(self):
+    """Iterates over the Measurement objects.
+
+    :return: The Measurement objects.
+    :rtype: Iterator<Measurement>
+    """
+    return iter(self.measurements)
+
+  def __str__(self):
+    """Returns the string representation of the MeasurementArray.
+
+    :return: The string representation of the MeasurementArray.
+    :rtype: str
+    """
+    return '[' + ', '.join(str(m) for m in self.measurements.ravel()) + ']'
+
+  def __repr__(self):
+    """Returns the string representation of the MeasurementArray.
+
+    :return: The string representation of the MeasurementArray.
+    :rtype: str
+    """
+    return f'MeasurementArray({self})'
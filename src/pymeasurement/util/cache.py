@@ -0,0 +1,213 @@
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+import time
+
+active = None # The PersistentCache currently in use, or None when persistent caching is disabled.
+
+cacheFormat = 1 # Version of the layout of cached values. Bumped whenever a cached value changes shape.
+
+def libraryVersion():
+  """Returns the installed version of pymeasurement, used to key cached values so that an upgrade never reads values written by another version.
+
+  :return: The version.
+  :rtype: str
+  """
+  try:
+    from importlib.metadata import version
+    return version('pymeasurement')
+  except Exception:
+    return 'unknown'
+
+def defaultDirectory():
+  """Returns the directory of the persistent cache, from the PYMEASUREMENT_CACHE_DIR environment variable or ~/.cache/pymeasurement.
+
+  :return: The directory.
+  :rtype: str
+  """
+  return os.environ.get('PYMEASUREMENT_CACHE_DIR') or os.path.join(os.path.expanduser('~'), '.cache', 'pymeasurement')
+
+class PersistentCache:
+  """A class to store the results of expensive, deterministic work, such as derived apply_func expressions, derived units and parsed compounds, in a SQLite database shared by every process that uses the same directory. Each value is keyed by a hash of its kind, its content, the library version and cacheFormat. When the stored values exceed maxBytes, the least recently used values are evicted. The database uses write-ahead logging and waits for locks held by other processes, so many short-lived workers can read and write it at once.
+
+  Values are stored with pickle, so the directory must only be writable by trusted users.
+
+  :param directory: The directory of the database. Defaults to :func:`defaultDirectory`.
+  :type directory: str or None
+  :param maxBytes: The largest total size of the stored values.
+  :type maxBytes: int
+  :param version: The version to key values with. Defaults to the installed version of pymeasurement.
+  :type version: str or None
+  :param timeout: The number of seconds to wait for a lock held by another process.
+  :type timeout: float
+  """
+  def __init__(self, directory=None, maxBytes=64 * 2 ** 20, version=None, timeout=30.0):
+    """PersistentCache Constructor
+    """
+    self.directory = directory if directory is not None else defaultDirectory()
+    os.makedirs(self.directory, exist_ok=True)
+    self.path = os.path.join(self.directory, 'cache.sqlite3')
+    self.maxBytes = maxBytes
+    self.version = version if version is not None else libraryVersion()
+    self.timeout = timeout
+    self.lock = threading.Lock()
+    self.connection = None
+    self.pid = None # The process that opened the connection. A forked process opens its own.
+    self.hits = 0
+    self.misses = 0
+
+  def connect(self):
+    """Returns the connection of this process, opening it and creating the table if needed.
+
+    :return: The connection.
+    :rtype: sqlite3.Connection
+    """
+    if self.connection is None or self.pid != os.getpid():
+      connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+      connection.execute('PRAGMA journal_mode=WAL')
+      connection.execute('PRAGMA synchronous=NORMAL')
+      connection.execute('CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, kind TEXT, value BLOB, size INTEGER, used REAL)')
+      connection.execute('CREATE INDEX IF NOT EXISTS entriesUsed ON entries (used)')
+      self.connection = connection
+      self.pid = os.getpid()
+    return self.connection
+
+  def key(self, kind, content):
+    """Returns the key of a value.
+
+    :param kind: The kind of value, such as 'expressions'.
+    :type kind: str
+    :param content: The content the value was computed from.
+    :type content: str
+    :return: The key.
+    :rtype: str
+    """
+    return hashlib.sha256(f'{cacheFormat}\0{self.version}\0{kind}\0{content}'.encode()).hexdigest()
+
+  def get(self, kind, content):
+    """Returns a stored value and marks it as recently used. A database that cannot be read counts as a miss.
+
+    :param kind: The kind of value.
+    :type kind: str
+    :param content: The content the value was computed from.
+    :type content: str
+    :return: The value, or None if it is not stored.
+    :rtype: object
+    """
+    key = self.key(kind, content)
+    with self.lock:
+      try:
+        connection = self.connect()
+        row = connection.execute('SELECT value FROM entries WHERE key = ?', (key,)).fetchone()
+        if row is not None:
+          connection.execute('UPDATE entries SET used = ? WHERE key = ?', (time.time(), key))
+      except sqlite3.Error:
+        row = None
+    if row is None:
+      self.misses += 1
+      return None
+    self.hits += 1
+    return pickle.loads(row[0])
+
+  def put(self, kind, content, value):
+    """Stores a value, evicting the least recently used values if the cache is over maxBytes. A database that cannot be written is skipped, since every value can be computed again.
+
+    :param kind: The kind of value.
+    :type kind: str
+    :param content: The content the value was computed from.
+    :type content: str
+    :param value: The value. Must not be None.
+    :type value: object
+    """
+    blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    if len(blob) > self.maxBytes:
+      return
+    with self.lock:
+      try:
+        connection = self.connect()
+        connection.execute('BEGIN IMMEDIATE')
+        try:
+          connection.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?)', (self.key(kind, content), kind, blob, len(blob), time.time()))
+          self.evict(connection)
+          connection.execute('COMMIT')
+        except BaseException:
+          connection.execute('ROLLBACK')
+          raise
+      except sqlite3.Error:
+        pass
+
+  def evict(self, connection):
+    """Deletes the least recently used values until the stored values fit in maxBytes. Runs inside the transaction of put.
+
+    :param connection: The connection.
+    :type connection: sqlite3.Connection
+    """
+    excess = connection.execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0] - self.maxBytes
+    if excess <= 0:
+      return
+    keys = []
+    for key, size in connection.execute('SELECT key, size FROM entries ORDER BY used'):
+      keys.append((key,))
+      excess -= size
+      if excess <= 0:
+        break
+    connection.executemany('DELETE FROM entries WHERE key = ?', keys)
+
+  def size(self):
+    """Returns the total size of the stored values.
+
+    :return: The size in bytes.
+    :rtype: int
+    """
+    with self.lock:
+      return self.connect().execute('SELECT COALESCE(SUM(size), 0) FROM entries').fetchone()[0]
+
+  def clear(self):
+    """Deletes every stored value.
+    """
+    with self.lock:
+      self.connect().execute('DELETE FROM entries')
+
+  def close(self):
+    """Closes the connection of this process.
+    """
+    with self.lock:
+      if self.connection is not None and self.pid == os.getpid():
+        self.connection.close()
+      self.connection = None
+
+  def __len__(self):
+    """Returns the number of stored values.
+
+    :return: The number of values.
+    :rtype: int
+    """
+    with self.lock:
+      return self.connect().execute('SELECT COUNT(*) FROM entries').fetchone()[0]
+
+def enable(directory=None, maxBytes=64 * 2 ** 20, **kwargs):
+  """Enables the persistent cache for derived apply_func expressions, derived units and parsed compounds.
+
+  :param directory: The directory of the database. Defaults to :func:`defaultDirectory`.
+  :type directory: str or None
+  :param maxBytes: The largest total size of the stored values.
+  :type maxBytes: int
+  :param kwargs: Keyword arguments to pass to PersistentCache.
+  :type kwargs: dict
+  :return: The cache.
+  :rtype: PersistentCache
+  """
+  global active
+  disable()
+  active = PersistentCache(directory, maxBytes=maxBytes, **kwargs)
+  return active
+
+def disable():
+  """Disables the persistent cache, closing its connection.
+  """
+  global active
+  if active is not None:
+    active.close()
+  active = None
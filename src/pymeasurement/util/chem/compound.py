@@ -1,10 +1,12 @@
 from pymeasurement.util.parser import Parser
 from pymeasurement.util.chem.element import Element
 from pymeasurement.measurement import Measurement
+from pymeasurement.util import profiler
+from pymeasurement.sigfig import SigFig
 import re
 
 class Compound(Parser):
-  """A class to represent a chemical compound.
+  """A class to represent a chemical compound. Parsed compounds are kept in the persistent cache when it is enabled (see :mod:`pymeasurement.util.cache`).
 
   :param string: The string to parse.
   :type string: str
@@ -24,6 +26,14 @@ class Compound(Parser):
   def __init__(self, string):
     """Compound Constructor
     """
+    if profiler.active is not None:
+      profiler.active.count('Compound')
+    from pymeasurement.util import cache
+    if cache.active is not None:
+      state = cache.active.get('compound', string)
+      if state is not None:
+        self.__dict__.update(Compound.fromState(*state).__dict__)
+        return
     super().__init__(string)
     self.composition = {}
     self.element = ""
@@ -33,6 +43,7 @@ class Compound(Parser):
     self.subString = ""
     self.compoundString = self.string
     self.stateString = ""
+    self.latexString = None # Latex representation, computed on first latex print.
     self.splitString(self.string, checks = self.split)
     for i in range(len(self.compoundString)):
       if not self.compoundString[i].isdigit():
@@ -40,6 +51,56 @@ class Compound(Parser):
         break
     self.readByCharacter(self.compoundString, checks = self.checks, endSetup = self.save)
     self.mass = Measurement.sum([e.mass * Measurement.fromFloat(self.composition[e]) for e in self.composition])
+    self.key = Compound.hillNotation(self.composition) # Canonical composition, used for equality and hashing.
+    if cache.active is not None:
+      cache.active.put('compound', string, self.__getstate__())
+
+  def __getstate__(self):
+    """Get the minimal state of the compound.
+
+    :return: The string, compound string, state string, composition and mass of the compound.
+    :rtype: tuple
+    """
+    return (self.string, self.compoundString, self.stateString, tuple(self.composition.items()), self.mass)
+
+  def fromState(string, compoundString, stateString, composition, mass):
+    """Create a compound from the state returned by __getstate__, without parsing the string again.
+
+    :param string: The string the compound was parsed from.
+    :type string: str
+    :param compoundString: The compound string without its state.
+    :type compoundString: str
+    :param stateString: The state string.
+    :type stateString: str
+    :param composition: The (Element, count) pairs of the compound.
+    :type composition: tuple
+    :param mass: The molar mass of the compound.
+    :type mass: Measurement
+    :return: The compound.
+    :rtype: Compound
+    """
+    new = Compound.__new__(Compound)
+    new.string = string
+    new.composition = dict(composition)
+    new.element = ""
+    new.number = ""
+    new.parenthesesOn = False
+    new.parentheses = ')'
+    new.subString = ""
+    new.compoundString = compoundString
+    new.stateString = stateString
+    new.latexString = None
+    new.mass = mass
+    new.key = Compound.hillNotation(new.composition)
+    return new
+
+  def __reduce__(self):
+    """Get the compact pickled form of the compound.
+
+    :return: The function to rebuild the compound and its arguments.
+    :rtype: tuple
+    """
+    return (Compound.fromState, self.__getstate__())
 
   def split(self, string):
     """Split the string into a compound string and a state string.
@@ -139,18 +200,42 @@ class Compound(Parser):
     :rtype: str
     """
     if Compound.latexPrint and not textOverride:
-      allCoefficients = re.findall("\d+", self.compoundString)
-      finalString = ''
-      currentIndex = 0
-      for i in allCoefficients:
-        ind = self.compoundString[currentIndex:].index(i)
-        finalString += self.compoundString[currentIndex:currentIndex + ind]+f'_{{{i}}}'
-        currentIndex = currentIndex + ind + len(i)
-      if currentIndex < len(self.compoundString):
-        finalString += self.compoundString[currentIndex:]
-      return finalString + (self.stateString if self.stateString else '')
+      if self.latexString is None:
+        self.latexString = self.latex()
+      return self.latexString
     return self.compoundString + (self.stateString if self.stateString else '')
 
+  def latex(self):
+    """Get the latex representation of the compound.
+
+    :return: The latex representation of the compound.
+    :rtype: str
+    """
+    allCoefficients = re.findall(r"\d+", self.compoundString)
+    finalString = ''
+    currentIndex = 0
+    for i in allCoefficients:
+      ind = self.compoundString[currentIndex:].index(i)
+      finalString += self.compoundString[currentIndex:currentIndex + ind]+f'_{{{i}}}'
+      currentIndex = currentIndex + ind + len(i)
+    if currentIndex < len(self.compoundString):
+      finalString += self.compoundString[currentIndex:]
+    return finalString + (self.stateString if self.stateString else '')
+
+  def hillNotation(composition):
+    """Get the Hill notation of a composition: carbon first, hydrogen second and all other elements in alphabetical order, or all elements in alphabetical order if there is no carbon. Compounds with the same composition have the same Hill notation regardless of how their formulas are written.
+
+    :param composition: The count of each element.
+    :type composition: dict
+    :return: The Hill notation.
+    :rtype: str
+    """
+    counts = {e.string: n for e, n in composition.items()}
+    order = sorted(counts)
+    if 'C' in counts:
+      order = ['C'] + (['H'] if 'H' in counts else []) + [e for e in order if e not in ['C', 'H']]
+    return ''.join(e + (str(counts[e]) if counts[e] != 1 else '') for e in order)
+
   def __eq__(self, other):
     """Check if the compound is equal to another compound.
     
@@ -159,7 +244,9 @@ class Compound(Parser):
     :return: Whether the compounds are equal.
     :rtype: bool
     """
-    return self.composition == other.composition
+    if not isinstance(other, Compound):
+      return NotImplemented
+    return self.key == other.key
 
   def __ne__(self, other):
     """Check if the compound is not equal to another compound.
@@ -169,7 +256,17 @@ class Compound(Parser):
     :return: Whether the compounds are not equal.
     :rtype: bool
     """
-    return self.composition != other.composition
+    if not isinstance(other, Compound):
+      return NotImplemented
+    return self.key != other.key
+
+  def __hash__(self):
+    """Get the hash of the compound.
+
+    :return: The hash of the canonical composition of the compound.
+    :rtype: int
+    """
+    return hash(self.key)
   
   def massPercentComposition(self):
     """Get the mass percent composition of the compound.
@@ -185,4 +282,139 @@ class Compound(Parser):
     :return: The mole percent composition of the compound.
     :rtype: list
     """
-    return [['Element', 'Moles']]+[[str(i), self.composition[i]] for i in self.composition]
\ No newline at end of file
+    return [['Element', 'Moles']]+[[str(i), self.composition[i]] for i in self.composition]
+
+  distributionCache = {} # Isotope distribution of each element, shared by all compounds.
+
+  def isotopeDistribution(element):
+    """Get the isotope distribution of an element as arrays indexed by mass number.
+
+    :param element: The element.
+    :type element: Element
+    :return: The lowest mass number, the abundance of each mass number and the abundance times the mass of each mass number.
+    :rtype: tuple
+    """
+    import numpy as np
+    if element.string not in Compound.distributionCache:
+      isotopes = Element.isotopeTable().get(element.string)
+      if not isotopes:
+        raise Exception(f"Compound Exception: {element.string} has no natural isotopes.")
+      offset = min(i[0] for i in isotopes)
+      p = np.zeros(max(i[0] for i in isotopes) - offset + 1)
+      w = np.zeros(len(p))
+      for number, mass, abundance in isotopes:
+        p[number - offset] += float(abundance)
+        w[number - offset] += float(abundance) * float(mass)
+      Compound.distributionCache[element.string] = (offset, p, w)
+    return Compound.distributionCache[element.string]
+
+  def prune(distribution, threshold):
+    """Remove the leading and trailing peaks of a distribution below a fraction of its largest peak.
+
+    :param distribution: The lowest mass number, abundances and abundance weighted masses.
+    :type distribution: tuple
+    :param threshold: The fraction of the largest peak below which peaks are removed.
+    :type threshold: float
+    :return: The pruned distribution.
+    :rtype: tuple
+    """
+    import numpy as np
+    offset, p, w = distribution
+    kept = np.nonzero(p >= threshold * p.max())[0]
+    return (offset + kept[0], p[kept[0]:kept[-1] + 1], w[kept[0]:kept[-1] + 1])
+
+  def convolve(a, b, threshold):
+    """Combine two distributions, as for the two halves of a molecule, and prune the result.
+
+    :param a: The first distribution.
+    :type a: tuple
+    :param b: The second distribution.
+    :type b: tuple
+    :param threshold: The fraction of the largest peak below which peaks are removed.
+    :type threshold: float
+    :return: The combined distribution.
+    :rtype: tuple
+    """
+    import numpy as np
+    return Compound.prune((a[0] + b[0], np.convolve(a[1], b[1]), np.convolve(a[2], b[1]) + np.convolve(a[1], b[2])), threshold)
+
+  def convolutionPattern(counts, threshold):
+    """Compute the isotope distribution of a composition by pruned polynomial multiplication, raising each element to its count by repeated squaring.
+
+    :param counts: The (Element, count) pairs of the composition.
+    :type counts: list
+    :param threshold: The fraction of the largest peak below which peaks are removed.
+    :type threshold: float
+    :return: The distribution of the composition.
+    :rtype: tuple
+    """
+    import numpy as np
+    inner = min(threshold, 1e-12) # Intermediate products are pruned near machine precision so that pruning does not shift the final abundances.
+    result = (0, np.ones(1), np.zeros(1))
+    for element, count in counts:
+      square = Compound.isotopeDistribution(element)
+      while count:
+        if count & 1:
+          result = Compound.convolve(result, square, inner)
+        count >>= 1
+        if count:
+          square = Compound.convolve(square, square, inner)
+    return Compound.prune(result, threshold)
+
+  def fftPattern(counts, threshold):
+    """Compute the isotope distribution of a composition with one FFT per element. The abundance weighted masses follow from the derivative of each element's power, n * F(w) * F(p)^(n - 1).
+
+    :param counts: The (Element, count) pairs of the composition.
+    :type counts: list
+    :param threshold: The fraction of the largest peak below which peaks are removed.
+    :type threshold: float
+    :return: The distribution of the composition.
+    :rtype: tuple
+    """
+    import numpy as np
+    distributions = [(Compound.isotopeDistribution(element), count) for element, count in counts]
+    offset = sum(d[0] * count for d, count in distributions)
+    size = 1 + sum((len(d[1]) - 1) * count for d, count in distributions)
+    n = 1 << (size - 1).bit_length()
+    transforms = [(np.fft.rfft(d[1], n), np.fft.rfft(d[2], n), count) for d, count in distributions]
+    P = np.ones(n // 2 + 1, dtype=complex)
+    for p, _, count in transforms:
+      P *= p ** count
+    W = np.zeros(n // 2 + 1, dtype=complex)
+    for i, (p, w, count) in enumerate(transforms):
+      term = count * w * p ** (count - 1)
+      for j, (q, _, other) in enumerate(transforms):
+        if j != i:
+          term *= q ** other
+      W += term
+    p = np.fft.irfft(P, n)[:size]
+    w = np.fft.irfft(W, n)[:size]
+    p[p < threshold * p.max()] = 0
+    return Compound.prune((offset, p, np.where(p > 0, w, 0)), threshold)
+
+  def isotope_pattern(self, threshold=1e-6, method='auto', decimals=6):
+    """Compute the isotopic envelope of the compound by convolving the natural isotope distributions of its elements. Peaks are binned by nominal mass, and the mass of each peak is the abundance weighted mean of the isotopic combinations in its bin.
+
+    :param threshold: The fraction of the largest peak below which peaks are removed.
+    :type threshold: float
+    :param method: The method, 'convolve' for pruned polynomial multiplication, 'fft' for FFT over the full envelope, or 'auto' to use FFT only when nothing is pruned. Pruning keeps the products short, so 'convolve' is faster for any positive threshold.
+    :type method: str
+    :param decimals: The number of decimal places of the masses.
+    :type decimals: int
+    :return: A list of (mass, abundance) pairs in order of mass, with the mass in atomic mass units and the abundance as a fraction of the envelope.
+    :rtype: list
+    """
+    import numpy as np
+    if method not in ['auto', 'fft', 'convolve']:
+      raise Exception(f"Compound Exception: Unknown isotope pattern method '{method}'.")
+    counts = list(self.composition.items())
+    if method == 'auto':
+      method = 'fft' if threshold <= 0 else 'convolve'
+    offset, p, w = Compound.fftPattern(counts, threshold) if method == 'fft' else Compound.convolutionPattern(counts, threshold)
+    total = p.sum()
+    pattern = []
+    for i in np.nonzero(p)[0]:
+      mass = SigFig(repr(float(w[i] / p[i])), decimals=-decimals)
+      abundance = SigFig(repr(float(p[i] / total)), sigfigs=6)
+      pattern.append((Measurement(mass), Measurement(abundance)))
+    return pattern
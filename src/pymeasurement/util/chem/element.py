@@ -1,5 +1,7 @@
 from pymeasurement.util.typecheck import typecheck
 from pymeasurement.measurement import Measurement
+import csv
+import os
 
 class Element:
   """A class to represent an chemical element.
@@ -14,6 +16,7 @@ class Element:
     :type mass: int or None
   """
   latexPrint = False # Whether to print the element in latex format.
+  isotopeData = None # Natural isotopes of each element, loaded from data/isotopes.csv on first use.
 
   def setLatexPrint(value):
     """Set whether to print the element in latex format.
@@ -51,6 +54,43 @@ class Element:
     if self.mass == None:
       self.mass = Measurement.fromStr(f'{Element.atomicWeights()[self.protons]}c') if self.protons in Element.atomicWeights() else None
 
+  def __getstate__(self):
+    """Get the minimal state of the element.
+
+    :returns: The name, protons, neutrons and mass of the element.
+    :rtype: tuple
+    """
+    return (self.string, self.protons, self.neutrons, self.mass)
+
+  def fromState(string, protons, neutrons, mass):
+    """Create an element from the state returned by __getstate__, without looking up the element again.
+
+    :param string: The name of the element.
+    :type string: str
+    :param protons: The number of protons in the element.
+    :type protons: int or None
+    :param neutrons: The number of neutrons in the element.
+    :type neutrons: int or None
+    :param mass: The mass of the element.
+    :type mass: Measurement or int or None
+    :returns: The element.
+    :rtype: Element
+    """
+    new = Element.__new__(Element)
+    new.string = string
+    new.protons = protons
+    new.neutrons = neutrons
+    new.mass = mass
+    return new
+
+  def __reduce__(self):
+    """Get the compact pickled form of the element.
+
+    :returns: The function to rebuild the element and its arguments.
+    :rtype: tuple
+    """
+    return (Element.fromState, self.__getstate__())
+
   def fromAtomicNumber(num):
     """Create an element from an atomic number.
 
@@ -78,6 +118,28 @@ class Element:
     """
     return {1: '1.01', 2: '4.00', 3: '6.94', 4: '9.01', 5: '10.81', 6: '12.01', 7: '14.01', 8: '16.00', 9: '19.00', 10: '20.18', 11: '22.99', 12: '24.31', 13: '26.98', 14: '28.09', 15: '30.97', 16: '32.07', 17: '35.45', 18: '39.95', 19: '39.1', 20: '40.08', 21: '44.96', 22: '47.87', 23: '50.94', 24: '52.00', 25: '54.94', 26: '55.85', 27: '58.93', 28: '58.69', 29: '63.55', 30: '65.41', 31: '69.72', 32: '72.64', 33: '74.92', 34: '78.96', 35: '79.90', 36: '83.80', 37: '85.47', 38: '87.62', 39: '88.91', 40: '91.22', 41: '92.91', 42: '95.94', 43: '98.00', 44: '101.07', 45: '102.91', 46: '106.42', 47: '107.87', 48: '112.41', 49: '114.82', 50: '118.71', 51: '121.76', 52: '127.6', 53: '126.9', 54: '131.29', 55: '132.91', 56: '137.33', 57: '138.91', 58: '140.12', 59: '140.91', 60: '144.24', 61: '145.0', 62: '150.36', 63: '151.97', 64: '157.25', 65: '158.93', 66: '162.5', 67: '164.93', 68: '167.26', 69: '168.93', 70: '173.04', 71: '174.97', 72: '178.49', 73: '180.95', 74: '183.84', 75: '186.21', 76: '190.23', 77: '192.22', 78: '195.08', 79: '196.97', 80: '200.59', 81: '204.38', 82: '207.2', 83: '208.98', 84: '209.0', 85: '210.00', 86: '222.0', 87: '223.0', 88: '226.0', 89: '227.0', 90: '232.04', 91: '231.04', 92: '238.03', 93: '237.0', 94: '244.0', 95: '243.0', 96: '247.0', 97: '247.0', 98: '251.0', 99: '252.0', 100: '257.0', 101: '258.0', 102: '259.0', 103: '262.0', 104: '261.0', 105: '262.0', 106: '266.00', 107: '264.00', 108: '277.00', 109: '268.0', 110: '269.0', 111: '272.0', 112: '285.00', 113: '286.00', 114: '289.00', 115: '289.00', 116: '293.00', 117: '293.00', 118: '294.00'}
     
+  def isotopeTable():
+    """Get the natural isotopes of all elements, loading them from the bundled data file on first use.
+
+    :returns: A dictionary of element name to a list of (mass number, mass, abundance) tuples, with the mass and abundance as strings.
+    :rtype: dict
+    """
+    if Element.isotopeData is None:
+      table = {}
+      with open(os.path.join(os.path.dirname(__file__), 'data', 'isotopes.csv'), newline='') as f:
+        for row in csv.DictReader(f):
+          table.setdefault(row['Element'], []).append((int(row['Mass Number']), row['Mass'], row['Abundance']))
+      Element.isotopeData = table
+    return Element.isotopeData
+
+  def isotopes(self):
+    """Get the natural isotopes of the element.
+
+    :returns: A list of (mass number, mass, abundance) tuples, with the mass in atomic mass units and the abundance as a fraction.
+    :rtype: list
+    """
+    return [(number, Measurement(mass), Measurement(abundance)) for number, mass, abundance in Element.isotopeTable().get(self.string, [])]
+
   def __str__(self): #Add Latex String for Elements
     """Get the string representation of the element.
 
@@ -0,0 +1,142 @@
+from pymeasurement.util.chem.compound import Compound
+
+class CompoundIndex:
+  """A class to deduplicate and group compounds by their canonical composition. Each compound is hashed by its Hill notation, so adding n compounds takes O(n) time instead of comparing every pair, and isomers written in different orders, such as CH3CH2OH and C2H5OH, fall into the same group. Formula strings are parsed once and reused when they appear again.
+  """
+  def __init__(self):
+    """CompoundIndex Constructor
+    """
+    self.parsed = {} # formula -> Compound
+    self.groupsByKey = {} # Hill notation -> list of (Compound, value) pairs, in order of addition.
+
+  def parse(self, compound):
+    """Parses a formula, reusing the Compound object of a formula that was already parsed.
+
+    :param compound: The compound or its formula.
+    :type compound: Compound or str
+    :return: The compound.
+    :rtype: Compound
+    """
+    if isinstance(compound, Compound):
+      return compound
+    if compound not in self.parsed:
+      self.parsed[compound] = Compound(compound)
+    return self.parsed[compound]
+
+  def add(self, compound, value=None):
+    """Adds a compound to the index.
+
+    :param compound: The compound or its formula.
+    :type compound: Compound or str
+    :param value: A value to store with the compound, such as a catalog entry. Defaults to the compound or formula as given.
+    :type value: object
+    :return: The Hill notation of the compound.
+    :rtype: str
+    """
+    if value is None:
+      value = compound
+    compound = self.parse(compound)
+    self.groupsByKey.setdefault(compound.key, []).append((compound, value))
+    return compound.key
+
+  def extend(self, compounds, values=None):
+    """Adds compounds to the index.
+
+    :param compounds: The compounds or their formulas.
+    :type compounds: Iterable<Compound or str>
+    :param values: The value of each compound. Defaults to the compounds or formulas as given.
+    :type values: Iterable or None
+    :return: This CompoundIndex object.
+    :rtype: CompoundIndex
+    """
+    if values is None:
+      for compound in compounds:
+        self.add(compound)
+    else:
+      for compound, value in zip(compounds, values):
+        self.add(compound, value)
+    return self
+
+  def key(self, compound):
+    """Returns the Hill notation of a compound.
+
+    :param compound: The compound or its formula.
+    :type compound: Compound or str
+    :return: The Hill notation.
+    :rtype: str
+    """
+    return self.parse(compound).key
+
+  def get(self, compound):
+    """Returns the values of every compound with the same composition.
+
+    :param compound: The compound or its formula.
+    :type compound: Compound or str
+    :return: The values, in order of addition.
+    :rtype: list
+    """
+    return [value for _, value in self.groupsByKey.get(self.key(compound), [])]
+
+  def groups(self):
+    """Returns the values of each composition.
+
+    :return: A dictionary of Hill notation to values, in order of addition.
+    :rtype: dict
+    """
+    return {key: [value for _, value in group] for key, group in self.groupsByKey.items()}
+
+  def unique(self):
+    """Returns the first compound added of each composition.
+
+    :return: The compounds, in order of addition.
+    :rtype: list
+    """
+    return [group[0][0] for group in self.groupsByKey.values()]
+
+  def duplicates(self):
+    """Returns the values of each composition that was added more than once.
+
+    :return: A dictionary of Hill notation to values.
+    :rtype: dict
+    """
+    return {key: [value for _, value in group] for key, group in self.groupsByKey.items() if len(group) > 1}
+
+  def __contains__(self, compound):
+    """Checks whether a compound with the same composition is in the index.
+
+    :param compound: The compound or its formula.
+    :type compound: Compound or str
+    :return: Whether the composition is in the index.
+    :rtype: bool
+    """
+    return self.key(compound) in self.groupsByKey
+
+  def __len__(self):
+    """Returns the number of distinct compositions in the index.
+
+    :return: The number of compositions.
+    :rtype: int
+    """
+    return len(self.groupsByKey)
+
+def deduplicate(compounds):
+  """Removes compounds with the same composition, keeping the first of each.
+
+  :param compounds: The compounds or their formulas.
+  :type compounds: Iterable<Compound or str>
+  :return: The first compound of each composition, in order.
+  :rtype: list
+  """
+  return CompoundIndex().extend(compounds).unique()
+
+def groupByComposition(compounds, values=None):
+  """Groups compounds by their composition.
+
+  :param compounds: The compounds or their formulas.
+  :type compounds: Iterable<Compound or str>
+  :param values: The value of each compound. Defaults to the compounds or formulas as given.
+  :type values: Iterable or None
+  :return: A dictionary of Hill notation to values.
+  :rtype: dict
+  """
+  return CompoundIndex().extend(compounds, values).groups()
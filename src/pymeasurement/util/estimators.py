@@ -0,0 +1,276 @@
+from pymeasurement.measurement import Measurement
+import numpy as np
+
+class GroupedEstimator:
+  """A class to combine repeated Measurement objects per group with vectorized estimators. Each chunk of Measurement objects is reduced to per-group sufficient statistics with NumPy, and chunks are merged with Chan's parallel update, so inputs larger than memory can be combined one chunk at a time.
+
+  The available estimators are the inverse-variance weighted mean, the mean with the standard error of the mean, and the inverse-variance weighted mean with its uncertainty scaled by the Birge ratio when the Birge ratio is greater than 1.
+  """
+  def __init__(self):
+    """GroupedEstimator Constructor
+    """
+    self.keys = {} # key -> group index
+    self.units = None
+    self.count = np.zeros(0)
+    self.mean = np.zeros(0) # Unweighted mean.
+    self.m2 = np.zeros(0) # Sum of squared deviations from the unweighted mean.
+    self.weights = np.zeros(0) # Sum of inverse-variance weights.
+    self.weightedMean = np.zeros(0)
+    self.chiSquared = np.zeros(0) # Weighted sum of squared deviations from the weighted mean.
+
+  def update(self, keys, measurements):
+    """Adds a chunk of Measurement objects.
+
+    :param keys: The group of each Measurement object.
+    :type keys: Iterable
+    :param measurements: The Measurement objects.
+    :type measurements: Iterable<Measurement>
+    :return: This GroupedEstimator object.
+    :rtype: GroupedEstimator
+    """
+    x, u, units = Measurement.toArrays(measurements)
+    keys = list(keys)
+    if len(keys) != len(x):
+      raise Exception('Estimator Error: Keys and measurements must have the same length.')
+    if not len(x):
+      return self
+    if self.units is None and not self.keys:
+      self.units = units
+    elif units != self.units:
+      raise Exception(f'Estimator Error: Cannot combine {units} with {self.units}. Convert them with Measurement.convertColumn first.')
+    groups = np.fromiter((self.keys.setdefault(k, len(self.keys)) for k in keys), dtype=np.intp, count=len(keys))
+    size = len(self.keys)
+    for name in ['count', 'mean', 'm2', 'weights', 'weightedMean', 'chiSquared']:
+      old = getattr(self, name)
+      setattr(self, name, np.concatenate([old, np.zeros(size - len(old))]))
+    w = np.where(np.isnan(u), np.nan, 1 / np.where(u > 0, u, np.nan) ** 2)
+    count = np.bincount(groups, minlength=size).astype(float)
+    present = count > 0
+    mean = np.divide(np.bincount(groups, weights=x, minlength=size), count, out=np.zeros(size), where=present)
+    m2 = np.bincount(groups, weights=(x - mean[groups]) ** 2, minlength=size)
+    weights = np.bincount(groups, weights=w, minlength=size)
+    weightedMean = np.bincount(groups, weights=w * x, minlength=size) / np.where(weights > 0, weights, np.nan)
+    chiSquared = np.bincount(groups, weights=w * (x - weightedMean[groups]) ** 2, minlength=size)
+    self.mean, self.m2, self.count = GroupedEstimator.merge(self.mean, self.m2, self.count, mean, m2, count)
+    self.weightedMean, self.chiSquared, self.weights = GroupedEstimator.merge(self.weightedMean, self.chiSquared, self.weights, weightedMean, chiSquared, weights)
+    return self
+
+  def merge(meanA, m2A, weightA, meanB, m2B, weightB):
+    """Merges the means and sums of squared deviations of two sets of groups.
+
+    :param meanA: The means of the first set.
+    :type meanA: numpy.ndarray
+    :param m2A: The sums of squared deviations of the first set.
+    :type m2A: numpy.ndarray
+    :param weightA: The total weights of the first set.
+    :type weightA: numpy.ndarray
+    :param meanB: The means of the second set.
+    :type meanB: numpy.ndarray
+    :param m2B: The sums of squared deviations of the second set.
+    :type m2B: numpy.ndarray
+    :param weightB: The total weights of the second set.
+    :type weightB: numpy.ndarray
+    :return: The merged means, sums of squared deviations and weights.
+    :rtype: tuple
+    """
+    weight = weightA + weightB
+    with np.errstate(invalid='ignore', divide='ignore'):
+      delta = meanB - meanA
+      mean = np.where(weightA == 0, meanB, np.where(weightB == 0, meanA, meanA + delta * weightB / weight))
+      m2 = np.where(weightA == 0, m2B, np.where(weightB == 0, m2A, m2A + m2B + delta ** 2 * weightA * weightB / weight))
+    return mean, m2, weight
+
+  def results(self, samples, uncertainties):
+    """Creates a Measurement object per group.
+
+    :param samples: The estimate of each group.
+    :type samples: numpy.ndarray
+    :param uncertainties: The uncertainty of each group.
+    :type uncertainties: numpy.ndarray
+    :return: The Measurement object of each group.
+    :rtype: dict
+    """
+    return {k: Measurement.fromEstimate(samples[i], uncertainties[i], units=self.units) for k, i in self.keys.items()}
+
+  def checkWeighted(self):
+    """Raises an exception if any group has Measurement objects without uncertainties.
+    """
+    if np.isnan(self.weights).any() or (self.weights <= 0).any():
+      raise Exception('Estimator Error: Every Measurement must have a positive uncertainty for a weighted estimate.')
+
+  def inverseVariance(self):
+    """Returns the inverse-variance weighted mean of each group, with uncertainty 1 / sqrt(sum of weights).
+
+    :return: The weighted mean of each group.
+    :rtype: dict
+    """
+    self.checkWeighted()
+    return self.results(self.weightedMean, 1 / np.sqrt(self.weights))
+
+  def standardError(self):
+    """Returns the mean of each group, with the standard error of the mean as the uncertainty.
+
+    :return: The mean of each group.
+    :rtype: dict
+    """
+    with np.errstate(invalid='ignore', divide='ignore'):
+      sem = np.sqrt(self.m2 / (self.count - 1) / self.count)
+    return self.results(self.mean, np.where(self.count > 1, sem, np.nan))
+
+  def birgeRatio(self):
+    """Returns the Birge ratio of each group, sqrt(chi squared / (n - 1)).
+
+    :return: The Birge ratio of each group.
+    :rtype: dict
+    """
+    self.checkWeighted()
+    with np.errstate(invalid='ignore', divide='ignore'):
+      ratio = np.sqrt(self.chiSquared / (self.count - 1))
+    return {k: float(ratio[i]) if self.count[i] > 1 else float('nan') for k, i in self.keys.items()}
+
+  def birge(self):
+    """Returns the inverse-variance weighted mean of each group, with its uncertainty scaled by the Birge ratio when the Birge ratio is greater than 1.
+
+    :return: The weighted mean of each group.
+    :rtype: dict
+    """
+    self.checkWeighted()
+    with np.errstate(invalid='ignore', divide='ignore'):
+      ratio = np.where(self.count > 1, np.sqrt(self.chiSquared / (self.count - 1)), 1.0)
+    return self.results(self.weightedMean, np.maximum(ratio, 1.0) / np.sqrt(self.weights))
+
+estimators = ['inverseVariance', 'standardError', 'birge'] # The available estimators.
+
+def groupBy(keys, measurements, estimator='inverseVariance', chunkSize=None):
+  """Combines Measurement objects per group.
+
+  :param keys: The group of each Measurement object, such as a DataFrame column.
+  :type keys: Iterable
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  :param estimator: The estimator, one of 'inverseVariance', 'standardError' or 'birge'.
+  :type estimator: str
+  :param chunkSize: The number of Measurement objects to reduce at a time. If None, all are reduced at once.
+  :type chunkSize: int or None
+  :return: The combined Measurement object of each group.
+  :rtype: dict
+  """
+  if estimator not in estimators:
+    raise Exception(f'Estimator Error: Unknown estimator "{estimator}".')
+  grouped = GroupedEstimator()
+  keys = list(keys)
+  measurements = list(measurements)
+  chunkSize = chunkSize or max(len(measurements), 1)
+  for i in range(0, len(measurements), chunkSize):
+    grouped.update(keys[i:i + chunkSize], measurements[i:i + chunkSize])
+  return getattr(grouped, estimator)()
+
+def fromChunks(chunks, estimator='inverseVariance'):
+  """Combines Measurement objects per group from an iterable of chunks, such as chunks read from a file, holding only one chunk in memory at a time.
+
+  :param chunks: The (keys, measurements) pair of each chunk.
+  :type chunks: Iterable<tuple>
+  :param estimator: The estimator, one of 'inverseVariance', 'standardError' or 'birge'.
+  :type estimator: str
+  :return: The combined Measurement object of each group.
+  :rtype: dict
+  """
+  if estimator not in estimators:
+    raise Exception(f'Estimator Error: Unknown estimator "{estimator}".')
+  grouped = GroupedEstimator()
+  for keys, measurements in chunks:
+    grouped.update(keys, measurements)
+  return getattr(grouped, estimator)()
+
+def weightedMean(measurements):
+  """Returns the inverse-variance weighted mean of Measurement objects.
+
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  :return: The weighted mean.
+  :rtype: Measurement
+  """
+  measurements = list(measurements)
+  return groupBy([0] * len(measurements), measurements)[0]
+
+def standardErrorMean(measurements):
+  """Returns the mean of Measurement objects, with the standard error of the mean as the uncertainty.
+
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  :return: The mean.
+  :rtype: Measurement
+  """
+  measurements = list(measurements)
+  return groupBy([0] * len(measurements), measurements, estimator='standardError')[0]
+
+def birgeMean(measurements):
+  """Returns the inverse-variance weighted mean of Measurement objects, with its uncertainty scaled by the Birge ratio when the Birge ratio is greater than 1.
+
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  :return: The weighted mean.
+  :rtype: Measurement
+  """
+  measurements = list(measurements)
+  return groupBy([0] * len(measurements), measurements, estimator='birge')[0]
+
+aggregates = ['count', 'sum', 'mean', 'min', 'max'] # The available aggregates of groupByUnits.
+
+def groupByUnits(measurements, normalize=False, aggregate=None, registry=None):
+  """Buckets Measurement objects by units in a single pass and aggregates each bucket. Mixed-unit collections are split instead of failing at the first mismatch. The minimum and maximum of every bucket are found at once with one NumPy sort over all Measurement objects, and the sums use the exact Measurement.sum.
+
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  :param normalize: If False, Measurement objects are bucketed by their units string. If True, Measurement objects with compatible units, such as g and kg, share a bucket and are converted into the units of the first of them. A list of units strings gives the preferred units of each bucket.
+  :type normalize: bool or list
+  :param aggregate: The aggregates to compute, from 'count', 'sum', 'mean', 'min' and 'max'. Defaults to all of them.
+  :type aggregate: list or None
+  :param registry: The unit registry used to normalize. Defaults to pymeasurement.util.units.registry.
+  :type registry: pymeasurement.util.units.UnitRegistry or None
+  :return: A dictionary of units string to a dictionary of aggregate name to result.
+  :rtype: dict
+  """
+  aggregate = aggregates if aggregate is None else aggregate
+  for a in aggregate:
+    if a not in aggregates:
+      raise Exception(f'Estimator Error: Unknown aggregate "{a}".')
+  measurements = list(measurements)
+  if registry is None:
+    from pymeasurement.util.units import registry
+  targets = {} # units string -> units string of its bucket
+  buckets = {} # units string of bucket -> group index
+  preferred = normalize if isinstance(normalize, (list, tuple)) else []
+  def target(units):
+    if units not in targets:
+      targets[units] = units
+      if normalize and units is not None:
+        targets[units] = next((u for u in preferred + list(buckets) if u is not None and registry.compatible(u, units)), units)
+      buckets.setdefault(targets[units], len(buckets))
+    return targets[units]
+  keys = [target(m.units) for m in measurements]
+  codes = np.fromiter((buckets[k] for k in keys), dtype=np.intp, count=len(keys))
+  factors = {u: (float(registry.conversionFactor(u, t)) if u != t else 1.0) for u, t in targets.items()}
+  samples = Measurement.sortKeys(measurements, exact=False) * np.fromiter((factors[m.units] for m in measurements), dtype=float, count=len(measurements))
+  members = [[] for _ in buckets]
+  for i, code in enumerate(codes.tolist()):
+    members[code].append(i)
+  def convert(i, units):
+    return measurements[i] if measurements[i].units == units else measurements[i].to(units)
+  results = {units: {} for units in buckets}
+  if 'min' in aggregate or 'max' in aggregate:
+    for name, order in [('min', np.lexsort((samples, codes))), ('max', np.lexsort((-samples, codes)))]:
+      if name in aggregate:
+        firsts = order[np.flatnonzero(np.r_[True, codes[order][1:] != codes[order][:-1]])] if len(order) else []
+        for units, i in zip(buckets, firsts):
+          results[units][name] = convert(int(i), units)
+  for units, code in buckets.items():
+    if 'count' in aggregate:
+      results[units]['count'] = len(members[code])
+    if 'sum' in aggregate or 'mean' in aggregate:
+      total = Measurement.sum([convert(i, units) for i in members[code]])
+      if 'sum' in aggregate:
+        results[units]['sum'] = total
+      if 'mean' in aggregate:
+        results[units]['mean'] = total / len(members[code])
+  return {units: {a: results[units][a] for a in aggregate} for units in buckets}
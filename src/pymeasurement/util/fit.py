@@ -0,0 +1,181 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.util.units import formatPowers, unitPowers
+import numpy as np
+
+class Fit:
+  """A class to represent the result of fitting a polynomial to Measurement objects. The coefficients are Measurement objects in ascending order of power, with uncertainties from the covariance matrix of the fit and units derived from the units of the data.
+
+  :param coefficients: The fitted coefficients in ascending order of power.
+  :type coefficients: numpy.ndarray
+  :param covariance: The covariance matrix of the coefficients.
+  :type covariance: numpy.ndarray
+  :param chiSquared: The weighted sum of squared residuals.
+  :type chiSquared: float
+  :param dof: The degrees of freedom of the fit.
+  :type dof: int
+  :param xUnits: The units of the independent variable.
+  :type xUnits: str or None
+  :param yUnits: The units of the dependent variable.
+  :type yUnits: str or None
+  """
+  def __init__(self, coefficients, covariance, chiSquared, dof, xUnits=None, yUnits=None):
+    """Fit Constructor
+    """
+    self.values = coefficients
+    self.covariance = covariance
+    self.chiSquared = chiSquared
+    self.dof = dof
+    self.xUnits = xUnits
+    self.yUnits = yUnits
+    x = unitPowers(xUnits)
+    y = unitPowers(yUnits)
+    self.coefficients = []
+    for k, value in enumerate(coefficients):
+      powers = dict(y)
+      for u, p in x.items():
+        powers[u] = powers.get(u, 0) - k * p
+      self.coefficients.append(Measurement.fromEstimate(value, np.sqrt(covariance[k, k]), units=formatPowers({u: p for u, p in powers.items() if p != 0})))
+    self.intercept = self.coefficients[0] # The constant coefficient.
+    self.slope = self.coefficients[1] if len(self.coefficients) > 1 else None # The linear coefficient.
+
+  def reducedChiSquared(self):
+    """Returns the chi squared of the fit divided by its degrees of freedom.
+
+    :return: The reduced chi squared.
+    :rtype: float
+    """
+    return self.chiSquared / self.dof if self.dof > 0 else float('nan')
+
+  def evaluate(self, x):
+    """Evaluates the fitted polynomial, propagating the covariance of the coefficients.
+
+    :param x: The value of the independent variable.
+    :type x: Measurement or float
+    :return: The value of the polynomial.
+    :rtype: Measurement
+    """
+    x = float(x.sample.decimal) if isinstance(x, Measurement) else float(x)
+    powers = x ** np.arange(len(self.values))
+    return Measurement.fromEstimate(powers @ self.values, np.sqrt(powers @ self.covariance @ powers), units=self.yUnits)
+
+  def __str__(self):
+    """Returns the string representation of the Fit.
+
+    :return: The string representation of the Fit.
+    :rtype: str
+    """
+    return ' + '.join(f'({c})' + (f' x^{k}' if k > 1 else (' x' if k == 1 else '')) for k, c in enumerate(self.coefficients))
+
+  def __repr__(self):
+    """Returns the string representation of the Fit.
+
+    :return: The string representation of the Fit.
+    :rtype: str
+    """
+    return str(self)
+
+def weights(uncertainties):
+  """Returns the inverse variance weights of absolute uncertainties. If no uncertainties are given, every point has weight 1.
+
+  :param uncertainties: The absolute uncertainties, NaN where missing.
+  :type uncertainties: numpy.ndarray
+  :return: The weights and whether the data was weighted.
+  :rtype: tuple
+  """
+  missing = np.isnan(uncertainties)
+  if missing.all():
+    return np.ones_like(uncertainties), False
+  if missing.any() or (uncertainties <= 0).any():
+    raise Exception('Fit Error: Every point must have a positive uncertainty, or none may have one.')
+  return 1 / uncertainties ** 2, True
+
+def polynomialFit(x, y, degree):
+  """Fits a polynomial to Measurement objects by weighted least squares, weighting each point by the inverse square of the absolute uncertainty of y. If no y uncertainties are given, an unweighted fit is made and the covariance is scaled by the residual variance.
+
+  :param x: The independent variable.
+  :type x: Iterable<Measurement>
+  :param y: The dependent variable.
+  :type y: Iterable<Measurement>
+  :param degree: The degree of the polynomial.
+  :type degree: int
+  :return: The fit.
+  :rtype: Fit
+  """
+  xs, _, xUnits = Measurement.toArrays(x)
+  ys, sy, yUnits = Measurement.toArrays(y)
+  if len(xs) != len(ys):
+    raise Exception('Fit Error: x and y must have the same length.')
+  if len(xs) <= degree:
+    raise Exception(f'Fit Error: At least {degree + 1} points are needed for a degree {degree} fit.')
+  w, weighted = weights(sy)
+  A = np.vander(xs, degree + 1, increasing=True)
+  root = np.sqrt(w)
+  coefficients, *_ = np.linalg.lstsq(A * root[:, None], ys * root, rcond=None)
+  covariance = np.linalg.inv(A.T @ (A * w[:, None]))
+  chiSquared = float(np.sum(w * (ys - A @ coefficients) ** 2))
+  dof = len(xs) - degree - 1
+  if not weighted and dof > 0:
+    covariance = covariance * chiSquared / dof
+  return Fit(coefficients, covariance, chiSquared, dof, xUnits=xUnits, yUnits=yUnits)
+
+def linearFit(x, y):
+  """Fits a line to Measurement objects by weighted least squares. See :func:`polynomialFit`.
+
+  :param x: The independent variable.
+  :type x: Iterable<Measurement>
+  :param y: The dependent variable.
+  :type y: Iterable<Measurement>
+  :return: The fit, with intercept and slope.
+  :rtype: Fit
+  """
+  return polynomialFit(x, y, 1)
+
+def yorkFit(x, y, tolerance=1e-12, maxIterations=100):
+  """Fits a line to Measurement objects with uncertainties in both x and y, using York's method (York et al., 2004) with uncorrelated errors.
+
+  :param x: The independent variable.
+  :type x: Iterable<Measurement>
+  :param y: The dependent variable.
+  :type y: Iterable<Measurement>
+  :param tolerance: The relative change in slope at which to stop iterating.
+  :type tolerance: float
+  :param maxIterations: The maximum number of iterations.
+  :type maxIterations: int
+  :return: The fit, with intercept and slope.
+  :rtype: Fit
+  """
+  xs, sx, xUnits = Measurement.toArrays(x)
+  ys, sy, yUnits = Measurement.toArrays(y)
+  if len(xs) != len(ys):
+    raise Exception('Fit Error: x and y must have the same length.')
+  if len(xs) < 3:
+    raise Exception('Fit Error: At least 3 points are needed for a York fit.')
+  if np.isnan(sx).any() or np.isnan(sy).any() or (sx <= 0).any() or (sy <= 0).any():
+    raise Exception('Fit Error: Every point must have positive x and y uncertainties for a York fit.')
+  wx = 1 / sx ** 2
+  wy = 1 / sy ** 2
+  b = np.polyfit(xs, ys, 1)[0]
+  for _ in range(maxIterations):
+    W = wx * wy / (wx + b ** 2 * wy)
+    xBar = np.sum(W * xs) / np.sum(W)
+    yBar = np.sum(W * ys) / np.sum(W)
+    U = xs - xBar
+    V = ys - yBar
+    beta = W * (U / wy + b * V / wx)
+    previous = b
+    b = np.sum(W * beta * V) / np.sum(W * beta * U)
+    if abs(b - previous) <= tolerance * abs(b):
+      break
+  W = wx * wy / (wx + b ** 2 * wy)
+  xBar = np.sum(W * xs) / np.sum(W)
+  yBar = np.sum(W * ys) / np.sum(W)
+  beta = W * ((xs - xBar) / wy + b * (ys - yBar) / wx)
+  a = yBar - b * xBar
+  adjusted = xBar + beta
+  adjustedBar = np.sum(W * adjusted) / np.sum(W)
+  u = adjusted - adjustedBar
+  varB = 1 / np.sum(W * u ** 2)
+  varA = 1 / np.sum(W) + adjustedBar ** 2 * varB
+  covariance = np.array([[varA, -adjustedBar * varB], [-adjustedBar * varB, varB]])
+  chiSquared = float(np.sum(W * (ys - b * xs - a) ** 2))
+  return Fit(np.array([a, b]), covariance, chiSquared, len(xs) - 2, xUnits=xUnits, yUnits=yUnits)
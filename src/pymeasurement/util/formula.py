@@ -0,0 +1,323 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.sigfig import SigFig
+import ast
+import operator
+
+# Kernels used by compiled formulas. Each value is a (sample, uncertainty, uncertaintyPercent) tuple holding the state of the Measurement object the matching operators would create, and each kernel follows the same significant figure and uncertainty propagation rules as the matching Measurement operator without constructing intermediate Measurement objects.
+
+ZERO = SigFig('0', constant=True)
+TWO = SigFig('2', constant=True)
+HUNDRED = SigFig('100', constant=True)
+
+def percentRule(uncertainty):
+  """Rounds a percent uncertainty to 2 significant figures if it is less than 2%, and to 1 significant figure otherwise.
+
+  :param uncertainty: The percent uncertainty.
+  :type uncertainty: SigFig
+  :return: The rounded percent uncertainty.
+  :rtype: SigFig
+  """
+  return SigFig(str(uncertainty.decimalValue), sigfigs=(2 if uncertainty < TWO else 1))
+
+def measure(x):
+  """Rounds the percent uncertainty of a value with percentRule, as the Measurement constructor does when an operator creates its result.
+
+  :param x: The value.
+  :type x: tuple
+  :return: The value.
+  :rtype: tuple
+  """
+  sample, uncertainty, percent = x
+  if uncertainty is None or not percent:
+    return x
+  return (sample, percentRule(uncertainty), percent)
+
+def absoluteUncertainty(x):
+  """Returns the absolute uncertainty of a value, as Measurement.absolute does.
+
+  :param x: The value.
+  :type x: tuple
+  :return: The absolute uncertainty.
+  :rtype: SigFig
+  """
+  sample, uncertainty, percent = x
+  if not percent:
+    return uncertainty
+  uncertainty = uncertainty * (sample / HUNDRED).abs()
+  return SigFig(str(uncertainty.decimalValue), decimals=sample.decimals)
+
+def percentUncertainty(x):
+  """Returns the percent uncertainty of a value, as Measurement.percent does.
+
+  :param x: The value.
+  :type x: tuple
+  :return: The percent uncertainty.
+  :rtype: SigFig
+  """
+  sample, uncertainty, percent = x
+  if percent:
+    return uncertainty
+  return percentRule(SigFig(uncertainty.value, constant=True) * SigFig((HUNDRED / sample).abs().value, constant=True))
+
+def neg(x):
+  """Negates a value, as Measurement.__neg__ does.
+
+  :param x: The value.
+  :type x: tuple
+  :return: The result.
+  :rtype: tuple
+  """
+  sample, uncertainty, percent = x
+  return (-sample, uncertainty, percent)
+
+def add(x, y):
+  """Adds two values, as Measurement.__add__ does.
+
+  :param x: The first value.
+  :type x: tuple
+  :param y: The second value.
+  :type y: tuple
+  :return: The result.
+  :rtype: tuple
+  """
+  uncertainties = [absoluteUncertainty(i) for i in [x, y] if i[1] is not None]
+  uSum = ZERO
+  for u in uncertainties:
+    uSum += u
+  return (x[0] + y[0], uSum if uncertainties else None, False)
+
+def sub(x, y):
+  """Subtracts two values, as Measurement.__sub__ does.
+
+  :param x: The first value.
+  :type x: tuple
+  :param y: The second value.
+  :type y: tuple
+  :return: The result.
+  :rtype: tuple
+  """
+  return add(neg(y), x)
+
+def mul(x, y):
+  """Multiplies two values, as Measurement.__mul__ does. The percent uncertainty is not rounded yet, see measure.
+
+  :param x: The first value.
+  :type x: tuple
+  :param y: The second value.
+  :type y: tuple
+  :return: The result.
+  :rtype: tuple
+  """
+  uncertainties = [percentUncertainty(i) for i in [x, y] if i[1] is not None]
+  uSum = ZERO
+  for u in uncertainties:
+    uSum += u
+  return (x[0] * y[0], uSum if uncertainties else None, True)
+
+def div(x, y):
+  """Divides two values, as Measurement.__truediv__ does. The percent uncertainty is not rounded yet, see measure.
+
+  :param x: The first value.
+  :type x: tuple
+  :param y: The second value.
+  :type y: tuple
+  :return: The result.
+  :rtype: tuple
+  """
+  uncertainties = [percentUncertainty(i) for i in [x, y] if i[1] is not None]
+  uSum = ZERO
+  for u in uncertainties:
+    uSum += u
+  return (x[0] / y[0], uSum if uncertainties else None, True)
+
+def power(x, n):
+  """Raises a value to a non-negative integer power, as Measurement.__pow__ does.
+
+  :param x: The value.
+  :type x: tuple
+  :param n: The power.
+  :type n: int
+  :return: The result.
+  :rtype: tuple
+  """
+  product = (SigFig('1', constant=True), None, False)
+  for i in range(n):
+    product = measure(mul(product, x))
+  return product
+
+def constant(value):
+  """Creates an exact constant.
+
+  :param value: The constant.
+  :type value: str
+  :return: The constant.
+  :rtype: tuple
+  """
+  return (SigFig(value, constant=True), None, False)
+
+kernels = {'neg': neg, 'add': add, 'sub': sub, 'mul': mul, 'div': div, 'power': power, 'constant': constant, 'measure': measure}
+
+# The Measurement operators matching each kernel. A formula is also compiled against these, and evaluated with them in correlated mode, since the kernels do not track sensitivities.
+operators = {'neg': operator.neg, 'add': operator.add, 'sub': operator.sub, 'mul': operator.mul, 'div': operator.truediv, 'power': operator.pow, 'constant': lambda value: Measurement(SigFig(value, constant=True)), 'measure': lambda x: x}
+
+class Formula:
+  """A class to evaluate a formula over columns of Measurement objects. The formula is parsed, compiled into a specialized Python function and unit checked once, and each row is then evaluated with the same significant figure and uncertainty propagation rules as the Measurement operators, without generic operator dispatch or intermediate Measurement objects.
+
+  Formulas may use ``+``, ``-``, ``*``, ``/``, ``**`` with a non-negative integer exponent, parentheses and numeric constants, which are treated as exact. In correlated mode (see Measurement.setCorrelated), each row is evaluated with the Measurement operators instead, so that the sensitivities of the inputs are propagated.
+
+  :param string: The formula, such as ``'F = m * a / t**2'``. The name of the result before ``=`` is optional.
+  :type string: str
+  """
+  def __init__(self, string):
+    """Formula Constructor
+    """
+    self.string = string
+    self.name = None
+    expression = string
+    if '=' in string:
+      name, expression = string.split('=', 1)
+      self.name = name.strip()
+    self.expression = expression.strip()
+    try:
+      tree = ast.parse(self.expression, mode='eval').body
+    except SyntaxError:
+      raise Exception(f'Formula Error: Could not parse "{self.expression}".')
+    self.variables = []
+    code = self.compileNode(tree)
+    source = f"def formula({', '.join(self.variables)}):\n  return {code}\n"
+    self.source = source
+    self.function = self.compileSource(kernels)
+    self.operators = self.compileSource(operators)
+    self.unitsCache = {}
+
+  def compileSource(self, namespace):
+    """Compiles the source of the formula against the kernels or the operators.
+
+    :param namespace: The function of each kernel name.
+    :type namespace: dict
+    :return: The compiled function.
+    :rtype: function
+    """
+    namespace = dict(namespace)
+    exec(compile(self.source, f'<formula {self.expression}>', 'exec'), namespace)
+    return namespace['formula']
+
+  def compileNode(self, node):
+    """Compiles a node of the parsed formula into a kernel expression.
+
+    :param node: The node to compile.
+    :type node: ast.AST
+    :return: The kernel expression.
+    :rtype: str
+    """
+    if isinstance(node, ast.BinOp):
+      left = self.compileNode(node.left)
+      if isinstance(node.op, ast.Pow):
+        if not (isinstance(node.right, ast.Constant) and isinstance(node.right.value, int) and node.right.value >= 0):
+          raise Exception(f'Formula Error: Exponents must be non-negative integers in "{self.expression}".')
+        return f'power({left}, {node.right.value})'
+      operators = {ast.Add: 'add', ast.Sub: 'sub', ast.Mult: 'mul', ast.Div: 'div'}
+      if type(node.op) not in operators:
+        raise Exception(f'Formula Error: Unsupported operator in "{self.expression}".')
+      code = f'{operators[type(node.op)]}({left}, {self.compileNode(node.right)})'
+      return f'measure({code})' if isinstance(node.op, (ast.Mult, ast.Div)) else code
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+      operand = self.compileNode(node.operand)
+      return f'neg({operand})' if isinstance(node.op, ast.USub) else operand
+    if isinstance(node, ast.Name):
+      if node.id not in self.variables:
+        self.variables.append(node.id)
+      return node.id
+    if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+      return f"constant('{node.value}')"
+    raise Exception(f'Formula Error: Unsupported expression in "{self.expression}".')
+
+  def units(self, units):
+    """Checks the units of the formula and returns the units of the result. Results are cached per input units.
+
+    :param units: The units string of each variable.
+    :type units: dict
+    :return: The units of the result.
+    :rtype: str or None
+    """
+    key = tuple(units[v] for v in self.variables)
+    if key not in self.unitsCache:
+      from pymeasurement.util.units import deriveUnits
+      self.unitsCache[key] = deriveUnits(self.expression, units)
+    return self.unitsCache[key]
+
+  def __call__(self, data=None, **columns):
+    """Evaluates the formula over columns of Measurement objects. Each variable is read from the keyword argument of the same name, which may be a column, a single Measurement used for every row, or the name of a column of data. Variables without a keyword argument are read from the column of data with the same name.
+
+    :param data: The table to read columns from.
+    :type data: pandas.core.frame.DataFrame or dict or None
+    :param columns: The column of each variable.
+    :type columns: dict
+    :return: The result of each row, as a pandas Series if any column is a Series and as a list otherwise.
+    :rtype: pandas.core.series.Series or list
+    """
+    inputs = {}
+    for v in self.variables:
+      column = columns.get(v, v)
+      if isinstance(column, str):
+        if data is None:
+          raise Exception(f'Formula Error: No column given for "{v}".')
+        column = data[column]
+      inputs[v] = column
+    index = None
+    length = None
+    for column in inputs.values():
+      if isinstance(column, Measurement):
+        continue
+      if index is None and hasattr(column, 'index') and not isinstance(column, (list, tuple)):
+        index = column.index
+      if length is None:
+        length = len(column)
+      elif len(column) != length:
+        raise Exception('Formula Error: Columns must have the same length.')
+    if length is None:
+      length = 1
+    values = {}
+    units = {}
+    correlated = Measurement.correlated
+    for v, column in inputs.items():
+      if isinstance(column, Measurement):
+        column = [column] * length
+      column = list(column)
+      columnUnits = set(m.units for m in column)
+      if len(columnUnits) > 1:
+        raise Exception(f'Formula Error: Column "{v}" has mixed units {columnUnits}. Convert it with Measurement.convertColumn first.')
+      units[v] = columnUnits.pop() if columnUnits else None
+      values[v] = column if correlated else [(m.sample, m.uncertainty, m.uncertaintyPercent) for m in column]
+    resultUnits = self.units(units)
+    function = self.operators if correlated else self.function
+    results = []
+    for row in zip(*(values[v] for v in self.variables)) if self.variables else [()] * length:
+      if correlated:
+        result = function(*row)
+        results.append(result if result.units == resultUnits else result.scale(1, resultUnits))
+        continue
+      sample, uncertainty, percent = function(*row)
+      result = Measurement(sample, uncertainty=uncertainty, units=resultUnits)
+      result.uncertaintyPercent = percent # The uncertainty is already rounded, so the percent rule is not applied again.
+      results.append(result)
+    if index is not None:
+      import pandas as pd
+      return pd.Series(results, index=index, name=self.name)
+    return results
+
+  def __str__(self):
+    """Returns the string representation of the Formula.
+
+    :return: The string representation of the Formula.
+    :rtype: str
+    """
+    return self.string
+
+  def __repr__(self):
+    """Returns the string representation of the Formula.
+
+    :return: The string representation of the Formula.
+    :rtype: str
+    """
+    return str(self)
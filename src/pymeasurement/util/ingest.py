@@ -0,0 +1,174 @@
+from pymeasurement.measurement import Measurement
+import asyncio
+
+class SimulatedInstrument:
+  """A class to simulate an instrument as an async source of readings. Useful for testing ingestion pipelines without hardware.
+
+  :param readings: The readings the instrument produces, in order.
+  :type readings: Iterable<str or float>
+  :param interval: The time in seconds between readings.
+  :type interval: float
+  """
+  def __init__(self, readings, interval=0.0):
+    """SimulatedInstrument Constructor
+    """
+    self.readings = readings
+    self.interval = interval
+
+  async def __aiter__(self):
+    """Produces the readings of the instrument.
+
+    :return: The readings of the instrument.
+    :rtype: AsyncIterator<str>
+    """
+    for reading in self.readings:
+      await asyncio.sleep(self.interval)
+      yield str(reading)
+
+async def lines(reader, encoding='utf-8'):
+  """Produces the non-empty lines of an asyncio StreamReader, such as a socket opened with asyncio.open_connection or the stdout pipe of a subprocess.
+
+  :param reader: The stream to read from.
+  :type reader: asyncio.StreamReader
+  :param encoding: The encoding of the stream.
+  :type encoding: str
+  :return: The lines of the stream.
+  :rtype: AsyncIterator<str>
+  """
+  while True:
+    line = await reader.readline()
+    if not line:
+      break
+    line = line.decode(encoding).strip()
+    if line:
+      yield line
+
+def parseReading(reading, units=None, digital=False, analog=False):
+  """Converts a raw reading into a Measurement object. If the instrument is digital or analog, the reading is a bare number and the uncertainty is determined from the precision of the device, following the same rules as the Measurement constructor. Otherwise, the reading is parsed with Measurement.fromStr.
+
+  :param reading: The raw reading.
+  :type reading: str or bytes
+  :param units: The units of the instrument. Appended to readings that do not carry their own units.
+  :type units: str or None
+  :param digital: Whether the instrument is digital.
+  :type digital: bool
+  :param analog: Whether the instrument is analog.
+  :type analog: bool
+  :return: The Measurement object.
+  :rtype: Measurement
+  """
+  if isinstance(reading, bytes):
+    reading = reading.decode()
+  reading = str(reading).strip()
+  if digital or analog:
+    return Measurement(reading, digital=digital, analog=analog, units=units)
+  if units is not None and len(reading.split()) in [1, 3]:
+    reading = f'{reading} {units}'
+  return Measurement.fromStr(reading)
+
+class Ingestor:
+  """A class to ingest readings from many async sources into batches of Measurement objects on a single event loop. Each source is read by its own task, which parses its readings and puts them on a bounded queue. When the queue is full, the sources wait, which applies backpressure to the instruments instead of buffering without limit.
+
+  :param queueSize: The maximum number of parsed readings waiting to be batched.
+  :type queueSize: int
+  :param batchSize: The maximum number of readings in a batch.
+  :type batchSize: int
+  :param strict: If True, an invalid reading raises an exception. If False, it is skipped and recorded in errors.
+  :type strict: bool
+  """
+  def __init__(self, queueSize=1000, batchSize=100, strict=True):
+    """Ingestor Constructor
+    """
+    if queueSize < 1 or batchSize < 1:
+      raise Exception('Ingestor Error: Queue size and batch size must be at least 1.')
+    self.queueSize = queueSize
+    self.batchSize = batchSize
+    self.strict = strict
+    self.sources = []
+    self.errors = []
+
+  def add(self, source, name=None, units=None, digital=False, analog=False):
+    """Adds a source of readings.
+
+    :param source: The async iterable producing raw readings.
+    :type source: AsyncIterable<str or bytes>
+    :param name: The name of the instrument. Defaults to its index.
+    :type name: str or None
+    :param units: The units of the instrument.
+    :type units: str or None
+    :param digital: Whether the instrument is digital.
+    :type digital: bool
+    :param analog: Whether the instrument is analog.
+    :type analog: bool
+    :return: This Ingestor object.
+    :rtype: Ingestor
+    """
+    self.sources.append((source, name if name is not None else len(self.sources), units, digital, analog))
+    return self
+
+  async def read(self, queue, source, name, units, digital, analog):
+    """Reads a source, putting each parsed reading on the queue as a (name, Measurement) pair, followed by None once the source is exhausted or fails. If the reader is cancelled, no None is put, as the consumer has stopped and a full queue would never be emptied.
+
+    :param queue: The queue to put the readings on.
+    :type queue: asyncio.Queue
+    """
+    cancelled = False
+    try:
+      async for reading in source:
+        try:
+          measurement = parseReading(reading, units=units, digital=digital, analog=analog)
+        except Exception as e:
+          if self.strict:
+            raise
+          self.errors.append((name, reading, e))
+          continue
+        await queue.put((name, measurement))
+    except asyncio.CancelledError:
+      cancelled = True
+      raise
+    finally:
+      if not cancelled:
+        await queue.put(None)
+
+  async def batches(self):
+    """Produces batches of (name, Measurement) pairs until every source is exhausted. A batch is produced as soon as at least one reading is available and holds at most batchSize readings.
+
+    :return: The batches of readings.
+    :rtype: AsyncIterator<list>
+    """
+    queue = asyncio.Queue(maxsize=self.queueSize)
+    tasks = [asyncio.ensure_future(self.read(queue, *source)) for source in self.sources]
+    remaining = len(tasks)
+    try:
+      while remaining:
+        batch = []
+        item = await queue.get()
+        while True:
+          if item is None:
+            remaining -= 1
+          else:
+            batch.append(item)
+          if len(batch) >= self.batchSize or queue.empty():
+            break
+          item = queue.get_nowait()
+        for task in tasks:
+          if task.done() and not task.cancelled() and task.exception() is not None:
+            raise task.exception()
+        if batch:
+          yield batch
+      await asyncio.gather(*tasks) # A source can fail after its last reading was batched, so its exception is only raised once its task finishes.
+    finally:
+      for task in tasks:
+        task.cancel()
+
+  async def collect(self):
+    """Reads every source to the end and groups the readings by instrument.
+
+    :return: The Measurement objects of each instrument, in order of arrival.
+    :rtype: dict
+    """
+    results = {name: [] for _, name, *_ in self.sources}
+    async for batch in self.batches():
+      for name, measurement in batch:
+        results[name].append(measurement)
+    return results
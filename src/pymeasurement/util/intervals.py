@@ -0,0 +1,176 @@
+from pymeasurement.measurement import Measurement
+import numpy as np
+
+def bounds(measurements, k=1):
+  """Returns the interval [sample - k * u, sample + k * u] of each Measurement object, where u is its absolute uncertainty. Measurement objects without an uncertainty are single points.
+
+  :param measurements: The Measurement objects.
+  :type measurements: Iterable<Measurement>
+  :param k: The coverage factor.
+  :type k: float
+  :return: The lower bounds, upper bounds and units.
+  :rtype: tuple
+  """
+  samples, uncertainties, units = Measurement.toArrays(measurements)
+  width = k * np.nan_to_num(uncertainties, nan=0.0)
+  return samples - width, samples + width, units
+
+def consistentWith(column, reference, k=1):
+  """Checks which Measurement objects of a column are consistent with a reference, that is whose difference from the reference is within k times its uncertainty. Following the addition rule of Measurement, the uncertainty of the difference is the sum of the absolute uncertainties, so this is the same as their k intervals overlapping.
+
+  :param column: The Measurement objects.
+  :type column: Iterable<Measurement>
+  :param reference: The reference.
+  :type reference: Measurement
+  :param k: The coverage factor.
+  :type k: float
+  :return: Whether each Measurement object is consistent with the reference, as a pandas Series if the column is a Series and as a NumPy array otherwise.
+  :rtype: numpy.ndarray or pandas.core.series.Series
+  """
+  lower, upper, units = bounds(column, k)
+  low, high = referenceBounds(reference, units, k)
+  consistent = (lower <= high) & (upper >= low)
+  if hasattr(column, 'index') and not isinstance(column, (list, tuple)):
+    import pandas as pd
+    return pd.Series(consistent, index=column.index, name=getattr(column, 'name', None))
+  return consistent
+
+def referenceBounds(reference, units, k=1):
+  """Returns the interval of a reference, converted into the given units.
+
+  :param reference: The reference.
+  :type reference: Measurement
+  :param units: The units of the column being compared.
+  :type units: str or None
+  :param k: The coverage factor.
+  :type k: float
+  :return: The lower and upper bound.
+  :rtype: tuple
+  """
+  if units is not None and reference.units != units:
+    reference = reference.to(units)
+  lower, upper, _ = bounds([reference], k)
+  return lower[0], upper[0]
+
+class IntervalIndex:
+  """A class to index the intervals [sample - k * u, sample + k * u] of Measurement objects in a centered interval tree. Stabbing and overlap queries take O(log n + m) time for m results, and all overlapping pairs are found with a sweep over the sorted lower bounds in O(n log n + m) time. Queries return the positions of the Measurement objects, in ascending order.
+
+  :param measurements: The Measurement objects. All must have the same units.
+  :type measurements: Iterable<Measurement>
+  :param k: The coverage factor.
+  :type k: float
+  :param leafSize: The largest number of intervals scanned directly instead of split further.
+  :type leafSize: int
+  """
+  def __init__(self, measurements, k=1, leafSize=64):
+    """IntervalIndex Constructor
+    """
+    self.measurements = list(measurements)
+    self.k = k
+    self.leafSize = leafSize
+    self.lower, self.upper, self.units = bounds(self.measurements, k)
+    self.nodes = [] # (center, ids by lower, sorted lower, ids by upper, sorted upper descending, left, right), or (None, ids) for a leaf.
+    self.root = self.build(np.arange(len(self.measurements)))
+
+  def build(self, ids):
+    """Builds the subtree of the given intervals.
+
+    :param ids: The positions of the intervals.
+    :type ids: numpy.ndarray
+    :return: The position of the node in nodes.
+    :rtype: int
+    """
+    if len(ids) <= self.leafSize:
+      self.nodes.append((None, ids))
+      return len(self.nodes) - 1
+    lower = self.lower[ids]
+    upper = self.upper[ids]
+    center = np.median((lower + upper) / 2)
+    here = (lower <= center) & (upper >= center)
+    byLower = ids[here][np.argsort(lower[here], kind='stable')]
+    byUpper = ids[here][np.argsort(-upper[here], kind='stable')]
+    node = len(self.nodes)
+    self.nodes.append(None)
+    left = self.build(ids[upper < center])
+    right = self.build(ids[lower > center])
+    self.nodes[node] = (center, byLower, self.lower[byLower], byUpper, -self.upper[byUpper], left, right)
+    return node
+
+  def query(self, low, high):
+    """Returns the intervals that overlap [low, high].
+
+    :param low: The lower bound.
+    :type low: float
+    :param high: The upper bound.
+    :type high: float
+    :return: The positions of the Measurement objects.
+    :rtype: numpy.ndarray
+    """
+    found = []
+    stack = [self.root]
+    while stack:
+      node = self.nodes[stack.pop()]
+      if node[0] is None:
+        ids = node[1]
+        found.append(ids[(self.lower[ids] <= high) & (self.upper[ids] >= low)])
+        continue
+      center, byLower, lowers, byUpper, uppers, left, right = node
+      if high < center:
+        found.append(byLower[:np.searchsorted(lowers, high, side='right')])
+        stack.append(left)
+      elif low > center:
+        found.append(byUpper[:np.searchsorted(uppers, -low, side='right')])
+        stack.append(right)
+      else:
+        found.append(byLower)
+        stack.append(left)
+        stack.append(right)
+    return np.sort(np.concatenate(found)) if found else np.zeros(0, dtype=int)
+
+  def stab(self, value):
+    """Returns the intervals that contain a value.
+
+    :param value: The value, in the units of the index.
+    :type value: Measurement or float
+    :return: The positions of the Measurement objects.
+    :rtype: numpy.ndarray
+    """
+    if isinstance(value, Measurement):
+      value = float((value.to(self.units) if self.units is not None and value.units != self.units else value).sample.decimal)
+    return self.query(value, value)
+
+  def consistentWith(self, reference, k=None):
+    """Returns the Measurement objects consistent with a reference. See :func:`consistentWith`.
+
+    :param reference: The reference.
+    :type reference: Measurement
+    :param k: The coverage factor of the reference. Defaults to the coverage factor of the index.
+    :type k: float or None
+    :return: The positions of the Measurement objects.
+    :rtype: numpy.ndarray
+    """
+    return self.query(*referenceBounds(reference, self.units, self.k if k is None else k))
+
+  def overlappingPairs(self):
+    """Returns every pair of overlapping intervals.
+
+    :return: An array of shape (m, 2) holding the positions of each pair, with the smaller position first.
+    :rtype: numpy.ndarray
+    """
+    order = np.argsort(self.lower, kind='stable')
+    lowers = self.lower[order]
+    ends = np.searchsorted(lowers, self.upper[order], side='right')
+    starts = np.arange(1, len(order) + 1)
+    counts = np.maximum(ends - starts, 0)
+    first = np.repeat(np.arange(len(order)), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    pairs = np.stack([order[first], order[starts[first] + offsets]], axis=1)
+    return np.sort(pairs, axis=1)
+
+  def __len__(self):
+    """Returns the number of indexed Measurement objects.
+
+    :return: The number of Measurement objects.
+    :rtype: int
+    """
+    return len(self.measurements)
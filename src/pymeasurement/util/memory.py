@@ -0,0 +1,170 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.sigfig import SigFig
+from pymeasurement.util.chem.element import Element
+from pymeasurement.util.chem.compound import Compound
+import gc
+import tracemalloc
+
+# Representative objects of each class, created from the row number. Each is created once before measuring, so that caches such as the periodic table are already loaded.
+objectFactories = {
+  'SigFig': lambda i: SigFig(f'{i}.25'),
+  'Measurement': lambda i: Measurement.fromStr(f'{i}.25 +/- 0.01 kg'),
+  'Element': lambda i: Element(['H', 'C', 'O', 'N', 'Fe', 'Na', 'Cl', 'S'][i % 8]),
+  'Compound': lambda i: Compound(['C6H12O6', 'NaCl', 'H2O', 'Fe2O3'][i % 4]),
+}
+
+# The default budget of each class, in bytes per object. They leave about 50% of headroom over the measured sizes, so that only real regressions exceed them.
+budgets = {
+  'SigFig': 600,
+  'Measurement': 1600,
+  'Element': 1200,
+  'Compound': 4500,
+}
+
+# The default peak budget of each pipeline, as (bytes per row, fixed bytes). A streaming pipeline only holds a few chunks at once, so its budget does not grow with the number of rows.
+pipelineBudgets = {
+  'pipeline.dataframe': (3500, 0),
+  'pipeline.stream': (0, 8 * 2 ** 20),
+}
+
+def traced(function, *args, **kwargs):
+  """Calls a function while tracing allocations with tracemalloc.
+
+  :param function: The function.
+  :type function: function
+  :return: The result of the function, the bytes still allocated when it returns and the peak bytes allocated while it ran.
+  :rtype: tuple
+  """
+  gc.collect()
+  started = tracemalloc.is_tracing()
+  if not started:
+    tracemalloc.start()
+  try:
+    tracemalloc.reset_peak()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function(*args, **kwargs)
+    current, peak = tracemalloc.get_traced_memory()
+  finally:
+    if not started:
+      tracemalloc.stop()
+  return result, current - before, peak - before
+
+def bytesPerObject(factory, n=1000):
+  """Measures the average number of bytes allocated for each object a factory creates, including every object it references that is not shared with the others.
+
+  :param factory: The function creating an object from the row number.
+  :type factory: function
+  :param n: The number of objects to create.
+  :type n: int
+  :return: The bytes per object.
+  :rtype: float
+  """
+  factory(0)
+  objects = [None] * n
+  def create():
+    for i in range(n):
+      objects[i] = factory(i)
+  _, retained, _ = traced(create)
+  return retained / n
+
+def objectSizes(n=1000, factories=None):
+  """Measures the bytes per object of SigFig, Measurement, Element and Compound objects.
+
+  :param n: The number of objects of each class to create.
+  :type n: int
+  :param factories: The factory of each name. Defaults to objectFactories.
+  :type factories: dict or None
+  :return: The bytes per object of each name.
+  :rtype: dict
+  """
+  factories = factories if factories is not None else objectFactories
+  return {name: bytesPerObject(factory, n) for name, factory in factories.items()}
+
+def dataframePipeline(rows):
+  """Imports a numeric column into Measurement objects, multiplies it by a Measurement and exports it back, as a lab table is processed with pandas.
+
+  :param rows: The number of rows.
+  :type rows: int
+  :return: The exported DataFrame.
+  :rtype: pandas.core.frame.DataFrame
+  """
+  import pandas as pd
+  df = pd.DataFrame({'Mass (g)': [i + 0.25 for i in range(rows)]})
+  df['Mass (g)'] = Measurement.importColumn(df['Mass (g)'], uncertainty=0.01, units='g')
+  df['Weight (g*m/s^2)'] = df['Mass (g)'].apply(lambda m: m * Measurement.fromStr('9.81 +/- 0.01 m/s^2'))
+  Measurement.exportColumn(df, df['Weight (g*m/s^2)'])
+  return df
+
+def streamPipeline(rows, chunkSize=1000):
+  """Parses readings, multiplies them by a Measurement and counts them with a lazy Pipeline, which only holds a few chunks at once.
+
+  :param rows: The number of rows.
+  :type rows: int
+  :param chunkSize: The number of rows in a chunk.
+  :type chunkSize: int
+  :return: The number of rows processed.
+  :rtype: int
+  """
+  from pymeasurement.util.pipeline import Pipeline
+  g = Measurement.fromStr('9.81 +/- 0.01 m/s^2')
+  readings = (f'{i}.25 +/- 0.01 g' for i in range(rows))
+  return Pipeline(readings, chunkSize=chunkSize).parse().map(lambda m: m * g).count()
+
+pipelines = {'pipeline.dataframe': dataframePipeline, 'pipeline.stream': streamPipeline} # The representative pipelines, each taking the number of rows.
+
+def pipelinePeaks(rows=1000000, names=None):
+  """Measures the peak memory of the representative pipelines, such as a 1M-row import, multiply and export.
+
+  :param rows: The number of rows.
+  :type rows: int
+  :param names: The names of the pipelines to run. Defaults to every pipeline.
+  :type names: list or None
+  :return: The peak bytes of each pipeline.
+  :rtype: dict
+  """
+  names = names if names is not None else list(pipelines)
+  results = {}
+  for name in names:
+    pipelines[name](min(rows, 100))
+    _, _, results[name] = traced(pipelines[name], rows)
+  return results
+
+def pipelineLimits(rows=1000000):
+  """Returns the peak budget of each pipeline for a number of rows, from pipelineBudgets.
+
+  :param rows: The number of rows.
+  :type rows: int
+  :return: The budget of each pipeline in bytes.
+  :rtype: dict
+  """
+  return {name: perRow * rows + fixed for name, (perRow, fixed) in pipelineBudgets.items()}
+
+def checkBudgets(results, limits=None):
+  """Checks measured sizes against budgets, raising if any is over its budget.
+
+  :param results: The measured size of each name in bytes, such as the output of objectSizes or pipelinePeaks.
+  :type results: dict
+  :param limits: The budget of each name in bytes, overriding the default budgets of the classes.
+  :type limits: dict or None
+  :return: The measured sizes.
+  :rtype: dict
+  """
+  limits = {**budgets, **(limits or {})}
+  over = [f'{name} uses {size:.0f} bytes, over its budget of {limits[name]}' for name, size in results.items() if name in limits and size > limits[name]]
+  if over:
+    raise Exception('Memory Error: ' + '; '.join(over) + '.')
+  return results
+
+def benchmark(rows=1000000, n=1000, limits=None):
+  """Measures the bytes per object of each class and the peak bytes of each pipeline, and checks them against budgets, raising if any is over its budget.
+
+  :param rows: The number of rows of each pipeline.
+  :type rows: int
+  :param n: The number of objects of each class to create.
+  :type n: int
+  :param limits: The budget of each name, overriding the default budgets.
+  :type limits: dict or None
+  :return: The measured size of each name.
+  :rtype: dict
+  """
+  return checkBudgets({**objectSizes(n), **pipelinePeaks(rows)}, {**pipelineLimits(rows), **(limits or {})})
@@ -0,0 +1,252 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.util.ingest import parseReading
+import collections
+import concurrent.futures
+import functools
+import itertools
+
+def chunked(records, chunkSize):
+  """Groups records into lists of chunkSize records, reading only one chunk ahead.
+
+  :param records: The records.
+  :type records: Iterable
+  :param chunkSize: The number of records in a chunk.
+  :type chunkSize: int
+  :return: The chunks.
+  :rtype: Iterator<list>
+  """
+  records = iter(records)
+  while True:
+    chunk = list(itertools.islice(records, chunkSize))
+    if not chunk:
+      return
+    yield chunk
+
+def fileLines(path, encoding='utf-8'):
+  """Produces the non-empty lines of a text file, one at a time.
+
+  :param path: The path of the file.
+  :type path: str
+  :param encoding: The encoding of the file.
+  :type encoding: str
+  :return: The lines of the file.
+  :rtype: Iterator<str>
+  """
+  with open(path, encoding=encoding) as f:
+    for line in f:
+      line = line.strip()
+      if line:
+        yield line
+
+def mapChunk(function, chunk):
+  """Applies a function to each record of a chunk.
+
+  :param function: The function.
+  :type function: function
+  :param chunk: The records.
+  :type chunk: list
+  :return: The results.
+  :rtype: list
+  """
+  return [function(record) for record in chunk]
+
+def filterChunk(predicate, chunk):
+  """Keeps the records of a chunk for which a predicate is true.
+
+  :param predicate: The predicate.
+  :type predicate: function
+  :param chunk: The records.
+  :type chunk: list
+  :return: The records that were kept.
+  :rtype: list
+  """
+  return [record for record in chunk if predicate(record)]
+
+executors = {'thread': concurrent.futures.ThreadPoolExecutor, 'process': concurrent.futures.ProcessPoolExecutor} # The pool of each executor name.
+
+def runStage(chunks, function, executor=None, workers=None):
+  """Runs a stage over chunks, in order. In a pool, at most twice as many chunks as workers are in flight at once, so the stage reads ahead of its consumer by a bounded amount instead of submitting the whole stream.
+
+  :param chunks: The input chunks.
+  :type chunks: Iterator<list>
+  :param function: The function converting an input chunk into an output chunk.
+  :type function: function
+  :param executor: The pool to run the stage in. 'thread' and 'process' create a pool for the stage that is shut down when the stream ends.
+  :type executor: str or concurrent.futures.Executor or None
+  :param workers: The number of workers of a created pool.
+  :type workers: int or None
+  :return: The output chunks.
+  :rtype: Iterator<list>
+  """
+  if executor is None:
+    for chunk in chunks:
+      yield function(chunk)
+    return
+  owned = isinstance(executor, str)
+  if owned:
+    if executor not in executors:
+      raise Exception(f'Pipeline Error: Unknown executor "{executor}". Use one of {list(executors)}.')
+    pool = executors[executor](max_workers=workers)
+  else:
+    pool = executor
+  window = 2 * (workers or getattr(pool, '_max_workers', None) or 4)
+  pending = collections.deque()
+  try:
+    for chunk in chunks:
+      pending.append(pool.submit(function, chunk))
+      if len(pending) >= window:
+        yield pending.popleft().result()
+    while pending:
+      yield pending.popleft().result()
+  finally:
+    for future in pending:
+      future.cancel()
+    if owned:
+      pool.shutdown()
+
+class Pipeline:
+  """A class to stream records from a source through lazy stages, such as parsing, arithmetic, apply_func and unit conversion, into a sink. Records flow through every stage a chunk at a time, so only a few chunks are held in memory at once instead of a full list of Measurement objects between each step. Any stage can run in a thread or process pool. Functions run in a process pool must be picklable, so they must be defined at module level.
+
+  :param source: The source of records, such as the lines of a file from :func:`fileLines`.
+  :type source: Iterable
+  :param chunkSize: The number of records in a chunk.
+  :type chunkSize: int
+  """
+  def __init__(self, source, chunkSize=1000):
+    """Pipeline Constructor
+    """
+    if chunkSize < 1:
+      raise Exception('Pipeline Error: Chunk size must be at least 1.')
+    self.source = source
+    self.chunkSize = chunkSize
+    self.stages = [] # (chunk function, executor, workers) of each stage, in order.
+
+  def stage(self, function, executor=None, workers=None):
+    """Adds a stage that converts whole chunks.
+
+    :param function: The function converting an input chunk into an output chunk.
+    :type function: function
+    :param executor: The pool to run the stage in, 'thread', 'process' or an Executor.
+    :type executor: str or concurrent.futures.Executor or None
+    :param workers: The number of workers of a created pool.
+    :type workers: int or None
+    :return: This Pipeline object.
+    :rtype: Pipeline
+    """
+    self.stages.append((function, executor, workers))
+    return self
+
+  def map(self, function, executor=None, workers=None):
+    """Adds a stage that applies a function to each record, such as arithmetic or apply_func.
+
+    :param function: The function.
+    :type function: function
+    :return: This Pipeline object.
+    :rtype: Pipeline
+    """
+    return self.stage(functools.partial(mapChunk, function), executor, workers)
+
+  def filter(self, predicate, executor=None, workers=None):
+    """Adds a stage that keeps the records for which a predicate is true.
+
+    :param predicate: The predicate.
+    :type predicate: function
+    :return: This Pipeline object.
+    :rtype: Pipeline
+    """
+    return self.stage(functools.partial(filterChunk, predicate), executor, workers)
+
+  def parse(self, units=None, digital=False, analog=False, executor=None, workers=None):
+    """Adds a stage that parses raw readings into Measurement objects. See :func:`pymeasurement.util.ingest.parseReading`.
+
+    :param units: The units of readings that do not carry their own units.
+    :type units: str or None
+    :param digital: Whether the readings are from a digital instrument.
+    :type digital: bool
+    :param analog: Whether the readings are from an analog instrument.
+    :type analog: bool
+    :return: This Pipeline object.
+    :rtype: Pipeline
+    """
+    return self.map(functools.partial(parseReading, units=units, digital=digital, analog=analog), executor, workers)
+
+  def convert(self, units, executor=None, workers=None):
+    """Adds a stage that converts Measurement objects into other units. See Measurement.convertColumn.
+
+    :param units: The units to convert to.
+    :type units: str
+    :return: This Pipeline object.
+    :rtype: Pipeline
+    """
+    return self.stage(functools.partial(Measurement.convertColumn, units=units), executor, workers)
+
+  def chunks(self):
+    """Runs the pipeline, producing the output a chunk at a time. Empty chunks are skipped.
+
+    :return: The output chunks.
+    :rtype: Iterator<list>
+    """
+    chunks = chunked(self.source, self.chunkSize)
+    for function, executor, workers in self.stages:
+      chunks = runStage(chunks, function, executor, workers)
+    for chunk in chunks:
+      if chunk:
+        yield chunk
+
+  def __iter__(self):
+    """Runs the pipeline, producing the output one record at a time.
+
+    :return: The output records.
+    :rtype: Iterator
+    """
+    for chunk in self.chunks():
+      yield from chunk
+
+  def collect(self):
+    """Runs the pipeline and collects the output.
+
+    :return: The output records.
+    :rtype: list
+    """
+    return list(self)
+
+  def reduce(self, function, initial):
+    """Runs the pipeline and folds the output into a single value.
+
+    :param function: The function combining the value so far with a record.
+    :type function: function
+    :param initial: The initial value.
+    :type initial: object
+    :return: The final value.
+    :rtype: object
+    """
+    return functools.reduce(function, self, initial)
+
+  def count(self):
+    """Runs the pipeline and counts the output.
+
+    :return: The number of output records.
+    :rtype: int
+    """
+    return sum(len(chunk) for chunk in self.chunks())
+
+  def write(self, path, name='Measurement', **kwargs):
+    """Runs the pipeline and streams the output to a csv or xlsx file, a chunk at a time. See :class:`pymeasurement.util.report.ReportWriter`.
+
+    :param path: The path of the file.
+    :type path: str
+    :param name: The name of the column when records are single values. Records that are dicts are written as rows with a column per key.
+    :type name: str
+    :param kwargs: Keyword arguments to pass to ReportWriter.
+    :type kwargs: dict
+    :return: The number of rows written.
+    :rtype: int
+    """
+    from pymeasurement.util.report import ReportWriter
+    with ReportWriter(path, **kwargs) as writer:
+      for chunk in self.chunks():
+        if isinstance(chunk[0], dict):
+          writer.write({key: [record[key] for record in chunk] for key in chunk[0]})
+        else:
+          writer.write({name: chunk})
+    return writer.rows
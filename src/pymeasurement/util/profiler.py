@@ -0,0 +1,206 @@
+import contextvars
+import threading
+import time
+from contextlib import contextmanager
+
+active = None # The Dispatcher routing events to the Profile of the current thread, or None when no thread is profiling.
+
+current = contextvars.ContextVar('profile', default=None) # The Profile of the innermost profile block of the current thread or task.
+
+class Profile:
+  """A class to collect operation counters and operator timings while a :func:`profile` block is active.
+
+  Counters are keyed by event name (for example ``'SigFig'``, ``'Measurement'``, ``'Context'``, ``'units.parse'``, ``'Measurement.deepCopy'``, ``'Compound'`` or ``'apply_func.diff'``). Timings are keyed by operator name (for example ``'Measurement.__mul__'``) and are inclusive, so an operator that calls another operator counts the time of both.
+  """
+  def __init__(self):
+    """Profile Constructor
+    """
+    self.counts = {}
+    self.times = {}
+    self.calls = {}
+
+  def count(self, event, n=1):
+    """Increments the counter for an event.
+
+    :param event: The name of the event.
+    :type event: str
+    :param n: The amount to increment the counter by.
+    :type n: int
+    """
+    self.counts[event] = self.counts.get(event, 0) + n
+
+  def addTime(self, operator, seconds):
+    """Adds a timed call of an operator.
+
+    :param operator: The name of the operator.
+    :type operator: str
+    :param seconds: The time spent in the operator in seconds.
+    :type seconds: float
+    """
+    self.times[operator] = self.times.get(operator, 0.0) + seconds
+    self.calls[operator] = self.calls.get(operator, 0) + 1
+
+  def merge(self, other):
+    """Adds the counters and timings of another Profile to this one.
+
+    :param other: The Profile to merge into this one.
+    :type other: Profile
+    """
+    for event, n in other.counts.items():
+      self.count(event, n)
+    for operator, seconds in other.times.items():
+      self.times[operator] = self.times.get(operator, 0.0) + seconds
+      self.calls[operator] = self.calls.get(operator, 0) + other.calls[operator]
+
+  def report(self):
+    """Returns a plain text report of the counters and timings, with the most expensive entries first.
+
+    :return: The report.
+    :rtype: str
+    """
+    lines = ['Counters:']
+    for event, n in sorted(self.counts.items(), key=lambda x: -x[1]):
+      lines.append(f'  {event:<32}{n:>12}')
+    lines.append('Operators:')
+    for operator, seconds in sorted(self.times.items(), key=lambda x: -x[1]):
+      lines.append(f'  {operator:<32}{self.calls[operator]:>12}{seconds:>14.6f} s')
+    return '\n'.join(lines)
+
+  def __str__(self):
+    """Returns the string representation of the Profile.
+
+    :return: The string representation of the Profile.
+    :rtype: str
+    """
+    return self.report()
+
+  def __repr__(self):
+    """Returns the string representation of the Profile.
+
+    :return: The string representation of the Profile.
+    :rtype: str
+    """
+    return str(self)
+
+class Dispatcher:
+  """A class to route events to the Profile of the current thread or task, so that a profile block only collects the events of the code it runs, even while other threads use SigFig and Measurement objects.
+  """
+  def count(self, event, n=1):
+    """Increments the counter for an event on the Profile of the current thread. Does nothing if the current thread is not profiling.
+
+    :param event: The name of the event.
+    :type event: str
+    :param n: The amount to increment the counter by.
+    :type n: int
+    """
+    profile = current.get()
+    if profile is not None:
+      profile.count(event, n)
+
+  def addTime(self, operator, seconds):
+    """Adds a timed call of an operator to the Profile of the current thread. Does nothing if the current thread is not profiling.
+
+    :param operator: The name of the operator.
+    :type operator: str
+    :param seconds: The time spent in the operator in seconds.
+    :type seconds: float
+    """
+    profile = current.get()
+    if profile is not None:
+      profile.addTime(operator, seconds)
+
+def count(event, n=1):
+  """Increments the counter for an event on the Profile of the current thread. Does nothing when profiling is disabled. Hot paths check ``profiler.active`` inline instead of calling this function.
+
+  :param event: The name of the event.
+  :type event: str
+  :param n: The amount to increment the counter by.
+  :type n: int
+  """
+  if active is not None:
+    active.count(event, n)
+
+def _timed(name, func):
+  """Wraps an operator so that each call adds its duration to the active Profile.
+
+  :param name: The name to record the timing under.
+  :type name: str
+  :param func: The operator to wrap.
+  :type func: function
+  :return: The wrapped operator.
+  :rtype: function
+  """
+  def wrapper(*args, **kwargs):
+    start = time.perf_counter()
+    try:
+      return func(*args, **kwargs)
+    finally:
+      if active is not None:
+        active.addTime(name, time.perf_counter() - start)
+  wrapper.__name__ = func.__name__
+  wrapper.__doc__ = func.__doc__
+  wrapper.__wrapped__ = func
+  return wrapper
+
+operators = ['__neg__', '__add__', '__radd__', '__sub__', '__rsub__', '__mul__', '__rmul__', '__truediv__', '__rtruediv__', '__pow__', '__eq__', '__lt__', '__gt__', '__le__', '__ge__'] # Operators timed while profiling.
+
+def _instrument():
+  """Replaces the operators of SigFig and Measurement with timed wrappers.
+
+  :return: The original operators, to be restored by :func:`_restore`.
+  :rtype: list
+  """
+  from pymeasurement.sigfig import SigFig
+  from pymeasurement.measurement import Measurement
+  originals = []
+  for cls in [SigFig, Measurement]:
+    for op in operators:
+      if op in cls.__dict__:
+        func = cls.__dict__[op]
+        originals.append((cls, op, func))
+        setattr(cls, op, _timed(f'{cls.__name__}.{op}', func))
+  return originals
+
+def _restore(originals):
+  """Restores the operators replaced by :func:`_instrument`.
+
+  :param originals: The original operators.
+  :type originals: list
+  """
+  for cls, op, func in originals:
+    setattr(cls, op, func)
+
+_depth = 0 # The number of open profile blocks in every thread.
+_originals = []
+_lock = threading.Lock()
+
+@contextmanager
+def profile():
+  """Collects operation counters and operator timings for the duration of a with block. Outside of a profile block the counters cost a single ``None`` check and the operators are not wrapped at all.
+
+  Profile blocks can be nested. Each block gets its own Profile, and the events of an inner block are also added to the outer block. Each thread and asyncio task collects into its own Profile, so profiling one thread neither counts nor times the operations of another. The operators are wrapped while any thread is profiling and restored when the last block closes.
+
+  :return: The Profile collecting the events of the block.
+  :rtype: Profile
+  """
+  global active, _depth, _originals
+  previous = current.get()
+  block = Profile()
+  with _lock:
+    if _depth == 0:
+      _originals = _instrument()
+      active = Dispatcher()
+    _depth += 1
+  token = current.set(block)
+  try:
+    yield block
+  finally:
+    current.reset(token)
+    with _lock:
+      _depth -= 1
+      if _depth == 0:
+        active = None
+        _restore(_originals)
+        _originals = []
+    if previous is not None:
+      previous.merge(block)
@@ -0,0 +1,164 @@
+from pymeasurement.measurement import Measurement
+import re
+
+# Renderers that format whole columns of Measurement objects at once. Each Measurement column is split into a value column and a ± column, the units of a column are formatted once for its header instead of once per row, and the values are formatted directly from their Decimal representations.
+
+latexUnitsCache = {} # LaTeX units strings, shared by all renderers.
+
+latexSpecial = {'\\': r'\textbackslash{}', '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_', '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}', '^': r'\textasciicircum{}'}
+
+def escapeLatex(string):
+  """Escapes the LaTeX special characters of a string.
+
+  :param string: The string to escape.
+  :type string: str
+  :return: The escaped string.
+  :rtype: str
+  """
+  return ''.join(latexSpecial.get(c, c) for c in string)
+
+def latexUnits(units):
+  """Formats a units string in LaTeX, writing powers as superscripts. Results are cached per units string.
+
+  :param units: The units string, such as ``'m/s^2'``.
+  :type units: str
+  :return: The LaTeX units string.
+  :rtype: str
+  """
+  if units in latexUnitsCache:
+    return latexUnitsCache[units]
+  if len(latexUnitsCache) >= 4096:
+    latexUnitsCache.clear()
+  parts = re.split(r'\^(-?\d+)', units)
+  formatted = ''.join(f'$^{{{p}}}$' if i % 2 else escapeLatex(p).replace('*', r'$\cdot$') for i, p in enumerate(parts))
+  latexUnitsCache[units] = formatted
+  return formatted
+
+def latexNumber(string):
+  """Formats a number string in LaTeX, writing E notation as a power of ten.
+
+  :param string: The number string, such as ``'2.5E+4'``.
+  :type string: str
+  :return: The LaTeX number string.
+  :rtype: str
+  """
+  if 'E' not in string:
+    return string
+  mantissa, exponent = string.split('E')
+  return f'${mantissa}\\times10^{{{int(exponent)}}}$'
+
+def formatColumn(column):
+  """Formats a column of Measurement objects.
+
+  :param column: The Measurement objects.
+  :type column: Iterable<Measurement>
+  :return: The value strings, the uncertainty strings (empty where a Measurement has no uncertainty), whether each uncertainty is a percent, and the units of the column, or None if the units are mixed.
+  :rtype: tuple
+  """
+  column = list(column)
+  units = set(m.units for m in column)
+  uniform = len(units) <= 1
+  values = [str(m.sample.decimal) for m in column]
+  if not uniform:
+    values = [f'{v} {m.units}' if m.units else v for v, m in zip(values, column)]
+  uncertainties = ['' if m.uncertainty is None else str(m.uncertainty.decimal) for m in column]
+  percents = [m.uncertaintyPercent and m.uncertainty is not None for m in column]
+  return values, uncertainties, percents, (units.pop() if units else None) if uniform else None
+
+def columns(data, name=None):
+  """Returns the (name, column) pairs of a table.
+
+  :param data: The table, as a DataFrame, a dict of columns or a single column of Measurement objects.
+  :type data: pandas.core.frame.DataFrame or dict or Iterable<Measurement>
+  :param name: The name of a single column.
+  :type name: str or None
+  :return: The (name, column) pairs.
+  :rtype: list
+  """
+  if isinstance(data, dict):
+    return [(str(k), list(v)) for k, v in data.items()]
+  if hasattr(data, 'columns') and hasattr(data, 'items'):
+    return [(str(k), list(v)) for k, v in data.items()]
+  return [(name if name is not None else (getattr(data, 'name', None) or 'Value'), list(data))]
+
+def cells(data, name=None, number=str, units=str, escape=str, pm='±'):
+  """Formats a table into a header and rows of cell strings. Each Measurement column becomes a value column and a ± column. When a column has a single unit, the unit is written in the header and omitted from the cells.
+
+  :param data: The table, as a DataFrame, a dict of columns or a single column of Measurement objects.
+  :type data: pandas.core.frame.DataFrame or dict or Iterable<Measurement>
+  :param name: The name of a single column.
+  :type name: str or None
+  :param number: Formats a number string.
+  :type number: function
+  :param units: Formats a units string.
+  :type units: function
+  :param escape: Formats any other string.
+  :type escape: function
+  :param pm: The ± symbol.
+  :type pm: str
+  :return: The header and rows.
+  :rtype: tuple
+  """
+  header = []
+  body = []
+  for key, column in columns(data, name):
+    if column and all(isinstance(m, Measurement) for m in column):
+      values, uncertainties, percents, columnUnits = formatColumn(column)
+      header.append(escape(key) + (f' ({units(columnUnits)})' if columnUnits else ''))
+      body.append([number(v) if columnUnits is not None else escape(v) for v in values])
+      if any(uncertainties):
+        header.append(pm)
+        body.append([number(u) + (escape('%') if p else '') for u, p in zip(uncertainties, percents)])
+    else:
+      header.append(escape(key))
+      body.append([escape(str(v)) for v in column])
+  lengths = set(len(c) for c in body)
+  if len(lengths) > 1:
+    raise Exception('Render Error: Columns must have the same length.')
+  return header, [list(row) for row in zip(*body)]
+
+def toText(data, name=None):
+  """Renders a table of Measurement objects as aligned plain text.
+
+  :param data: The table, as a DataFrame, a dict of columns or a single column of Measurement objects.
+  :type data: pandas.core.frame.DataFrame or dict or Iterable<Measurement>
+  :param name: The name of a single column.
+  :type name: str or None
+  :return: The plain text table.
+  :rtype: str
+  """
+  header, rows = cells(data, name)
+  widths = [max([len(h)] + [len(r[i]) for r in rows]) for i, h in enumerate(header)]
+  lines = ['  '.join(c.ljust(w) for c, w in zip(row, widths)).rstrip() for row in [header] + rows]
+  return '\n'.join(lines)
+
+def toMarkdown(data, name=None):
+  """Renders a table of Measurement objects as a Markdown table.
+
+  :param data: The table, as a DataFrame, a dict of columns or a single column of Measurement objects.
+  :type data: pandas.core.frame.DataFrame or dict or Iterable<Measurement>
+  :param name: The name of a single column.
+  :type name: str or None
+  :return: The Markdown table.
+  :rtype: str
+  """
+  header, rows = cells(data, name, escape=lambda s: s.replace('|', r'\|'))
+  lines = ['| ' + ' | '.join(header) + ' |', '|' + '|'.join(['---'] * len(header)) + '|']
+  lines += ['| ' + ' | '.join(row) + ' |' for row in rows]
+  return '\n'.join(lines)
+
+def toLatex(data, name=None):
+  """Renders a table of Measurement objects as a LaTeX tabular.
+
+  :param data: The table, as a DataFrame, a dict of columns or a single column of Measurement objects.
+  :type data: pandas.core.frame.DataFrame or dict or Iterable<Measurement>
+  :param name: The name of a single column.
+  :type name: str or None
+  :return: The LaTeX tabular.
+  :rtype: str
+  """
+  header, rows = cells(data, name, number=latexNumber, units=latexUnits, escape=escapeLatex, pm=r'$\pm$')
+  lines = [f"\\begin{{tabular}}{{{'l' * len(header)}}}", r'\hline', ' & '.join(header) + r' \\', r'\hline']
+  lines += [' & '.join(row) + r' \\' for row in rows]
+  lines += [r'\hline', r'\end{tabular}']
+  return '\n'.join(lines)
@@ -0,0 +1,219 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.util.formula import absoluteUncertainty, percentUncertainty
+import csv
+import os
+
+def uncertaintyHeader(name, asPercent):
+  """Returns the name of the uncertainty column of a Measurement column, as Measurement.exportColumn names it.
+
+  :param name: The name of the Measurement column, such as ``'Force (N)'``.
+  :type name: str
+  :param asPercent: Whether the uncertainty is written as a percent.
+  :type asPercent: bool
+  :return: The name of the uncertainty column.
+  :rtype: str
+  """
+  label, units = (' ('.join(name.split(' (')[:-1]), ' (' + name.split(' (')[-1]) if ' (' in name else (name, '')
+  return f'{label} Percent Uncertainty (%)' if asPercent else f'{label} Absolute Uncertainty{units}'
+
+class CSVSink:
+  """A class to write rows to a csv file as they arrive.
+
+  :param path: The path of the file.
+  :type path: str
+  """
+  numeric = False # Whether cells are written as numbers rather than strings.
+
+  def __init__(self, path):
+    """CSVSink Constructor
+    """
+    self.file = open(path, 'w', newline='')
+    self.writer = csv.writer(self.file)
+
+  def write(self, rows):
+    """Writes rows to the file.
+
+    :param rows: The rows to write.
+    :type rows: Iterable<list>
+    """
+    self.writer.writerows(rows)
+
+  def close(self):
+    """Closes the file.
+    """
+    self.file.close()
+
+class XLSXSink:
+  """A class to write rows to an xlsx file as they arrive, using a write-only openpyxl workbook so that rows are streamed to disk instead of held in memory.
+
+  :param path: The path of the file.
+  :type path: str
+  :param sheetName: The name of the sheet.
+  :type sheetName: str
+  """
+  numeric = True # Whether cells are written as numbers rather than strings.
+
+  def __init__(self, path, sheetName='Sheet1'):
+    """XLSXSink Constructor
+    """
+    try:
+      from openpyxl import Workbook
+    except ImportError:
+      raise Exception('Report Error: Writing xlsx files requires openpyxl. Install it with "pip install openpyxl".')
+    self.path = path
+    self.workbook = Workbook(write_only=True)
+    self.sheet = self.workbook.create_sheet(sheetName)
+
+  def write(self, rows):
+    """Writes rows to the sheet.
+
+    :param rows: The rows to write.
+    :type rows: Iterable<list>
+    """
+    for row in rows:
+      self.sheet.append(row)
+
+  def close(self):
+    """Saves the workbook.
+    """
+    self.workbook.save(self.path)
+
+sinks = {'.csv': CSVSink, '.xlsx': XLSXSink} # The sink of each file extension.
+
+class ReportWriter:
+  """A class to stream tables of Measurement objects to a csv or xlsx file in chunks of rows. Each Measurement column is written as its sample followed by an uncertainty column named as Measurement.exportColumn names it, so the output matches the exported DataFrame without building it in memory. The header is written from the first chunk.
+
+  :param path: The path of the file. The format is determined by its extension, .csv or .xlsx.
+  :type path: str
+  :param addUncertainty: Whether to add uncertainty columns, either for every column or as a dict of column name to bool.
+  :type addUncertainty: bool or dict
+  :param asPercent: Whether to write uncertainties as percents, either for every column or as a dict of column name to bool.
+  :type asPercent: bool or dict
+  :param sheetName: The name of the sheet of an xlsx file.
+  :type sheetName: str
+  """
+  def __init__(self, path, addUncertainty=True, asPercent=True, sheetName='Sheet1'):
+    """ReportWriter Constructor
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in sinks:
+      raise Exception(f'Report Error: Unsupported file type "{extension}". Use one of {list(sinks)}.')
+    self.sink = CSVSink(path) if extension == '.csv' else XLSXSink(path, sheetName=sheetName)
+    self.addUncertainty = addUncertainty
+    self.asPercent = asPercent
+    self.columns = None # (name, isMeasurement, addUncertainty, asPercent) of each column.
+    self.rows = 0
+
+  def option(self, option, name):
+    """Returns the value of a per-column option.
+
+    :param option: The option, either a value for every column or a dict of column name to value.
+    :type option: bool or dict
+    :param name: The name of the column.
+    :type name: str
+    :return: The value of the option for the column.
+    :rtype: bool
+    """
+    return option.get(name, True) if isinstance(option, dict) else option
+
+  def writeHeader(self, columns):
+    """Determines the layout of the report from its first chunk and writes the header.
+
+    :param columns: The (name, column) pairs of the first chunk.
+    :type columns: list
+    """
+    self.columns = []
+    header = []
+    for name, column in columns:
+      isMeasurement = len(column) > 0 and isinstance(column[0], Measurement)
+      add = isMeasurement and self.option(self.addUncertainty, name)
+      asPercent = self.option(self.asPercent, name)
+      self.columns.append((name, isMeasurement, add, asPercent))
+      header.append(name)
+      if add:
+        header.append(uncertaintyHeader(name, asPercent))
+    self.sink.write([header])
+
+  def number(self, sigfig):
+    """Converts a SigFig object into a cell.
+
+    :param sigfig: The number.
+    :type sigfig: SigFig or None
+    :return: The cell.
+    :rtype: float or str or None
+    """
+    if sigfig is None:
+      return None if self.sink.numeric else ''
+    return float(sigfig.decimal) if self.sink.numeric else str(sigfig.decimal)
+
+  def write(self, data):
+    """Writes a chunk of rows.
+
+    :param data: The chunk, as a DataFrame or a dict of columns.
+    :type data: pandas.core.frame.DataFrame or dict
+    :return: This ReportWriter object.
+    :rtype: ReportWriter
+    """
+    columns = [(str(name), list(column)) for name, column in data.items()]
+    if self.columns is None:
+      self.writeHeader(columns)
+    elif [name for name, _ in columns] != [c[0] for c in self.columns]:
+      raise Exception('Report Error: Every chunk must have the same columns as the first.')
+    cells = []
+    for (name, column), (_, isMeasurement, add, asPercent) in zip(columns, self.columns):
+      if not isMeasurement:
+        cells.append(column)
+        continue
+      cells.append([self.number(m.sample) for m in column])
+      if add:
+        uncertainty = percentUncertainty if asPercent else absoluteUncertainty
+        cells.append([self.number(uncertainty((m.sample, m.uncertainty, m.uncertaintyPercent)) if m.uncertainty is not None else None) for m in column])
+    rows = list(zip(*cells))
+    self.sink.write(rows)
+    self.rows += len(rows)
+    return self
+
+  def close(self):
+    """Finishes the file.
+    """
+    self.sink.close()
+
+  def __enter__(self):
+    """Enters the writer context.
+
+    :return: This ReportWriter object.
+    :rtype: ReportWriter
+    """
+    return self
+
+  def __exit__(self, *args):
+    """Closes the writer.
+    """
+    self.close()
+
+def writeReport(path, data, chunkSize=10000, **kwargs):
+  """Streams a table of Measurement objects to a csv or xlsx file, converting and writing chunkSize rows at a time.
+
+  :param path: The path of the file.
+  :type path: str
+  :param data: The table, as a DataFrame, a dict of columns, or an iterable of chunks that are DataFrames or dicts of columns.
+  :type data: pandas.core.frame.DataFrame or dict or Iterable
+  :param chunkSize: The number of rows to convert at a time.
+  :type chunkSize: int
+  :param kwargs: Keyword arguments to pass to ReportWriter.
+  :type kwargs: dict
+  :return: The number of rows written.
+  :rtype: int
+  """
+  with ReportWriter(path, **kwargs) as writer:
+    if hasattr(data, 'iloc'):
+      for i in range(0, len(data), chunkSize):
+        writer.write(data.iloc[i:i + chunkSize])
+    elif isinstance(data, dict):
+      length = len(next(iter(data.values()), []))
+      for i in range(0, length, chunkSize):
+        writer.write({name: column[i:i + chunkSize] for name, column in data.items()})
+    else:
+      for chunk in data:
+        writer.write(chunk)
+  return writer.rows
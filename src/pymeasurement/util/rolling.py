@@ -0,0 +1,285 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.sigfig import SigFig
+from collections import deque
+from decimal import Decimal
+import math
+
+class RollingStatistics:
+  """A class to compute statistics over a sliding window of a stream of Measurement objects. Every pushed reading updates the statistics in constant time. The mean and variance are kept with Welford's algorithm, the exact sum is kept as a Decimal and the minimum, maximum and least precise decimal place are kept with monotonic deques.
+
+  :param window: The number of most recent readings to keep. If None, all readings are kept.
+  :type window: int or None
+  """
+  def __init__(self, window=None):
+    """RollingStatistics Constructor
+    """
+    if window is not None and window < 1:
+      raise Exception('Rolling Statistics Error: Window must be at least 1.')
+    self.window = window
+    self.units = None
+    self.readings = deque() # Samples in the window, oldest first.
+    self.count = 0 # Total number of readings pushed.
+    self.total = Decimal(0) # Exact sum of the samples in the window.
+    self.mean = 0.0
+    self.m2 = 0.0
+    self.maxima = deque() # (index, sample) with decreasing samples.
+    self.minima = deque() # (index, sample) with increasing samples.
+    self.precisions = deque() # (index, decimals) with decreasing decimals.
+
+  def push(self, measurement):
+    """Adds a reading to the window, dropping the oldest reading if the window is full.
+
+    :param measurement: The reading to add.
+    :type measurement: Measurement
+    :return: This RollingStatistics object.
+    :rtype: RollingStatistics
+    """
+    if self.count == 0:
+      self.units = measurement.units
+    elif measurement.units != self.units:
+      raise Exception(f'Rolling Statistics Error: Cannot add {measurement} to a stream with units {self.units}.')
+    sample = measurement.sample
+    index = self.count
+    self.count += 1
+    self.readings.append(sample)
+    self.total += sample.decimalValue
+    x = float(sample.decimalValue)
+    delta = x - self.mean
+    self.mean += delta / len(self.readings)
+    self.m2 += delta * (x - self.mean)
+    while self.maxima and self.maxima[-1][1] <= sample:
+      self.maxima.pop()
+    self.maxima.append((index, sample))
+    while self.minima and self.minima[-1][1] >= sample:
+      self.minima.pop()
+    self.minima.append((index, sample))
+    while self.precisions and self.precisions[-1][1] <= sample.decimals:
+      self.precisions.pop()
+    self.precisions.append((index, sample.decimals))
+    if self.window is not None and len(self.readings) > self.window:
+      self.drop()
+    return self
+
+  def extend(self, measurements):
+    """Adds several readings to the window in order.
+
+    :param measurements: The readings to add.
+    :type measurements: Iterable<Measurement>
+    :return: This RollingStatistics object.
+    :rtype: RollingStatistics
+    """
+    for m in measurements:
+      self.push(m)
+    return self
+
+  def drop(self):
+    """Removes the oldest reading from the window.
+    """
+    sample = self.readings.popleft()
+    oldest = self.count - len(self.readings) - 1
+    self.total -= sample.decimalValue
+    if not self.readings:
+      self.mean = 0.0
+      self.m2 = 0.0
+    else:
+      y = float(sample.decimalValue)
+      delta = y - self.mean
+      self.mean -= delta / len(self.readings)
+      self.m2 = max(self.m2 - delta * (y - self.mean), 0.0)
+    for monotonic in [self.maxima, self.minima, self.precisions]:
+      if monotonic and monotonic[0][0] <= oldest:
+        monotonic.popleft()
+
+  def __len__(self):
+    """Returns the number of readings in the window.
+
+    :return: The number of readings in the window.
+    :rtype: int
+    """
+    return len(self.readings)
+
+  def checkEmpty(self):
+    """Raises an exception if the window is empty.
+    """
+    if not self.readings:
+      raise Exception('Rolling Statistics Error: No readings in the window.')
+
+  def decimals(self):
+    """Returns the decimal place of the least precise reading in the window.
+
+    :return: The decimal place of the least precise reading in the window.
+    :rtype: int
+    """
+    return self.precisions[0][1]
+
+  def max(self):
+    """Returns the maximum of the window.
+
+    :return: The maximum of the window.
+    :rtype: Measurement
+    """
+    self.checkEmpty()
+    return Measurement(self.maxima[0][1], units=self.units)
+
+  def min(self):
+    """Returns the minimum of the window.
+
+    :return: The minimum of the window.
+    :rtype: Measurement
+    """
+    self.checkEmpty()
+    return Measurement(self.minima[0][1], units=self.units)
+
+  def meanSample(self):
+    """Returns the mean of the window as a SigFig, following the same significant figure rules as Measurement.average.
+
+    :return: The mean of the window.
+    :rtype: SigFig
+    """
+    decimals = self.decimals()
+    total = SigFig(str(self.total), decimals=decimals, constant=decimals == float('-inf'))
+    return total / len(self.readings)
+
+  def average(self):
+    """Returns the mean of the window, using (max - min) / (2 * sqrt(n)) as the uncertainty. Gives the same result as Measurement.average over the readings in the window.
+
+    :return: The mean of the window.
+    :rtype: Measurement
+    """
+    self.checkEmpty()
+    uncertainty = (self.maxima[0][1] - self.minima[0][1]) / (2 * math.sqrt(len(self.readings)))
+    return Measurement(self.meanSample(), uncertainty=uncertainty.value, units=self.units)
+
+  def variance(self):
+    """Returns the sample variance of the window as a float.
+
+    :return: The sample variance of the window.
+    :rtype: float
+    """
+    return self.m2 / (len(self.readings) - 1) if len(self.readings) > 1 else 0.0
+
+  def standardDeviation(self):
+    """Returns the mean of the window, using the sample standard deviation as the uncertainty.
+
+    :return: The mean of the window.
+    :rtype: Measurement
+    """
+    self.checkEmpty()
+    return Measurement(self.meanSample(), uncertainty=str(math.sqrt(self.variance())), units=self.units)
+
+  def standardError(self):
+    """Returns the mean of the window, using the standard error of the mean as the uncertainty.
+
+    :return: The mean of the window.
+    :rtype: Measurement
+    """
+    self.checkEmpty()
+    return Measurement(self.meanSample(), uncertainty=str(math.sqrt(self.variance() / len(self.readings))), units=self.units)
+
+class ExponentialStatistics:
+  """A class to compute exponentially weighted statistics over a stream of Measurement objects. Every pushed reading updates the statistics in constant time.
+
+  :param alpha: The weight of the newest reading, from 0 to 1.
+  :type alpha: float
+  """
+  def __init__(self, alpha):
+    """ExponentialStatistics Constructor
+    """
+    if not 0 < alpha <= 1:
+      raise Exception('Exponential Statistics Error: Alpha must be greater than 0 and at most 1.')
+    self.alpha = alpha
+    self.units = None
+    self.count = 0
+    self.mean = 0.0
+    self.var = 0.0
+    self.weights = 0.0 # Sum of the squared weights of the readings.
+    self.decimals = float('-inf') # Decimal place of the least precise reading.
+
+  def push(self, measurement):
+    """Adds a reading to the stream.
+
+    :param measurement: The reading to add.
+    :type measurement: Measurement
+    :return: This ExponentialStatistics object.
+    :rtype: ExponentialStatistics
+    """
+    x = float(measurement.sample.decimalValue)
+    if self.count == 0:
+      self.units = measurement.units
+      self.mean = x
+      self.weights = 1.0
+    elif measurement.units != self.units:
+      raise Exception(f'Exponential Statistics Error: Cannot add {measurement} to a stream with units {self.units}.')
+    else:
+      delta = x - self.mean
+      increment = self.alpha * delta
+      self.mean += increment
+      self.var = (1 - self.alpha) * (self.var + delta * increment)
+      self.weights = (1 - self.alpha) ** 2 * self.weights + self.alpha ** 2
+    self.decimals = max(self.decimals, measurement.sample.decimals)
+    self.count += 1
+    return self
+
+  def extend(self, measurements):
+    """Adds several readings to the stream in order.
+
+    :param measurements: The readings to add.
+    :type measurements: Iterable<Measurement>
+    :return: This ExponentialStatistics object.
+    :rtype: ExponentialStatistics
+    """
+    for m in measurements:
+      self.push(m)
+    return self
+
+  def __len__(self):
+    """Returns the number of readings pushed.
+
+    :return: The number of readings pushed.
+    :rtype: int
+    """
+    return self.count
+
+  def effectiveCount(self):
+    """Returns the effective number of readings the weighted mean is based on.
+
+    :return: The effective number of readings.
+    :rtype: float
+    """
+    return 1 / self.weights
+
+  def meanSample(self):
+    """Returns the weighted mean as a SigFig, rounded to the decimal place of the least precise reading.
+
+    :return: The weighted mean.
+    :rtype: SigFig
+    """
+    if self.count == 0:
+      raise Exception('Exponential Statistics Error: No readings in the stream.')
+    if self.decimals == float('-inf'):
+      return SigFig(str(self.mean), constant=True)
+    return SigFig(str(self.mean), decimals=self.decimals)
+
+  def average(self):
+    """Returns the weighted mean, using the weighted standard deviation as the uncertainty.
+
+    :return: The weighted mean.
+    :rtype: Measurement
+    """
+    return self.standardDeviation()
+
+  def standardDeviation(self):
+    """Returns the weighted mean, using the weighted standard deviation as the uncertainty.
+
+    :return: The weighted mean.
+    :rtype: Measurement
+    """
+    return Measurement(self.meanSample(), uncertainty=str(math.sqrt(self.var)), units=self.units)
+
+  def standardError(self):
+    """Returns the weighted mean, using the weighted standard deviation divided by the square root of the effective number of readings as the uncertainty.
+
+    :return: The weighted mean.
+    :rtype: Measurement
+    """
+    return Measurement(self.meanSample(), uncertainty=str(math.sqrt(self.var / self.effectiveCount())), units=self.units)
@@ -0,0 +1,193 @@
+from pymeasurement.sigfig import SigFig
+from decimal import Decimal
+import numpy as np
+
+maxDigits = 15 # The most significant figures a rounded float keeps exactly. Larger precisions are rounded with Decimal.
+
+def shift(magnitudes, exponents):
+  """Divides magnitudes by powers of ten, multiplying by the exact reciprocal power for negative exponents.
+
+  :param magnitudes: The magnitudes.
+  :type magnitudes: numpy.ndarray
+  :param exponents: The powers of ten.
+  :type exponents: numpy.ndarray
+  :return: The shifted magnitudes.
+  :rtype: numpy.ndarray
+  """
+  return np.where(exponents < 0, magnitudes * 10.0 ** np.maximum(-exponents, 0), magnitudes / 10.0 ** np.maximum(exponents, 0))
+
+def roundHalfEven(scaled):
+  """Rounds scaled magnitudes to integers, half to even. Magnitudes within a few units in the last place of a tie are flagged, because whether their shortest repr is exactly a tie cannot be told from the float.
+
+  :param scaled: The non-negative magnitudes.
+  :type scaled: numpy.ndarray
+  :return: The rounded magnitudes and whether each is too close to a tie.
+  :rtype: tuple
+  """
+  floor = np.floor(scaled)
+  nearTie = np.abs(scaled - floor - 0.5) <= 4 * np.spacing(scaled)
+  return np.rint(scaled), nearTie
+
+def sigFigsKernel(values, sigfigs):
+  """Rounds an array of floats to significant figures, half to even. Each value is scaled so that its significant figures form an integer mantissa, which is rounded with np.rint. Values too close to a tie, values that cannot be scaled and precisions outside 1 to maxDigits are rounded with SigFig.changeSigFigs instead, through the Decimal of their shortest repr.
+
+  :param values: The numbers.
+  :type values: numpy.ndarray
+  :param sigfigs: The number of significant figures of each number.
+  :type sigfigs: numpy.ndarray
+  :return: The integer mantissas, the exponents of the last significant figures and a dict of position to Decimal for the values rounded with Decimal.
+  :rtype: tuple
+  """
+  magnitudes = np.abs(values)
+  fast = np.isfinite(values) & (sigfigs >= 1) & (sigfigs <= maxDigits)
+  n = np.where(fast, sigfigs, 1).astype(np.int64)
+  with np.errstate(all='ignore'):
+    exponents = np.where(magnitudes > 0, np.floor(np.log10(np.where(magnitudes > 0, magnitudes, 1))), 0).astype(np.int64) - n + 1
+    scaled = shift(magnitudes, exponents)
+    exponents += (scaled >= 10.0 ** n) # log10 is not exact next to powers of ten.
+    exponents -= (scaled < 10.0 ** (n - 1)) & (magnitudes > 0)
+    scaled = shift(magnitudes, exponents)
+    mantissas, nearTie = roundHalfEven(scaled)
+  fast &= np.isfinite(scaled) & (scaled > 0) | (magnitudes == 0)
+  carry = mantissas >= 10.0 ** n
+  mantissas = np.where(carry, mantissas / 10, mantissas)
+  exponents = np.where(magnitudes > 0, exponents + carry, -n)
+  exact = {}
+  for i in np.flatnonzero(~fast | nearTie).tolist():
+    if np.isfinite(values[i]) and 1 <= sigfigs[i] < float('inf'):
+      exact[i] = SigFig.changeSigFigs(repr(float(values[i])), int(sigfigs[i]))
+  return mantissas, exponents, exact
+
+def decimalsKernel(values, decimals):
+  """Rounds an array of floats to a decimal place, half to even. Values too close to a tie and results with more than maxDigits digits are rounded with Decimal.quantize instead, through the Decimal of their shortest repr.
+
+  :param values: The numbers.
+  :type values: numpy.ndarray
+  :param decimals: The exponent of the decimal place of each number, such as -2 for hundredths.
+  :type decimals: numpy.ndarray
+  :return: The integer mantissas and a dict of position to Decimal for the values rounded with Decimal.
+  :rtype: tuple
+  """
+  finite = np.isfinite(values) & np.isfinite(decimals)
+  d = np.where(finite, decimals, 0).astype(np.int64)
+  with np.errstate(all='ignore'):
+    scaled = shift(np.abs(values), d)
+    mantissas, nearTie = roundHalfEven(scaled)
+  fast = finite & (scaled < 10.0 ** maxDigits)
+  exact = {}
+  for i in np.flatnonzero(~fast | nearTie).tolist():
+    if finite[i]:
+      exact[i] = Decimal(repr(float(values[i]))).quantize(Decimal(f"1E{int(decimals[i])}"))
+  return mantissas, exact
+
+def combine(values, mantissas, exponents, exact):
+  """Converts the mantissas and exponents of rounded numbers back into floats. Values that were not rounded are kept.
+
+  :param values: The numbers before rounding.
+  :type values: numpy.ndarray
+  :param mantissas: The integer mantissas.
+  :type mantissas: numpy.ndarray
+  :param exponents: The exponents of the last significant figures.
+  :type exponents: numpy.ndarray
+  :param exact: The Decimal of each position rounded with Decimal.
+  :type exact: dict
+  :return: The rounded numbers.
+  :rtype: numpy.ndarray
+  """
+  with np.errstate(all='ignore'):
+    rounded = np.copysign(shift(mantissas, -exponents), values)
+  rounded[~np.isfinite(rounded)] = values[~np.isfinite(rounded)]
+  for i in np.flatnonzero((np.abs(exponents) > 22) & np.isfinite(mantissas)).tolist(): # Powers of ten beyond 1e22 are not exact floats.
+    rounded[i] = np.copysign(float(f"{int(mantissas[i])}e{int(exponents[i])}"), values[i])
+  for i, decimal in exact.items():
+    rounded[i] = float(decimal)
+  return rounded
+
+def roundSigFigs(values, sigfigs):
+  """Rounds an array of floats to significant figures, half to even, with the same result as ``SigFig(repr(value), sigfigs=sigfigs)``. See :func:`sigFigsKernel`.
+
+  :param values: The numbers.
+  :type values: numpy.ndarray
+  :param sigfigs: The number of significant figures of every number, or of each number.
+  :type sigfigs: int or numpy.ndarray
+  :return: The rounded numbers and the exponent of the last significant figure of each, as in the Decimal of the rounded SigFig.
+  :rtype: tuple
+  """
+  values = np.asarray(values, dtype=float)
+  shape = values.shape
+  values = values.ravel()
+  sigfigs = np.broadcast_to(np.asarray(sigfigs, dtype=float), shape).ravel()
+  mantissas, exponents, exact = sigFigsKernel(values, sigfigs)
+  for i, decimal in exact.items():
+    exponents[i] = decimal.as_tuple().exponent
+  return combine(values, mantissas, exponents, exact).reshape(shape), exponents.reshape(shape)
+
+def roundDecimals(values, decimals):
+  """Rounds an array of floats to a decimal place, half to even, with the same result as ``SigFig(repr(value), decimals=decimals)``. See :func:`decimalsKernel`.
+
+  :param values: The numbers.
+  :type values: numpy.ndarray
+  :param decimals: The exponent of the decimal place of every number, or of each number, such as -2 for hundredths.
+  :type decimals: int or numpy.ndarray
+  :return: The rounded numbers and the number of significant figures of each, as SigFig counts them.
+  :rtype: tuple
+  """
+  values = np.asarray(values, dtype=float)
+  shape = values.shape
+  values = values.ravel()
+  decimals = np.broadcast_to(np.asarray(decimals, dtype=float), shape).ravel()
+  mantissas, exact = decimalsKernel(values, decimals)
+  sigfigs = np.array([len(str(int(m))) for m in mantissas.tolist()], dtype=np.int64) if np.isfinite(mantissas).all() else np.ones(len(mantissas), dtype=np.int64)
+  for i, decimal in exact.items():
+    sigfigs[i] = len(decimal.as_tuple().digits)
+  exponents = np.where(np.isfinite(decimals), decimals, 0).astype(np.int64)
+  return combine(values, mantissas, exponents, exact).reshape(shape), sigfigs.reshape(shape)
+
+def toDecimal(negative, mantissa, exponent):
+  """Builds the Decimal of a rounded number from its integer mantissa, with the trailing zeros of its precision.
+
+  :param negative: Whether the number is negative, including negative zero.
+  :type negative: bool
+  :param mantissa: The integer mantissa.
+  :type mantissa: float
+  :param exponent: The exponent of the last significant figure.
+  :type exponent: int
+  :return: The rounded number.
+  :rtype: Decimal
+  """
+  return Decimal(f"{'-' if negative else ''}{int(mantissa)}E{int(exponent)}")
+
+def toSigFigs(values, sigfigs=None, decimals=None):
+  """Creates SigFig objects from an array of floats, rounded to significant figures or to a decimal place with the kernels above. The results are the same as ``SigFig(repr(value), sigfigs=sigfigs)`` or ``SigFig(repr(value), decimals=decimals)``, but each SigFig object is created from its state instead of rounding its Decimal again. Elements without a finite precision are created with the SigFig constructor.
+
+  :param values: The numbers.
+  :type values: numpy.ndarray
+  :param sigfigs: The number of significant figures of every number, or of each number.
+  :type sigfigs: int or numpy.ndarray or None
+  :param decimals: The exponent of the decimal place of every number, or of each number.
+  :type decimals: int or numpy.ndarray or None
+  :return: The SigFig objects.
+  :rtype: list
+  """
+  values = np.asarray(values, dtype=float).ravel()
+  precisions = np.broadcast_to(np.asarray(sigfigs if sigfigs is not None else decimals, dtype=float).ravel(), values.shape)
+  if sigfigs is not None:
+    mantissas, exponents, exact = sigFigsKernel(values, precisions)
+    kernel = np.isfinite(values) & (precisions >= 1) & (precisions < float('inf'))
+  else:
+    mantissas, exact = decimalsKernel(values, precisions)
+    exponents = np.where(np.isfinite(precisions), precisions, 0).astype(np.int64)
+    kernel = np.isfinite(values) & np.isfinite(precisions)
+  rows = zip(values.tolist(), precisions.tolist(), mantissas.tolist(), exponents.tolist(), np.signbit(values).tolist(), kernel.tolist())
+  results = []
+  for i, (value, precision, mantissa, exponent, negative, fast) in enumerate(rows):
+    if not fast:
+      results.append(SigFig(repr(value), sigfigs=precision) if sigfigs is not None else SigFig(repr(value), decimals=precision))
+      continue
+    decimal = exact[i] if i in exact else toDecimal(negative, mantissa, exponent)
+    _, digits, exponent = decimal.as_tuple()
+    if sigfigs is not None:
+      results.append(SigFig.fromState(repr(value), decimal, int(precision), exponent if exponent < 0 else len(digits) - int(precision)))
+    else:
+      results.append(SigFig.fromState(repr(value), decimal, len(digits), int(precision)))
+  return results
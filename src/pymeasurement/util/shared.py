@@ -0,0 +1,307 @@
+from pymeasurement.measurement import Measurement
+from pymeasurement.util.formula import Formula
+from pymeasurement.util.rounding import maxDigits, shift, toDecimal
+from multiprocessing import shared_memory
+import concurrent.futures
+import os
+import threading
+import numpy as np
+
+# The packed fields of each row, stored as float64. Each SigFig is packed as its value, split into the signed high and the low maxDigits digits of its integer coefficient, and its rounded decimal as a float, each followed by the exponent of its last digit, and then its sigfigs and decimals, which may be infinite for constants. kind is 0 without an uncertainty, 1 for an absolute uncertainty and 2 for a percent uncertainty.
+sigFigFields = ['value', 'valueLow', 'valueExponent', 'decimal', 'decimalExponent', 'sigfigs', 'decimals']
+fields = ['sample.' + f for f in sigFigFields] + ['uncertainty.' + f for f in sigFigFields] + ['kind']
+
+_registerLock = threading.Lock() # Guards the temporary replacement of resource_tracker.register on Python < 3.13.
+
+def attachMemory(name):
+  """Attaches to an existing shared memory block without registering it with this process's resource tracker, so that a worker exiting does not unlink the block it was only reading and writing.
+
+  :param name: The name of the block.
+  :type name: str
+  :return: The block.
+  :rtype: multiprocessing.shared_memory.SharedMemory
+  """
+  try:
+    return shared_memory.SharedMemory(name=name, track=False)
+  except TypeError: # Python < 3.13 always registers the block, so registering is skipped while attaching.
+    from multiprocessing import resource_tracker
+    with _registerLock:
+      register = resource_tracker.register
+      resource_tracker.register = lambda name, rtype: None if rtype == 'shared_memory' else register(name, rtype)
+      try:
+        return shared_memory.SharedMemory(name=name)
+      finally:
+        resource_tracker.register = register
+
+def packSigFigs(sigfigs):
+  """Packs SigFig objects into the columns of sigFigFields. The rounded decimal is stored as a float, so only SigFig objects with at most maxDigits significant digits can be packed exactly. The value is stored exactly in two parts, so it can have up to twice as many digits, which covers the precision of Decimal arithmetic.
+
+  :param sigfigs: The SigFig objects. Missing ones are packed as zeros.
+  :type sigfigs: list
+  :return: The column of each field.
+  :rtype: list
+  """
+  columns = [np.zeros(len(sigfigs)) for _ in sigFigFields]
+  for i, s in enumerate(sigfigs):
+    if s is None:
+      continue
+    if len(s.decimal.as_tuple().digits) > maxDigits:
+      raise Exception(f'Shared Error: Cannot pack {s.decimal} exactly, since it has more than {maxDigits} significant digits.')
+    sign, digits, exponent = s.decimalValue.as_tuple()
+    if len(digits) > 2 * maxDigits:
+      raise Exception(f'Shared Error: Cannot pack {s.decimalValue} exactly, since it has more than {2 * maxDigits} digits.')
+    high, low = divmod(int(''.join(str(d) for d in digits)), 10 ** maxDigits)
+    columns[0][i] = -float(high) if sign else float(high)
+    columns[1][i] = low
+    columns[2][i] = exponent
+    columns[3][i] = float(s.decimal)
+    columns[4][i] = s.decimal.as_tuple().exponent
+    columns[5][i] = s.sigfigs
+    columns[6][i] = s.decimals
+  return columns
+
+def unpackSigFigs(block):
+  """Unpacks the columns of sigFigFields into SigFig states, as returned by SigFig.__getstate__.
+
+  :param block: The columns, as an array of shape (len(sigFigFields), n).
+  :type block: numpy.ndarray
+  :return: The states.
+  :rtype: list
+  """
+  highs, lows, valueExponents, decimals, decimalExponents = block[0], block[1], block[2], block[3], block[4].astype(np.int64)
+  with np.errstate(all='ignore'):
+    decimalMantissas = np.rint(shift(np.abs(decimals), decimalExponents)).tolist()
+  rows = zip(np.signbit(highs).tolist(), np.abs(highs).tolist(), lows.tolist(), valueExponents.tolist(), np.signbit(decimals).tolist(), decimalMantissas, decimalExponents.tolist(), block[5].tolist(), block[6].tolist())
+  states = []
+  for vNegative, high, low, vExponent, dNegative, dMantissa, dExponent, sigfigs, places in rows:
+    states.append((str(toDecimal(vNegative, int(high) * 10 ** maxDigits + int(low), vExponent)), toDecimal(dNegative, dMantissa, dExponent), int(sigfigs) if np.isfinite(sigfigs) else sigfigs, int(places) if np.isfinite(places) else places))
+  return states
+
+class SharedMeasurementArray:
+  """A class to hold a column of Measurement objects packed into a shared memory block, so that worker processes on one node can read and write it without copying or pickling it. Each row holds the sample, the uncertainty and their precision as float64 fields (see fields), so rounded values with more than 15 significant digits cannot be packed. The unrounded values later arithmetic uses are stored exactly. Pickling a SharedMeasurementArray only pickles the name of its block, and unpickling it in another process attaches to the same block. Every Measurement object of the column must have the same units.
+
+  The process that creates the block owns it and must call :meth:`unlink` when every process is done with it, or use the array as a context manager.
+
+  :param length: The number of rows.
+  :type length: int
+  :param units: The units of the column.
+  :type units: str or None
+  :param name: The name of an existing block to attach to. If None, a new block is created.
+  :type name: str or None
+  """
+  def __init__(self, length, units=None, name=None):
+    """SharedMeasurementArray Constructor
+    """
+    self.length = length
+    self.units = units
+    self.owner = name is None
+    size = max(len(fields) * length * 8, 1)
+    self.memory = shared_memory.SharedMemory(create=True, size=size) if self.owner else attachMemory(name)
+    self.name = self.memory.name
+    self.data = np.ndarray((len(fields), length), dtype=np.float64, buffer=self.memory.buf)
+
+  def fromMeasurements(measurements):
+    """Creates a SharedMeasurementArray holding Measurement objects.
+
+    :param measurements: The Measurement objects.
+    :type measurements: Iterable<Measurement>
+    :return: The SharedMeasurementArray.
+    :rtype: SharedMeasurementArray
+    """
+    measurements = list(measurements)
+    units = set(m.units for m in measurements)
+    if len(units) > 1:
+      raise Exception(f'Shared Error: Cannot pack measurements with different units {units}.')
+    array = SharedMeasurementArray(len(measurements), units.pop() if units else None)
+    try:
+      array[0:len(measurements)] = measurements
+    except BaseException:
+      array.unlink()
+      raise
+    return array
+
+  def attach(name, length, units):
+    """Attaches to the block of a SharedMeasurementArray created by another process.
+
+    :param name: The name of the block.
+    :type name: str
+    :param length: The number of rows.
+    :type length: int
+    :param units: The units of the column.
+    :type units: str or None
+    :return: The SharedMeasurementArray.
+    :rtype: SharedMeasurementArray
+    """
+    return SharedMeasurementArray(length, units, name=name)
+
+  def __reduce__(self):
+    """Returns the pickled form of the SharedMeasurementArray, which is only the name, length and units of its block.
+
+    :return: The function to attach to the block and its arguments.
+    :rtype: tuple
+    """
+    return (SharedMeasurementArray.attach, (self.name, self.length, self.units))
+
+  def field(self, name):
+    """Returns a field of every row, as a view of the shared block.
+
+    :param name: The name of the field, from fields.
+    :type name: str
+    :return: The field.
+    :rtype: numpy.ndarray
+    """
+    return self.data[fields.index(name)]
+
+  def __setitem__(self, index, measurements):
+    """Packs Measurement objects into a slice of rows.
+
+    :param index: The slice of rows, or a single row.
+    :type index: slice or int
+    :param measurements: The Measurement objects, or a single Measurement object.
+    :type measurements: list or Measurement
+    """
+    if not isinstance(index, slice):
+      index = slice(index % self.length, index % self.length + 1)
+      measurements = [measurements]
+    measurements = list(measurements)
+    rows = len(range(*index.indices(self.length)))
+    if len(measurements) != rows:
+      raise Exception(f'Shared Error: Cannot set {rows} rows to {len(measurements)} measurements.')
+    for m in measurements:
+      if m.units != self.units:
+        raise Exception(f'Shared Error: Cannot pack measurements in {m.units} into a column in {self.units}.')
+    columns = packSigFigs([m.sample for m in measurements]) + packSigFigs([m.uncertainty for m in measurements])
+    columns.append(np.array([0 if m.uncertainty is None else 2 if m.uncertaintyPercent else 1 for m in measurements], dtype=np.float64))
+    self.data[:, index] = np.array(columns)
+
+  def __getitem__(self, index):
+    """Unpacks a row into a Measurement object, or a slice of rows into a list of Measurement objects.
+
+    :param index: The row or slice of rows.
+    :type index: int or slice
+    :return: The Measurement object or objects.
+    :rtype: Measurement or list
+    """
+    if not isinstance(index, slice):
+      return self[index % self.length:index % self.length + 1][0]
+    block = self.data[:, index]
+    samples = unpackSigFigs(block[:len(sigFigFields)])
+    uncertainties = unpackSigFigs(block[len(sigFigFields):-1])
+    return [Measurement.fromState(s, u if kind else None, kind == 2, self.units) for s, u, kind in zip(samples, uncertainties, block[-1].tolist())]
+
+  def toArrays(self):
+    """Returns the samples and absolute uncertainties as NumPy float arrays, without unpacking Measurement objects. See Measurement.toArrays.
+
+    :return: The samples, the absolute uncertainties and the units.
+    :rtype: tuple
+    """
+    samples = self.field('sample.decimal').copy()
+    kind = self.field('kind')
+    uncertainties = np.where(kind == 0, np.nan, self.field('uncertainty.decimal'))
+    uncertainties = np.where(kind == 2, uncertainties * np.abs(samples) / 100, uncertainties)
+    return samples, uncertainties, self.units
+
+  def tolist(self):
+    """Unpacks every row into Measurement objects.
+
+    :return: The Measurement objects.
+    :rtype: list
+    """
+    return self[0:self.length]
+
+  def __len__(self):
+    """Returns the number of rows.
+
+    :return: The number of rows.
+    :rtype: int
+    """
+    return self.length
+
+  def close(self):
+    """Detaches this process from the block.
+    """
+    self.data = None
+    self.memory.close()
+
+  def unlink(self):
+    """Detaches this process from the block and frees it. Only the owner should call this, once every process is done with the block.
+    """
+    self.close()
+    self.memory.unlink()
+
+  def __enter__(self):
+    """Enters the array context.
+
+    :return: This SharedMeasurementArray object.
+    :rtype: SharedMeasurementArray
+    """
+    return self
+
+  def __exit__(self, *args):
+    """Frees the block if this process owns it, and detaches from it otherwise.
+    """
+    self.unlink() if self.owner else self.close()
+
+def formulaRows(formula, columns, out, start, stop):
+  """Evaluates a formula over a slice of rows of shared columns and writes the results into a shared column. Runs in a worker process.
+
+  :param formula: The formula.
+  :type formula: str
+  :param columns: The shared column of each variable, or a Measurement object used for every row.
+  :type columns: dict
+  :param out: The shared column to write the results to.
+  :type out: SharedMeasurementArray
+  :param start: The first row.
+  :type start: int
+  :param stop: The row after the last.
+  :type stop: int
+  :return: The number of rows evaluated.
+  :rtype: int
+  """
+  inputs = {v: c[start:stop] if isinstance(c, SharedMeasurementArray) else c for v, c in columns.items()}
+  out[start:stop] = Formula(formula)(**inputs)
+  for c in list(columns.values()) + [out]:
+    if isinstance(c, SharedMeasurementArray) and not c.owner:
+      c.close()
+  return stop - start
+
+def parallelFormula(formula, columns, workers=None, chunkSize=None, executor=None):
+  """Evaluates an elementwise formula over shared columns in a pool of worker processes. See :class:`pymeasurement.util.formula.Formula`. Each worker is sent only the formula, the names of the shared blocks and its slice of rows, reads its rows from the shared columns and writes its results into a shared result column.
+
+  :param formula: The formula, such as ``'F = m * a'``.
+  :type formula: str or Formula
+  :param columns: The column of each variable, as a SharedMeasurementArray, or a Measurement object used for every row.
+  :type columns: dict
+  :param workers: The number of worker processes. Defaults to the number of CPUs.
+  :type workers: int or None
+  :param chunkSize: The number of rows per task. Defaults to an even split into four tasks per worker.
+  :type chunkSize: int or None
+  :param executor: A process pool to use instead of creating one.
+  :type executor: concurrent.futures.Executor or None
+  :return: The shared column of results, owned by this process.
+  :rtype: SharedMeasurementArray
+  """
+  if isinstance(formula, Formula):
+    formula = formula.string
+  compiled = Formula(formula)
+  columns = {v: columns[v] for v in compiled.variables}
+  lengths = set(len(c) for c in columns.values() if isinstance(c, SharedMeasurementArray))
+  if len(lengths) != 1:
+    raise Exception('Shared Error: The formula needs at least one shared column, and every shared column must have the same length.')
+  length = lengths.pop()
+  units = compiled.units({v: c.units for v, c in columns.items()})
+  out = SharedMeasurementArray(length, units)
+  workers = workers or os.cpu_count() or 1
+  chunkSize = chunkSize or max(1, -(-length // (4 * workers)))
+  pool = executor or concurrent.futures.ProcessPoolExecutor(max_workers=workers)
+  try:
+    futures = [pool.submit(formulaRows, formula, columns, out, start, min(start + chunkSize, length)) for start in range(0, length, chunkSize)]
+    for future in futures:
+      future.result()
+  except BaseException:
+    out.unlink()
+    raise
+  finally:
+    if executor is None:
+      pool.shutdown()
+  return out
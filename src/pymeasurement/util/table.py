@@ -0,0 +1,236 @@
+from pymeasurement.util.formula import Formula
+
+class MeasurementTable:
+  """A class to hold columns of Measurement objects in which derived columns are declared as formulas over other columns. The formulas form a dependency graph, and each derived column keeps its results along with the rows that are out of date. Editing an input cell marks only that row of the columns that depend on it, and editing an input column marks every row of them. Derived columns are recomputed when read, and only their out-of-date rows are evaluated.
+
+  :param columns: The input columns.
+  :type columns: pandas.core.frame.DataFrame or dict or None
+  """
+  def __init__(self, columns=None):
+    """MeasurementTable Constructor
+    """
+    self.columns = {} # name -> list of Measurement objects, cached results for derived columns.
+    self.formulas = {} # derived column name -> (Formula, variable bindings)
+    self.dependents = {} # column name -> names of the derived columns that use it directly.
+    self.dirty = {} # derived column name -> out-of-date rows, or True if every row is out of date.
+    self.length = None
+    self.rowsComputed = 0 # Number of derived cells evaluated, across all columns.
+    if columns is not None:
+      for name, column in columns.items():
+        self.setColumn(name, column)
+
+  def checkLength(self, column):
+    """Checks that a column has as many rows as the table.
+
+    :param column: The column.
+    :type column: list
+    """
+    if self.length is None:
+      self.length = len(column)
+    elif len(column) != self.length:
+      raise Exception(f'Table Error: Columns must have {self.length} rows, not {len(column)}.')
+
+  def setColumn(self, name, column):
+    """Sets an input column, marking every row of the columns that depend on it as out of date.
+
+    :param name: The name of the column.
+    :type name: str
+    :param column: The Measurement objects.
+    :type column: Iterable<Measurement>
+    :return: This MeasurementTable object.
+    :rtype: MeasurementTable
+    """
+    if name in self.formulas:
+      raise Exception(f'Table Error: "{name}" is a derived column and cannot be set.')
+    column = list(column)
+    self.checkLength(column)
+    self.columns[name] = column
+    self.markDirty(name, True)
+    return self
+
+  def setCell(self, name, row, value):
+    """Sets one cell of an input column, marking only that row of the columns that depend on it as out of date.
+
+    :param name: The name of the column.
+    :type name: str
+    :param row: The row.
+    :type row: int
+    :param value: The Measurement object.
+    :type value: Measurement
+    :return: This MeasurementTable object.
+    :rtype: MeasurementTable
+    """
+    if name in self.formulas:
+      raise Exception(f'Table Error: "{name}" is a derived column and cannot be set.')
+    if name not in self.columns:
+      raise Exception(f'Table Error: No column named "{name}".')
+    row %= self.length
+    if self.length > 1:
+      units = self.columns[name][1 if row == 0 else 0].units
+      if value.units != units:
+        raise Exception(f'Table Error: Cannot set a cell in {value.units} in column "{name}" in {units}. Convert it with Measurement.to first.')
+    self.columns[name][row] = value
+    self.markDirty(name, {row})
+    return self
+
+  def markDirty(self, name, rows):
+    """Marks rows of every column that depends on a column as out of date.
+
+    :param name: The name of the changed column.
+    :type name: str
+    :param rows: The changed rows, or True for every row.
+    :type rows: set or bool
+    """
+    for dependent in self.dependents.get(name, ()):
+      current = self.dirty.get(dependent, set())
+      if current is True:
+        continue
+      self.dirty[dependent] = True if rows is True else current | rows
+      self.markDirty(dependent, rows)
+
+  def dependsOn(self, name, source):
+    """Checks whether a column depends on another, directly or indirectly.
+
+    :param name: The name of the column.
+    :type name: str
+    :param source: The name of the other column.
+    :type source: str
+    :return: Whether the column depends on the other.
+    :rtype: bool
+    """
+    if name == source:
+      return True
+    if name not in self.formulas:
+      return False
+    return any(self.dependsOn(b, source) for b in self.formulas[name][1].values() if isinstance(b, str))
+
+  def derive(self, formula, name=None, **bindings):
+    """Declares a derived column as a formula over other columns. See :class:`pymeasurement.util.formula.Formula`.
+
+    :param formula: The formula, such as ``'Force = m * a'``.
+    :type formula: str or Formula
+    :param name: The name of the column. Defaults to the name of the result in the formula.
+    :type name: str or None
+    :param bindings: The column name of each variable, or a Measurement object used for every row. Variables without a binding read the column of the same name.
+    :type bindings: dict
+    :return: This MeasurementTable object.
+    :rtype: MeasurementTable
+    """
+    if not isinstance(formula, Formula):
+      formula = Formula(formula)
+    name = name if name is not None else formula.name
+    if name is None:
+      raise Exception('Table Error: A derived column needs a name.')
+    if name in self.columns and name not in self.formulas:
+      raise Exception(f'Table Error: "{name}" is an input column.')
+    resolved = {}
+    for v in formula.variables:
+      source = bindings.get(v, v)
+      if isinstance(source, str):
+        if source not in self.columns:
+          raise Exception(f'Table Error: No column named "{source}" for "{v}".')
+        if self.dependsOn(source, name):
+          raise Exception(f'Table Error: "{name}" would depend on itself through "{source}".')
+      resolved[v] = source
+    if name in self.formulas:
+      for source in self.formulas[name][1].values():
+        if isinstance(source, str):
+          self.dependents[source].discard(name)
+    for source in resolved.values():
+      if isinstance(source, str):
+        self.dependents.setdefault(source, set()).add(name)
+    self.formulas[name] = (formula, resolved)
+    self.columns[name] = None
+    self.dirty[name] = True
+    self.markDirty(name, True)
+    return self
+
+  def update(self, name):
+    """Recomputes the out-of-date rows of a derived column, after updating the columns it depends on.
+
+    :param name: The name of the column.
+    :type name: str
+    """
+    if name not in self.formulas or not self.dirty.get(name):
+      return
+    formula, bindings = self.formulas[name]
+    for source in bindings.values():
+      if isinstance(source, str):
+        self.update(source)
+    rows = self.dirty[name]
+    full = rows is True or self.columns[name] is None
+    rows = range(self.length or 0) if full else sorted(rows)
+    inputs = {v: [self.columns[b][r] for r in rows] if isinstance(b, str) else [b] * len(rows) for v, b in bindings.items()}
+    results = formula(**inputs) if rows else []
+    if not bindings and rows:
+      results = [results[0]] * len(rows) # A formula of only constants evaluates to a single row.
+    if full:
+      self.columns[name] = list(results)
+    else:
+      for r, value in zip(rows, results):
+        self.columns[name][r] = value
+    self.rowsComputed += len(rows)
+    self.dirty[name] = set()
+
+  def __getitem__(self, name):
+    """Returns a column, recomputing its out-of-date rows first.
+
+    :param name: The name of the column.
+    :type name: str
+    :return: The Measurement objects.
+    :rtype: list
+    """
+    if name not in self.columns:
+      raise Exception(f'Table Error: No column named "{name}".')
+    self.update(name)
+    return list(self.columns[name])
+
+  def get(self, name, row):
+    """Returns one cell, recomputing the out-of-date rows of its column first.
+
+    :param name: The name of the column.
+    :type name: str
+    :param row: The row.
+    :type row: int
+    :return: The Measurement object.
+    :rtype: Measurement
+    """
+    if name not in self.columns:
+      raise Exception(f'Table Error: No column named "{name}".')
+    self.update(name)
+    return self.columns[name][row]
+
+  def names(self):
+    """Returns the names of the columns, in order of addition.
+
+    :return: The names of the columns.
+    :rtype: list
+    """
+    return list(self.columns)
+
+  def toDataFrame(self):
+    """Returns the table as a DataFrame, recomputing every out-of-date row first.
+
+    :return: The table.
+    :rtype: pandas.core.frame.DataFrame
+    """
+    import pandas as pd
+    return pd.DataFrame({name: self[name] for name in self.columns})
+
+  def __contains__(self, name):
+    """Checks whether the table has a column.
+
+    :param name: The name of the column.
+    :type name: str
+    :return: Whether the table has the column.
+    :rtype: bool
+    """
+    return name in self.columns
+
+  def __len__(self):
+    """Returns the number of rows of the table.
+
+    :return: The number of rows.
+    :rtype: int
+    """
+    return self.length or 0
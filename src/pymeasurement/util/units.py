@@ -0,0 +1,363 @@
+from decimal import Decimal
+import warnings
+
+prefixes = {'Y': Decimal('1E24'), 'Z': Decimal('1E21'), 'E': Decimal('1E18'), 'P': Decimal('1E15'), 'T': Decimal('1E12'), 'G': Decimal('1E9'), 'M': Decimal('1E6'), 'k': Decimal('1E3'), 'h': Decimal('1E2'), 'da': Decimal('1E1'), 'd': Decimal('1E-1'), 'c': Decimal('1E-2'), 'm': Decimal('1E-3'), 'u': Decimal('1E-6'), 'µ': Decimal('1E-6'), 'n': Decimal('1E-9'), 'p': Decimal('1E-12'), 'f': Decimal('1E-15'), 'a': Decimal('1E-18'), 'z': Decimal('1E-21'), 'y': Decimal('1E-24')} # SI prefixes.
+
+class UnitRegistry:
+  """A class to convert between units. Units are defined in terms of base units or of other units, forming a graph that is resolved to base units once when each unit is defined. Conversion factors are then cached per pair of units strings, so repeated conversions cost a single dictionary lookup.
+
+  Units strings follow the same format as Measurement units, such as ``'kg*m/s^2'``. A unit followed by a qualifier, such as ``'g H2O'``, is converted like its first word and only converts to units with the same qualifier.
+  """
+  def __init__(self):
+    """UnitRegistry Constructor
+    """
+    self.units = {} # name -> (factor, dimensions, prefixable)
+    self.signatures = {} # units string -> (factor, dimensions)
+    self.factors = {} # (from units string, to units string) -> factor
+
+  def define(self, name, definition=None, factor='1', prefixable=True):
+    """Defines a unit.
+
+    :param name: The name of the unit.
+    :type name: str
+    :param definition: The units string the unit is defined in terms of. If None, the unit is a new base unit.
+    :type definition: str or None
+    :param factor: The number of the definition units in one of the new unit.
+    :type factor: str
+    :param prefixable: Whether the unit accepts SI prefixes.
+    :type prefixable: bool
+    :return: This UnitRegistry object.
+    :rtype: UnitRegistry
+    """
+    if definition is None:
+      self.units[name] = (Decimal(factor), ((name, 1),), prefixable)
+    else:
+      base, dimensions = self.signature(definition)
+      self.units[name] = (Decimal(factor) * base, dimensions, prefixable)
+    self.signatures.clear()
+    self.factors.clear()
+    return self
+
+  def resolve(self, unit):
+    """Resolves a single unit to its factor and dimensions in base units.
+
+    :param unit: The unit, optionally with an SI prefix and a qualifier.
+    :type unit: str
+    :return: The factor and dimensions of the unit.
+    :rtype: tuple
+    """
+    unit, *qualifier = unit.split()
+    if unit in self.units:
+      factor, dimensions, _ = self.units[unit]
+    else:
+      for prefix in sorted(prefixes, key=len, reverse=True):
+        if unit.startswith(prefix) and unit[len(prefix):] in self.units and self.units[unit[len(prefix):]][2]:
+          factor, dimensions, _ = self.units[unit[len(prefix):]]
+          factor = factor * prefixes[prefix]
+          break
+      else:
+        raise Exception(f'Unit Error: Unknown unit "{unit}".')
+    if qualifier:
+      dimensions = dimensions + ((f"[{' '.join(qualifier)}]", 1),)
+    return (factor, dimensions)
+
+  def signature(self, units):
+    """Returns the factor and dimensions of a units string in base units. Results are cached per units string.
+
+    :param units: The units string.
+    :type units: str or None
+    :return: The factor and dimensions of the units string. Dimensions are a sorted tuple of (base unit, power) pairs.
+    :rtype: tuple
+    """
+    if units in self.signatures:
+      return self.signatures[units]
+    from pymeasurement.measurement import Measurement
+    nUnits, dUnits = Measurement.parseUnits(units)
+    factor = Decimal(1)
+    powers = {}
+    for side, sign in [(nUnits, 1), (dUnits, -1)]:
+      for unit in side:
+        if not unit:
+          continue
+        f, dimensions = self.resolve(unit)
+        factor = factor * f if sign == 1 else factor / f
+        for d, p in dimensions:
+          powers[d] = powers.get(d, 0) + sign * p
+    signature = (factor, tuple(sorted((d, p) for d, p in powers.items() if p != 0)))
+    self.signatures[units] = signature
+    return signature
+
+  def dimensions(self, units):
+    """Returns the dimensions of a units string in base units.
+
+    :param units: The units string.
+    :type units: str or None
+    :return: The dimensions as a sorted tuple of (base unit, power) pairs.
+    :rtype: tuple
+    """
+    return self.signature(units)[1]
+
+  def compatible(self, fromUnits, toUnits):
+    """Checks if two units strings can be converted to each other.
+
+    :param fromUnits: The units string to convert from.
+    :type fromUnits: str or None
+    :param toUnits: The units string to convert to.
+    :type toUnits: str or None
+    :return: Whether the units can be converted.
+    :rtype: bool
+    """
+    try:
+      return self.dimensions(fromUnits) == self.dimensions(toUnits)
+    except Exception:
+      return False
+
+  def conversionFactor(self, fromUnits, toUnits):
+    """Returns the factor to multiply a value in one units string by to get the value in another. Results are cached per pair of units strings.
+
+    :param fromUnits: The units string to convert from.
+    :type fromUnits: str or None
+    :param toUnits: The units string to convert to.
+    :type toUnits: str or None
+    :return: The conversion factor.
+    :rtype: Decimal
+    """
+    key = (fromUnits, toUnits)
+    if key in self.factors:
+      return self.factors[key]
+    fromFactor, fromDimensions = self.signature(fromUnits)
+    toFactor, toDimensions = self.signature(toUnits)
+    if fromDimensions != toDimensions:
+      raise Exception(f'Unit Error: Cannot convert {fromUnits} to {toUnits}.')
+    factor = fromFactor / toFactor
+    self.factors[key] = factor
+    return factor
+
+  def convertValues(self, values, fromUnits, toUnits):
+    """Converts an array of plain numbers from one units string to another with a single multiplication.
+
+    :param values: The values to convert.
+    :type values: numpy.ndarray or float
+    :param fromUnits: The units string to convert from.
+    :type fromUnits: str or None
+    :param toUnits: The units string to convert to.
+    :type toUnits: str or None
+    :return: The converted values.
+    :rtype: numpy.ndarray or float
+    """
+    return values * float(self.conversionFactor(fromUnits, toUnits))
+
+def defaultRegistry():
+  """Creates a registry with the SI base units, common derived units and common non-SI units.
+
+  :return: The registry.
+  :rtype: UnitRegistry
+  """
+  r = UnitRegistry()
+  for base in ['m', 'g', 's', 'A', 'K', 'mol', 'cd']:
+    r.define(base)
+  r.define('Hz', '1/s')
+  r.define('N', 'kg*m/s^2')
+  r.define('Pa', 'N/m^2')
+  r.define('J', 'N*m')
+  r.define('W', 'J/s')
+  r.define('C', 'A*s')
+  r.define('V', 'W/A')
+  r.define('F', 'C/V')
+  r.define('Ohm', 'V/A')
+  r.define('Ω', 'V/A')
+  r.define('S', 'A/V')
+  r.define('Wb', 'V*s')
+  r.define('T', 'Wb/m^2')
+  r.define('H', 'Wb/A')
+  r.define('L', 'dm^3')
+  r.define('M', 'mol/L')
+  r.define('min', 's', '60', prefixable=False)
+  r.define('h', 's', '3600', prefixable=False)
+  r.define('hr', 's', '3600', prefixable=False)
+  r.define('day', 's', '86400', prefixable=False)
+  r.define('t', 'kg', '1000', prefixable=False)
+  r.define('atm', 'Pa', '101325', prefixable=False)
+  r.define('bar', 'Pa', '100000')
+  r.define('mmHg', 'Pa', '133.322387415', prefixable=False)
+  r.define('torr', 'Pa', '133.322368421', prefixable=False)
+  r.define('cal', 'J', '4.184')
+  r.define('eV', 'J', '1.602176634E-19')
+  r.define('in', 'cm', '2.54', prefixable=False)
+  r.define('ft', 'in', '12', prefixable=False)
+  r.define('lb', 'g', '453.59237', prefixable=False)
+  return r
+
+registry = defaultRegistry() # The registry used by Measurement.to and by automatic conversion.
+
+dimensionlessFunctions = ['log', 'exp', 'sin', 'cos', 'tan', 'cot', 'sec', 'csc', 'asin', 'acos', 'atan', 'acot', 'asec', 'acsc', 'atan2', 'sinh', 'cosh', 'tanh', 'coth', 'asinh', 'acosh', 'atanh', 'acoth'] # Functions that only accept and return dimensionless values.
+preservingFunctions = ['Abs', 'floor', 'ceiling', 'Max', 'Min'] # Functions whose result has the units of their arguments.
+angleUnits = ['rad', 'sr'] # Units that are dimensionless for dimensional analysis.
+
+derivedUnits = {} # (expression, input units) -> result units
+
+class UnitWarning(UserWarning):
+  """A warning emitted when the units of a result cannot be derived or do not match the given units, and Measurement.strictUnits is off.
+  """
+
+def unitPowers(units):
+  """Returns the power of each unit in a units string, ignoring angle units.
+
+  :param units: The units string.
+  :type units: str or None
+  :return: The power of each unit.
+  :rtype: dict
+  """
+  from pymeasurement.measurement import Measurement
+  nUnits, dUnits = Measurement.parseUnits(units)
+  powers = {}
+  for side, sign in [(nUnits, 1), (dUnits, -1)]:
+    for unit in side:
+      if unit and unit not in angleUnits:
+        powers[unit] = powers.get(unit, 0) + sign
+  return {u: p for u, p in powers.items() if p != 0}
+
+def formatPowers(powers):
+  """Formats the power of each unit as a units string.
+
+  :param powers: The power of each unit.
+  :type powers: dict
+  :return: The units string, or None if dimensionless.
+  :rtype: str or None
+  """
+  from pymeasurement.measurement import Measurement
+  nUnits = [u for u, p in powers.items() if p > 0 for _ in range(p)]
+  dUnits = [u for u, p in powers.items() if p < 0 for _ in range(-p)]
+  return Measurement.formatUnits(nUnits, dUnits)
+
+def parseExpression(func, variables, evaluate=True):
+  """Parses a function expression with sympy, binding each variable to a plain symbol, so that variable names such as E, I, S, N or Q are not read as sympy's constants and functions.
+
+  :param func: The function expression.
+  :type func: str or sympy.Expr
+  :param variables: The names of the variables.
+  :type variables: Iterable<str>
+  :param evaluate: Whether sympy may simplify the expression while parsing it. Dimensional analysis parses without simplifying, so that x - x keeps the units of x.
+  :type evaluate: bool
+  :return: The expression.
+  :rtype: sympy.Expr
+  """
+  from sympy import Symbol, sympify
+  if not isinstance(func, str):
+    return func
+  return sympify(func, locals={v: Symbol(v) for v in variables}, evaluate=evaluate)
+
+def expressionPowers(expression, symbols):
+  """Walks a sympy expression and returns the power of each unit of its result.
+
+  :param expression: The expression.
+  :type expression: sympy.Expr
+  :param symbols: The power of each unit of each symbol.
+  :type symbols: dict
+  :return: The power of each unit of the result.
+  :rtype: dict
+  """
+  from sympy import Rational
+  if expression.is_Symbol:
+    if expression.name not in symbols:
+      raise Exception(f'Unit Error: No units given for "{expression.name}".')
+    return symbols[expression.name]
+  if expression.is_Number or expression.is_NumberSymbol:
+    return {}
+  args = [expressionPowers(a, symbols) for a in expression.args]
+  if expression.is_Add:
+    for a in args[1:]:
+      if a != args[0]:
+        raise Exception(f'Unit Error: Cannot add {formatPowers(args[0])} and {formatPowers(a)} in "{expression}".')
+    return args[0]
+  if expression.is_Mul:
+    powers = {}
+    for a in args:
+      for u, p in a.items():
+        powers[u] = powers.get(u, 0) + p
+    return {u: p for u, p in powers.items() if p != 0}
+  if expression.is_Pow:
+    base, exponent = args
+    if exponent:
+      raise Exception(f'Unit Error: Exponent must be dimensionless in "{expression}".')
+    if not base:
+      return {}
+    power = expression.exp.doit() # Constant exponents such as 1/3 are not simplified while parsing.
+    if not power.is_Rational:
+      raise Exception(f'Unit Error: Cannot raise {formatPowers(base)} to a variable power in "{expression}".')
+    powers = {u: p * Rational(power) for u, p in base.items()}
+    if any(p.q != 1 for p in powers.values()):
+      raise Exception(f'Unit Error: Cannot raise {formatPowers(base)} to a fractional power in "{expression}".')
+    return {u: int(p) for u, p in powers.items()}
+  name = expression.func.__name__
+  if name in dimensionlessFunctions:
+    if any(args):
+      raise Exception(f'Unit Error: Argument of {name} must be dimensionless in "{expression}".')
+    return {}
+  if name in preservingFunctions:
+    for a in args[1:]:
+      if a != args[0]:
+        raise Exception(f'Unit Error: Arguments of {name} must have the same units in "{expression}".')
+    return args[0]
+  if any(args):
+    raise Exception(f'Unit Error: Cannot derive the units of {name} in "{expression}".')
+  return {}
+
+def deriveUnits(func, units):
+  """Derives the units of the result of a function expression from the units of its inputs, as used by Measurement.apply_func. Arguments of log, exp and trigonometric functions must be dimensionless. Results are cached per expression and input units, so repeated evaluations of the same expression do no unit work, and are also kept in the persistent cache when it is enabled.
+
+  :param func: The function expression.
+  :type func: str or sympy.Expr
+  :param units: The units string of each input.
+  :type units: dict
+  :return: The units of the result, or None if dimensionless.
+  :rtype: str or None
+  """
+  key = (str(func), tuple(sorted(units.items(), key=lambda x: x[0])))
+  if key in derivedUnits:
+    if isinstance(derivedUnits[key], Exception):
+      raise derivedUnits[key]
+    return derivedUnits[key]
+  if len(derivedUnits) >= 4096:
+    derivedUnits.clear()
+  from pymeasurement.util import cache
+  stored = cache.active.get('units', repr(key)) if cache.active is not None else None
+  if stored is not None:
+    result = stored[0]
+  else:
+    try:
+      result = formatPowers(expressionPowers(parseExpression(func, units, evaluate=False), {name: unitPowers(u) for name, u in units.items()}))
+    except Exception as e:
+      derivedUnits[key] = e
+      raise
+    if cache.active is not None:
+      cache.active.put('units', repr(key), (result,))
+  derivedUnits[key] = result
+  return result
+
+def resultUnits(func, units, given=None):
+  """Returns the units of the result of a function expression, as used by Measurement.apply_func and the NumPy ufuncs. The units are derived with :func:`deriveUnits`, and given units are checked against them: they must be convertible from the derived units, and Measurement.apply_func converts its result to them. An expression with a dimension error, such as the log of a length, or given units that do not match, raise when Measurement.strictUnits is on. Otherwise they emit a UnitWarning, and the result has the given units if the units cannot be derived, or the derived units if the given units do not match.
+
+  :param func: The function expression.
+  :type func: str or sympy.Expr
+  :param units: The units string of each input.
+  :type units: dict
+  :param given: The units given by the caller.
+  :type given: str or None
+  :return: The units of the result, or None if dimensionless or not derivable.
+  :rtype: str or None
+  """
+  from pymeasurement.measurement import Measurement
+  try:
+    derived = deriveUnits(func, units)
+  except Exception as e:
+    if Measurement.strictUnits:
+      raise
+    warnings.warn(f'Unit Warning: {str(e).replace("Unit Error: ", "")} The result has {"no units" if given is None else f"the given units {given}"}.', UnitWarning, stacklevel=3)
+    return given
+  if given is not None and unitPowers(given) != unitPowers(derived) and not registry.compatible(derived, given):
+    message = f'The given units {given} do not match the units {derived} of "{func}".'
+    if Measurement.strictUnits:
+      raise Exception(f'Unit Error: {message}')
+    warnings.warn(f'Unit Warning: {message} The result has the units {derived}.', UnitWarning, stacklevel=3)
+  return derived
@@ -0,0 +1,65 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import numpy as np
+from pymeasurement import Measurement
+from pymeasurement.util.array import MeasurementArray
+
+def array():
+    return MeasurementArray([Measurement.fromStr(s) for s in ["1.00 +/- 0.01 m", "2.00 +/- 0.02 m", "3.00 +/- 0.01 m"]])
+
+class TestArray(unittest.TestCase):
+    def test_matches_apply_func(self):
+        x = Measurement.fromStr("0.500 +/- 0.010")
+        y = Measurement.fromStr("2.0 +/- 0.1")
+        for ufunc, expression in [(np.sin, 'sin(x)'), (np.exp, 'exp(x)'), (np.log10, 'log(x, 10)'), (np.arctan, 'atan(x)')]:
+            self.assertEqual(str(ufunc(x)), str(Measurement.apply_func(expression, x=x)))
+        self.assertEqual(str(np.arctan2(x, y)), str(Measurement.apply_func('atan2(x, y)', x=x, y=y)))
+        self.assertEqual(str(np.sqrt(Measurement.fromStr("4.00 +/- 0.10 m^2"))), "2.00 +/- 0.02 m")
+
+    def test_vectorized_ufuncs(self):
+        a = array()
+        result = np.sqrt(a * a)
+        self.assertIsInstance(result, MeasurementArray)
+        self.assertEqual([str(m) for m in result], [str(Measurement.apply_func('sqrt(x)', x=m * m)) for m in a])
+        self.assertEqual(str(a + a), "[2.00 +/- 0.02 m, 4.00 +/- 0.04 m, 6.00 +/- 0.02 m]")
+        self.assertEqual(list(a > Measurement.fromStr("1.5 m")), [False, True, True])
+        self.assertEqual([str(m) for m in np.array([1.0, 2.0]) * Measurement.fromStr("0.500 +/- 0.010")], ["0.500 +/- 2%", "1.00 +/- 2%"])
+        from pymeasurement.util.units import UnitWarning
+        with self.assertWarns(UnitWarning):
+            self.assertTrue(all(m.units is None for m in np.sin(a)))
+        Measurement.setStrictUnits(True)
+        try:
+            with self.assertRaises(Exception):
+                np.sin(a)
+        finally:
+            Measurement.setStrictUnits(False)
+
+    def test_power_and_absolute(self):
+        a = MeasurementArray([Measurement.fromStr(s) for s in ["1.00 +/- 0.01 m", "-2.00 +/- 0.02 m", "3.00 +/- 0.01 m"]])
+        expected = [str(m ** 2) for m in a]
+        self.assertEqual([str(m) for m in a ** 2], expected)
+        self.assertEqual([str(m) for m in np.power(a, 2)], expected)
+        self.assertEqual(str(np.power(Measurement.fromStr("2.0 +/- 0.1 m"), 2)), str(Measurement.fromStr("2.0 +/- 0.1 m") ** 2))
+        self.assertEqual(str(abs(a)), "[1.00 +/- 0.01 m, 2.00 +/- 0.02 m, 3.00 +/- 0.01 m]")
+        self.assertEqual(str(np.absolute(a)), str(abs(a)))
+
+    def test_array_functions(self):
+        a = array()
+        self.assertEqual(str(np.sum(a)), str(Measurement.sum(list(a))))
+        self.assertEqual(str(np.add.reduce(a)), "6.00 +/- 0.04 m")
+        self.assertEqual(str(np.mean(a)), str(Measurement.sum(list(a)) / 3))
+        self.assertEqual(str(np.max(a)), "3.00 +/- 0.01 m")
+        self.assertEqual(str(np.median(a)), "2.00 +/- 0.02 m")
+        self.assertEqual(np.argmin(a), 0)
+        self.assertEqual(str(np.sort(a[::-1])), str(a))
+        self.assertEqual(str(np.sum(a, axis=0)), str(np.sum(a)))
+        self.assertEqual(str(np.mean(a, axis=0)), str(np.mean(a)))
+        with self.assertRaises(TypeError):
+            np.std(a)
+        with self.assertRaises(TypeError):
+            np.sum(MeasurementArray(np.array([list(a), list(a)], dtype=object)), axis=0)
+
+if __name__ == '__main__':
+    unittest.main()
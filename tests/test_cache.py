@@ -0,0 +1,89 @@
+import unittest
+import sys
+import os
+import tempfile
+import random
+import multiprocessing
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement, profile
+from pymeasurement.util import cache, units
+from pymeasurement.util.cache import PersistentCache
+from pymeasurement.util.chem.compound import Compound
+
+def work(args):
+    directory, worker = args
+    store = PersistentCache(directory, maxBytes=2 ** 20)
+    for i in range(50):
+        store.put('test', f'{worker}-{i}', list(range(i)))
+    return all(store.get('test', f'{worker}-{i}') == list(range(i)) for i in range(50))
+
+def clearMemory():
+    Measurement.expressionsCache.clear()
+    units.derivedUnits.clear()
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        cache.disable()
+        clearMemory()
+        self.directory.cleanup()
+
+    def test_warm_start_skips_symbolic_work(self):
+        x = Measurement.fromStr("1.20 +/- 0.01 m")
+        y = Measurement.fromStr("3.4 +/- 0.1 m")
+        cache.enable(self.directory.name)
+        clearMemory()
+        cold = Measurement.apply_func('sin(x / y) * y', x=x, y=y)
+        cache.enable(self.directory.name)
+        clearMemory()
+        with profile() as p:
+            warm = Measurement.apply_func('sin(x / y) * y', x=x, y=y)
+        self.assertEqual(str(warm), str(cold))
+        self.assertNotIn('apply_func.sympify', p.counts)
+        self.assertEqual(cache.active.hits, 2)
+
+    def test_symbolic_without_cache(self):
+        a = Measurement.fromStr("7.31 +/- 0.02")
+        b = Measurement.fromStr("0.219 +/- 0.001")
+        result = Measurement.apply_func('exp(a / b)', a=a, b=b)
+        value, uncertainty, _ = Measurement.evaluateSymbolic('exp(a / b)', {'a': a, 'b': b})
+        self.assertEqual(result.sample, Measurement(value, precision=3).sample)
+        self.assertEqual(Measurement.expressionsCache, {})
+
+    def test_cache_matches_symbolic(self):
+        rng = random.Random(48)
+        inputs = [(Measurement.fromStr(f"{rng.uniform(0.5, 20):.3g} +/- {rng.uniform(0.001, 0.1):.1g}"), Measurement.fromStr(f"{rng.uniform(0.5, 2):.3g} +/- {rng.uniform(0.001, 0.01):.1g}")) for _ in range(300)]
+        func = 'exp(a/b)*sin(a)+log(b)'
+        uncached = [str(Measurement.apply_func(func, a=a, b=b)) for a, b in inputs]
+        cache.enable(self.directory.name)
+        cached = [str(Measurement.apply_func(func, a=a, b=b)) for a, b in inputs]
+        self.assertEqual(cached, uncached)
+
+    def test_compounds(self):
+        cache.enable(self.directory.name)
+        cold = Compound('2C6H12O6 (s)')
+        warm = Compound('2C6H12O6 (s)')
+        self.assertEqual(cache.active.hits, 1)
+        self.assertEqual(warm, cold)
+        self.assertEqual(str(warm.mass), str(cold.mass))
+        self.assertEqual(str(warm), str(cold))
+
+    def test_version_and_eviction(self):
+        store = PersistentCache(self.directory.name, maxBytes=2000, version='1')
+        store.put('test', 'a', 'x' * 100)
+        self.assertIsNone(PersistentCache(self.directory.name, version='2').get('test', 'a'))
+        for i in range(50):
+            store.put('test', str(i), 'x' * 100)
+        self.assertLessEqual(store.size(), 2000)
+        self.assertIsNone(store.get('test', 'a'))
+        self.assertEqual(store.get('test', '49'), 'x' * 100)
+
+    def test_concurrent_processes(self):
+        with multiprocessing.get_context('spawn').Pool(4) as pool:
+            self.assertTrue(all(pool.map(work, [(self.directory.name, w) for w in range(4)])))
+        self.assertEqual(len(PersistentCache(self.directory.name)), 200)
+
+if __name__ == '__main__':
+    unittest.main()
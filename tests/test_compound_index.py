@@ -0,0 +1,33 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement.util.chem.compound import Compound
+from pymeasurement.util.chem.index import CompoundIndex, deduplicate, groupByComposition
+
+class TestCompoundIndex(unittest.TestCase):
+    def test_hill_key(self):
+        self.assertEqual(Compound('CH3CH2OH').key, 'C2H6O')
+        self.assertEqual(Compound('Ca(OH)2(aq)').key, 'CaH2O2')
+        self.assertEqual(Compound('NaCl').key, 'ClNa')
+        self.assertEqual(Compound('CCl4').key, 'CCl4')
+        self.assertEqual(Compound('HOCH2CH3'), Compound('C2H5OH'))
+        self.assertNotEqual(Compound('H2O'), Compound('H2O2'))
+        self.assertEqual(len({Compound('CH3CH2OH'), Compound('C2H5OH'), Compound('H2O')}), 2)
+
+    def test_index(self):
+        index = CompoundIndex()
+        index.extend(['CH3CH2OH', 'H2O', 'C2H5OH', 'CH3OCH3', 'NaCl'], values=[1, 2, 3, 4, 5])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(index.get('HOCH2CH3'), [1, 3, 4])
+        self.assertIn('ClNa', index)
+        self.assertNotIn('CO2', index)
+        self.assertEqual(index.duplicates(), {'C2H6O': [1, 3, 4]})
+        self.assertEqual([str(c) for c in index.unique()], ['CH3CH2OH', 'H2O', 'NaCl'])
+
+    def test_helpers(self):
+        self.assertEqual([str(c) for c in deduplicate(['H2O', 'OH2', 'CO2', 'H2O'])], ['H2O', 'CO2'])
+        self.assertEqual(groupByComposition(['H2O', 'OH2', 'CO2']), {'H2O': ['H2O', 'OH2'], 'CO2': ['CO2']})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+import unittest
+import sys
+import os
+import math
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+
+class TestCorrelation(unittest.TestCase):
+    def setUp(self):
+        Measurement.setCorrelated(True)
+
+    def tearDown(self):
+        Measurement.setCorrelated(False)
+
+    def test_self_correlation(self):
+        x = Measurement.fromStr("10.0 +/- 0.2 m")
+        y = Measurement.fromStr("5.0 +/- 0.1 m")
+        self.assertEqual(str(x - x), "0.0 +/- 0.0 m")
+        self.assertEqual(str(x + x), "20.0 +/- 0.4 m")
+        self.assertEqual(str((x + y) - y), "10.0 +/- 0.2 m")
+        self.assertEqual(str(x / x), "1.00 +/- 0.00")
+        self.assertEqual(str(x - x.to("cm")), "0.0 +/- 0.0 m")
+        self.assertEqual(str(Measurement.apply_func("x - y", x=x, y=x)), "0.00 +/- 0.00 m")
+        self.assertEqual(str(Measurement.sum([x, -x])), "0.0 +/- 0.0 m")
+
+    def test_independent_inputs(self):
+        x = Measurement.fromStr("10.0 +/- 0.2 m")
+        y = Measurement.fromStr("5.0 +/- 0.1 m")
+        self.assertAlmostEqual(float((x + y).uncertainty.decimal), math.hypot(0.2, 0.1), places=1)
+        r = x / (x + y)
+        expected = math.hypot(5.0 / 15.0 ** 2 * 0.2, 10.0 / 15.0 ** 2 * 0.1)
+        self.assertAlmostEqual(math.sqrt(sum(c * c for c in r.sensitivities.values())), expected)
+        self.assertEqual(len(r.sensitivities), 2)
+
+    def test_pickle_keeps_sensitivities(self):
+        x = Measurement.fromStr("10.0 +/- 0.2 m")
+        d = x + x
+        self.assertEqual(str(pickle.loads(pickle.dumps(d)) - d), "0.0 +/- 0.0 m")
+
+    def test_copy_correlated_with_source(self):
+        fresh = Measurement.fromStr("3.0 +/- 0.3 m")
+        self.assertEqual(str(fresh.deepCopy() - fresh), "0.0 +/- 0.0 m")
+        used = Measurement.fromStr("3.0 +/- 0.3 m")
+        used + used
+        self.assertEqual(str(used.deepCopy() - used), "0.0 +/- 0.0 m")
+        copy = used.deepCopy()
+        copy.sensitivities[0] = 1.0
+        self.assertNotIn(0, used.sensitivities)
+
+    def test_formula(self):
+        x = Measurement.fromStr("10.0 +/- 0.2 m")
+        self.assertEqual([str(m) for m in Measurement.formula("x - x")(x=[x])], ["0.0 +/- 0.0 m"])
+        self.assertEqual([str(m) for m in Measurement.formula("d = 2 * x - x")(x=[x])], ["10.0 +/- 0.2 m"])
+
+    def test_array_ufuncs(self):
+        import numpy as np
+        from pymeasurement.util.array import MeasurementArray
+        a = MeasurementArray([Measurement.fromStr("1.00 +/- 0.01 m"), Measurement.fromStr("2.00 +/- 0.03 m")])
+        self.assertEqual([str(m) for m in np.sqrt(a * a) - a], ["0.00 +/- 0.00 m", "0.00 +/- 0.00 m"])
+
+    def test_table_derived_column(self):
+        from pymeasurement.util.table import MeasurementTable
+        x = Measurement.fromStr("10.0 +/- 0.2 m")
+        table = MeasurementTable({'x': [x, Measurement.fromStr("3.0 +/- 0.3 m")]})
+        table.derive("d = x - x")
+        self.assertEqual([str(m) for m in table['d']], ["0.0 +/- 0.0 m", "0.0 +/- 0.0 m"])
+        table.setCell('x', 1, Measurement.fromStr("4.0 +/- 0.3 m"))
+        self.assertEqual(str(table.get('d', 1)), "0.0 +/- 0.0 m")
+
+    def test_disabled(self):
+        Measurement.setCorrelated(False)
+        x = Measurement.fromStr("10.0 +/- 0.2 m")
+        self.assertEqual(str(x - x), "0.0 +/- 0.4 m")
+        self.assertIsNone((x - x).sensitivities)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import numpy as np
+from pymeasurement import Measurement
+from pymeasurement.util.estimators import groupBy, fromChunks, weightedMean, standardErrorMean, birgeMean, groupByUnits
+
+readings = ["10.0 +/- 0.1 g", "10.4 +/- 0.2 g", "9.8 +/- 0.1 g", "10.1 +/- 0.4 g"]
+
+class TestEstimators(unittest.TestCase):
+    def test_weighted_mean(self):
+        ms = [Measurement.fromStr(s) for s in readings]
+        x = np.array([10.0, 10.4, 9.8, 10.1])
+        w = 1 / np.array([0.1, 0.2, 0.1, 0.4]) ** 2
+        m = weightedMean(ms)
+        self.assertAlmostEqual(float(m.sample.decimal), np.sum(w * x) / np.sum(w), places=2)
+        self.assertAlmostEqual(float(m.uncertainty.decimal), 1 / np.sqrt(np.sum(w)), places=3)
+        self.assertEqual(m.units, "g")
+
+    def test_standard_error_mean(self):
+        m = standardErrorMean([Measurement.fromStr(s) for s in ["2.0 g", "4.0 g", "6.0 g"]])
+        self.assertEqual(str(m), "4.0 +/- 1.2 g")
+
+    def test_birge(self):
+        ms = [Measurement.fromStr(s) for s in readings]
+        scaled = birgeMean(ms)
+        self.assertGreater(scaled.uncertainty.decimal, weightedMean(ms).uncertainty.decimal)
+
+    def test_group_by_and_chunks(self):
+        keys = ["a", "b", "a", "b", "a", "b"]
+        ms = [Measurement.fromStr(s) for s in readings + ["10.2 +/- 0.1 g", "10.3 +/- 0.3 g"]]
+        grouped = groupBy(keys, ms)
+        self.assertEqual(str(grouped["a"]), str(weightedMean([ms[0], ms[2], ms[4]])))
+        self.assertEqual(str(grouped["b"]), str(weightedMean([ms[1], ms[3], ms[5]])))
+        for estimator in ["inverseVariance", "standardError", "birge"]:
+            whole = groupBy(keys, ms, estimator=estimator)
+            chunked = fromChunks([(keys[:2], ms[:2]), (keys[2:5], ms[2:5]), (keys[5:], ms[5:])], estimator=estimator)
+            self.assertEqual({k: str(v) for k, v in whole.items()}, {k: str(v) for k, v in chunked.items()})
+            self.assertEqual({k: str(v) for k, v in whole.items()}, {k: str(v) for k, v in groupBy(keys, ms, estimator=estimator, chunkSize=4).items()})
+
+    def test_missing_uncertainty(self):
+        with self.assertRaises(Exception):
+            weightedMean([Measurement.fromStr("1.0 g"), Measurement.fromStr("2.0 +/- 0.1 g")])
+
+    def test_group_by_units(self):
+        ms = [Measurement.fromStr(s) for s in ["1.00 +/- 0.01 g", "2.0 +/- 0.1 s", "500 +/- 10 mg", "3.00 +/- 0.01 g", "4.0 s"]]
+        grouped = groupByUnits(ms)
+        self.assertEqual(list(grouped), ["g", "s", "mg"])
+        self.assertEqual(grouped["g"]["count"], 2)
+        self.assertEqual(str(grouped["g"]["sum"]), str(Measurement.sum([ms[0], ms[3]])))
+        self.assertEqual(str(grouped["g"]["mean"]), str(Measurement.sum([ms[0], ms[3]]) / 2))
+        self.assertEqual(str(grouped["s"]["min"]), "2.0 +/- 0.1 s")
+        self.assertEqual(str(grouped["s"]["max"]), "4.0 s")
+        normalized = groupByUnits(ms, normalize=True, aggregate=["count", "min"])
+        self.assertEqual(normalized["g"], {"count": 3, "min": ms[2].to("g")})
+        self.assertEqual(list(groupByUnits(ms, normalize=["kg"], aggregate=["max"])), ["kg", "s"])
+        with self.assertRaises(Exception):
+            groupByUnits(ms, aggregate=["median"])
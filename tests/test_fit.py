@@ -0,0 +1,40 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.util.fit import linearFit, polynomialFit, yorkFit
+
+class TestFit(unittest.TestCase):
+    def setUp(self):
+        self.t = [Measurement.fromStr(f"{i}.00 +/- 0.01 s") for i in range(1, 6)]
+        self.x = [Measurement.fromStr(s) for s in ["3.1 +/- 0.1 m", "4.9 +/- 0.1 m", "7.0 +/- 0.2 m", "9.1 +/- 0.1 m", "10.9 +/- 0.1 m"]]
+
+    def test_linear_fit(self):
+        fit = linearFit(self.t, self.x)
+        self.assertEqual(fit.slope.units, "m/s")
+        self.assertEqual(fit.intercept.units, "m")
+        self.assertAlmostEqual(float(fit.slope.sample.decimal), 1.98, places=2)
+        self.assertAlmostEqual(float(fit.intercept.sample.decimal), 1.06, places=2)
+        self.assertEqual(fit.dof, 3)
+        self.assertEqual(fit.evaluate(Measurement.fromStr("3.00 s")).units, "m")
+
+    def test_polynomial_fit(self):
+        y = [Measurement.fromStr(f"{2 * i ** 2 + 1}.0 +/- 0.1 m") for i in range(1, 6)]
+        fit = polynomialFit(self.t, y, 2)
+        self.assertAlmostEqual(float(fit.coefficients[2].sample.decimal), 2.0, places=3)
+        self.assertEqual(fit.coefficients[2].units, "m/s^2")
+        self.assertAlmostEqual(fit.chiSquared, 0.0, places=6)
+
+    def test_unweighted_fit(self):
+        fit = linearFit([Measurement.fromStr(f"{i} s") for i in range(1, 5)], [Measurement.fromStr(s) for s in ["2.1 m", "3.9 m", "6.2 m", "7.8 m"]])
+        self.assertAlmostEqual(float(fit.slope.sample.decimal), 1.94, places=2)
+        self.assertIsNotNone(fit.slope.uncertainty)
+
+    def test_york_fit(self):
+        fit = yorkFit(self.t, self.x)
+        ordinary = linearFit(self.t, self.x)
+        self.assertAlmostEqual(float(fit.slope.sample.decimal), float(ordinary.slope.sample.decimal), places=1)
+        self.assertEqual(fit.slope.units, "m/s")
+        with self.assertRaises(Exception):
+            yorkFit([Measurement.fromStr(f"{i} s") for i in range(1, 5)], self.x[:4])
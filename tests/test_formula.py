@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+
+masses = ["2.0 +/- 0.13 kg", "3.00 +/- 0.01 kg", "4.1 +/- 2% kg"]
+accelerations = ["9.8 +/- 0.1 m/s^2", "1.25 +/- 0.5% m/s^2", "3.0d m/s^2"]
+times = ["2.0 +/- 0.1 s", "1.5d s", "3.25 +/- 0.01 s"]
+
+class TestFormula(unittest.TestCase):
+    def test_matches_operators(self):
+        m = [Measurement.fromStr(s) for s in masses]
+        a = [Measurement.fromStr(s) for s in accelerations]
+        t = [Measurement.fromStr(s) for s in times]
+        f = Measurement.formula("F = m * a / t**2 - 2 * m * a / t / t + -(m + m) * a / t**2")
+        expected = [mi * ai / ti ** 2 - 2 * mi * ai / ti / ti + -(mi + mi) * ai / ti ** 2 for mi, ai, ti in zip(m, a, t)]
+        result = f(m=m, a=a, t=t)
+        self.assertEqual([str(r) for r in result], [str(e) for e in expected])
+        self.assertEqual(result[0].units, "(kg*m)/s^4")
+
+    def test_percent_rule_boundary(self):
+        x = [Measurement.fromStr(f"10.0 +/- {u}% m") for u in ["0.97", "0.99", "1.0", "0.49", "1.9", "0.01"]]
+        y = [Measurement.fromStr(f"5.00 +/- {u}% s") for u in ["0.99", "1.0", "0.97", "1.5", "0.09", "1.99"]]
+        for string, operators in [("x * y", lambda x, y: x * y), ("x / y", lambda x, y: x / y), ("x * y * y", lambda x, y: x * y * y), ("-(x * y)", lambda x, y: -(x * y)), ("x**2 / y", lambda x, y: x ** 2 / y), ("x * y + x * y", lambda x, y: x * y + x * y), ("x", lambda x, y: x)]:
+            result = Measurement.formula(string)(x=x, y=y)
+            self.assertEqual([str(r) for r in result], [str(operators(xi, yi)) for xi, yi in zip(x, y)], string)
+        self.assertEqual(str(Measurement.formula("x * y")(x=x[:1], y=y[:1])[0]), "50.0 +/- 2.0% (m*s)")
+
+    def test_dataframe_columns(self):
+        import pandas as pd
+        df = pd.DataFrame({'Mass': [Measurement.fromStr(s) for s in masses], 'a': [Measurement.fromStr(s) for s in accelerations]})
+        result = Measurement.formula("Force = m * a")(df, m='Mass')
+        self.assertEqual(result.name, 'Force')
+        self.assertEqual([str(r) for r in result], [str(x * y) for x, y in zip(df['Mass'], df['a'])])
+
+    def test_broadcast_measurement(self):
+        g = Measurement.fromStr("9.81c m/s^2")
+        result = Measurement.formula("m * g")(m=[Measurement.fromStr(s) for s in masses], g=g)
+        self.assertEqual(str(result[1]), str(Measurement.fromStr(masses[1]) * g))
+
+    def test_sympy_names_as_variables(self):
+        E = [Measurement.fromStr("2.0 +/- 0.1 V")]
+        I = [Measurement.fromStr("3.0 +/- 0.1 A")]
+        self.assertEqual(Measurement.formula("Q = E * I")(E=E, I=I)[0].units, (E[0] * I[0]).units)
+        self.assertEqual(Measurement.formula("P = I * V")(I=I, V=E)[0].units, (I[0] * E[0]).units)
+        self.assertEqual(Measurement.formula("S * t")(S=[Measurement.fromStr("2.0 m/s")], t=[Measurement.fromStr("3.0 s")])[0].units, "m")
+        self.assertEqual(Measurement.formula("N * a")(N=[Measurement.fromStr(masses[0])], a=[Measurement.fromStr(accelerations[0])])[0].units, "(kg*m)/s^2")
+        self.assertEqual(Measurement.formula("d = x - x")(x=E)[0].units, "V")
+        self.assertEqual(Measurement.apply_func("E * I", E=E[0], I=I[0]).units, (E[0] * I[0]).units)
+        self.assertEqual(str(Measurement.apply_func("S * 2", S=Measurement.fromStr("2.0 +/- 0.1 m"))), "4.0 +/- 0.2 m")
+
+    def test_unit_errors(self):
+        with self.assertRaises(Exception):
+            Measurement.formula("m + a")(m=[Measurement.fromStr(masses[0])], a=[Measurement.fromStr(accelerations[0])])
+        with self.assertRaises(Exception):
+            Measurement.formula("m ** 0.5")
+        with self.assertRaises(Exception):
+            Measurement.formula("m(a)")
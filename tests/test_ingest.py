@@ -0,0 +1,65 @@
+import unittest
+import asyncio
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.util.ingest import Ingestor, SimulatedInstrument, lines, parseReading
+
+class TestIngest(unittest.TestCase):
+    def test_parse_reading(self):
+        self.assertEqual(str(parseReading("20.23", units="g", digital=True)), str(Measurement.fromStr("20.23d g")))
+        self.assertEqual(str(parseReading("20.2", units="g", analog=True)), "20.2 +/- 0.5 g")
+        self.assertEqual(str(parseReading("2.0 +/- 0.13", units="m")), "2.0 +/- 0.1 m")
+
+    def test_collect_many_instruments(self):
+        ingestor = Ingestor(queueSize=4, batchSize=3)
+        for n in range(20):
+            ingestor.add(SimulatedInstrument([f"{n}.{i}" for i in range(5)]), name=n, units="g", digital=True)
+        results = asyncio.run(ingestor.collect())
+        self.assertEqual(len(results), 20)
+        self.assertEqual([str(m) for m in results[3]], [f"3.{i} +/- 0.1 g" for i in range(5)])
+
+    def test_batch_size(self):
+        async def run():
+            ingestor = Ingestor(batchSize=2).add(SimulatedInstrument(["1.0", "2.0", "3.0"]), units="m", digital=True)
+            return [batch async for batch in ingestor.batches()]
+        batches = asyncio.run(run())
+        self.assertTrue(all(1 <= len(b) <= 2 for b in batches))
+        self.assertEqual(sum(len(b) for b in batches), 3)
+
+    def test_invalid_readings(self):
+        ingestor = Ingestor(strict=False).add(SimulatedInstrument(["1.0", "oops", "2.0"]), name="a", units="m", digital=True)
+        results = asyncio.run(ingestor.collect())
+        self.assertEqual(len(results["a"]), 2)
+        self.assertEqual(len(ingestor.errors), 1)
+        with self.assertRaises(Exception):
+            asyncio.run(Ingestor().add(SimulatedInstrument(["oops"]), digital=True).collect())
+
+    def test_source_failing_after_last_reading(self):
+        async def failing():
+            yield "1.0"
+            raise ConnectionError("instrument disconnected")
+        with self.assertRaises(ConnectionError):
+            asyncio.run(Ingestor(queueSize=1, batchSize=1).add(failing(), units="m", digital=True).collect())
+
+    def test_cancel_reader_with_full_queue(self):
+        async def run():
+            queue = asyncio.Queue(maxsize=1)
+            ingestor = Ingestor()
+            task = asyncio.ensure_future(ingestor.read(queue, SimulatedInstrument(["1.0", "2.0"]), "a", "m", True, False))
+            while not queue.full():
+                await asyncio.sleep(0)
+            await asyncio.sleep(0)
+            task.cancel()
+            await asyncio.wait([task], timeout=1)
+            return task.cancelled()
+        self.assertTrue(asyncio.run(run()))
+
+    def test_stream_reader(self):
+        async def run():
+            reader = asyncio.StreamReader()
+            reader.feed_data(b"1.00\n\n2.50\n")
+            reader.feed_eof()
+            return await Ingestor().add(lines(reader), name="pipe", units="V", digital=True).collect()
+        self.assertEqual([str(m) for m in asyncio.run(run())["pipe"]], ["1.00 +/- 0.01 V", "2.50 +/- 0.01 V"])
@@ -0,0 +1,41 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import numpy as np
+import pandas as pd
+from pymeasurement import Measurement
+from pymeasurement.util.intervals import IntervalIndex, consistentWith
+
+def readings(n=500, seed=0):
+    rng = np.random.default_rng(seed)
+    return [Measurement.fromEstimate(rng.uniform(0, 100), rng.uniform(0.01, 2), units="g") for _ in range(n)]
+
+class TestIntervals(unittest.TestCase):
+    def test_queries_match_brute_force(self):
+        ms = readings()
+        index = IntervalIndex(ms, k=2, leafSize=4)
+        lower, upper = index.lower, index.upper
+        rng = np.random.default_rng(1)
+        for a in rng.uniform(-5, 105, 50):
+            b = a + rng.uniform(0, 3)
+            self.assertEqual(index.query(a, b).tolist(), np.nonzero((lower <= b) & (upper >= a))[0].tolist())
+            self.assertEqual(index.stab(a).tolist(), np.nonzero((lower <= a) & (upper >= a))[0].tolist())
+        pairs = set(map(tuple, index.overlappingPairs().tolist()))
+        brute = set((i, j) for i in range(len(ms)) for j in range(i + 1, len(ms)) if lower[j] <= upper[i] and upper[j] >= lower[i])
+        self.assertEqual(pairs, brute)
+
+    def test_consistent_with(self):
+        ms = [Measurement.fromStr(s) for s in ["10.0 +/- 0.1 g", "10.4 +/- 0.2 g", "9.7 +/- 0.1 g", "11.0 g"]]
+        reference = Measurement.fromStr("10.2 +/- 0.1 g")
+        self.assertEqual(consistentWith(ms, reference).tolist(), [True, True, False, False])
+        self.assertEqual(consistentWith(ms, reference, k=3).tolist(), [True, True, True, False])
+        series = consistentWith(pd.Series(ms, name="Mass (g)"), Measurement.fromStr("10200 +/- 100 mg"))
+        self.assertEqual(series.name, "Mass (g)")
+        self.assertEqual(series.tolist(), [True, True, False, False])
+        index = IntervalIndex(ms)
+        self.assertEqual(index.consistentWith(reference).tolist(), [0, 1])
+        self.assertEqual(index.stab(Measurement.fromStr("11.0 g")).tolist(), [3])
+
+if __name__ == '__main__':
+    unittest.main()
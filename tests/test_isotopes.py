@@ -0,0 +1,53 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement.util.chem.element import Element
+from pymeasurement.util.chem.compound import Compound
+
+def floats(pattern):
+    return [(float(m.sample.decimal), float(a.sample.decimal)) for m, a in pattern]
+
+class TestIsotopes(unittest.TestCase):
+    def test_compounds_do_not_import_numpy(self):
+        import subprocess
+        src = os.path.join(os.path.dirname(__file__), '..', 'src')
+        code = "import sys; sys.path.insert(0, sys.argv[1]); from pymeasurement import Measurement; Measurement.fromStr('2.00 mol H2O'); print('numpy' in sys.modules)"
+        self.assertEqual(subprocess.run([sys.executable, '-c', code, src], capture_output=True, text=True, check=True).stdout.strip(), 'False')
+
+    def test_element_isotopes(self):
+        isotopes = Element('Cl').isotopes()
+        self.assertEqual([i[0] for i in isotopes], [35, 37])
+        self.assertEqual(str(isotopes[0][1]), '34.968852682')
+        self.assertEqual(str(isotopes[1][2]), '0.2424')
+        for symbol, rows in Element.isotopeTable().items():
+            self.assertAlmostEqual(sum(float(r[2]) for r in rows), 1, places=2)
+        self.assertEqual(Element('Tc').isotopes(), [])
+
+    def test_water(self):
+        pattern = floats(Compound('H2O').isotope_pattern())
+        self.assertEqual([round(m) for m, _ in pattern], [18, 19, 20])
+        self.assertAlmostEqual(pattern[0][0], 2 * 1.00782503223 + 15.99491461957, places=6)
+        self.assertAlmostEqual(pattern[0][1], 0.999885 ** 2 * 0.99757, places=6)
+
+    def test_chlorine_pattern(self):
+        pattern = floats(Compound('CH2Cl2').isotope_pattern())
+        ratio = pattern[2][1] / pattern[0][1]
+        self.assertAlmostEqual(ratio, 2 * 0.2424 / 0.7576, places=2)
+
+    def test_methods_agree(self):
+        c = Compound('C254H377N65O75S6')
+        convolved = floats(c.isotope_pattern(method='convolve'))
+        transformed = floats(c.isotope_pattern(method='fft'))
+        self.assertEqual(len(convolved), len(transformed))
+        for (m1, a1), (m2, a2) in zip(convolved, transformed):
+            self.assertAlmostEqual(m1, m2, places=5)
+            self.assertAlmostEqual(a1, a2, places=6)
+        self.assertAlmostEqual(sum(a for _, a in convolved), 1, places=4)
+        with self.assertRaises(Exception):
+            c.isotope_pattern(method='other')
+        with self.assertRaises(Exception):
+            Compound('TcO2').isotope_pattern()
+
+if __name__ == '__main__':
+    unittest.main()
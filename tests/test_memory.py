@@ -0,0 +1,35 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement.util import memory
+
+class TestMemory(unittest.TestCase):
+    def test_object_sizes_within_budget(self):
+        sizes = memory.objectSizes(500)
+        self.assertEqual(set(sizes), {'SigFig', 'Measurement', 'Element', 'Compound'})
+        for name, size in sizes.items():
+            self.assertGreater(size, 0)
+        memory.checkBudgets(sizes)
+
+    def test_pipeline_peaks_within_budget(self):
+        rows = 2000
+        peaks = memory.pipelinePeaks(rows)
+        self.assertEqual(set(peaks), set(memory.pipelines))
+        memory.checkBudgets(peaks, memory.pipelineLimits(rows))
+
+    def test_stream_peak_does_not_grow(self):
+        small = memory.pipelinePeaks(2000, ['pipeline.stream'])['pipeline.stream']
+        large = memory.pipelinePeaks(8000, ['pipeline.stream'])['pipeline.stream']
+        self.assertLess(large, 2 * small)
+
+    def test_over_budget_raises(self):
+        with self.assertRaises(Exception) as e:
+            memory.checkBudgets({'SigFig': 700.0, 'Measurement': 100.0, 'custom': 50.0}, {'custom': 10})
+        self.assertIn('SigFig uses 700 bytes', str(e.exception))
+        self.assertIn('custom uses 50 bytes', str(e.exception))
+        self.assertNotIn('Measurement', str(e.exception))
+        self.assertEqual(memory.checkBudgets({'SigFig': 100.0}), {'SigFig': 100.0})
+
+if __name__ == '__main__':
+    unittest.main()
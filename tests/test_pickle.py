@@ -0,0 +1,44 @@
+import unittest
+import sys
+import os
+import copy
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.sigfig import SigFig
+from pymeasurement.util.chem.compound import Compound
+
+def same(a, b):
+    return vars(a).keys() == vars(b).keys() and all(vars(a)[k] == vars(b)[k] if not isinstance(vars(a)[k], SigFig) else vars(vars(a)[k]) == vars(vars(b)[k]) for k in vars(a))
+
+class TestPickle(unittest.TestCase):
+    def test_sigfig(self):
+        for s in [SigFig('3.0'), SigFig('1e3'), SigFig('2500'), SigFig('3.14159', sigfigs=3), SigFig('2', constant=True)]:
+            self.assertEqual(vars(pickle.loads(pickle.dumps(s))), vars(s))
+            self.assertEqual(vars(s.deepCopy()), vars(s))
+
+    def test_measurement(self):
+        ms = [Measurement.fromStr("3.0 +/- 0.1 m/s^2"), Measurement.fromStr("2 +/- 5% kg*m/s^2"), Measurement.fromStr("7.00"), Measurement.fromStr("3.0 +/- 0.1 m/s^2") * Measurement.fromStr("2.0 +/- 0.1 s")]
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            for m, r in zip(ms, pickle.loads(pickle.dumps(ms, protocol=protocol))):
+                self.assertTrue(same(m, r))
+                self.assertEqual(str(m), str(r))
+        for m in ms:
+            self.assertTrue(same(m, m.deepCopy()))
+            self.assertTrue(same(m, copy.deepcopy(m)))
+        m = ms[0].deepCopy()
+        m.nUnits.append('s')
+        self.assertEqual(ms[0].nUnits, ['m'])
+
+    def test_compound(self):
+        c = Compound('Ca(OH)2(aq)')
+        r = pickle.loads(pickle.dumps(c))
+        self.assertEqual(r, c)
+        self.assertEqual(vars(r).keys(), vars(c).keys())
+        self.assertEqual(str(r), 'Ca(OH)2(aq)')
+        self.assertEqual(str(r.mass), str(c.mass))
+        e = next(iter(r.composition))
+        self.assertEqual(vars(e).keys(), vars(next(iter(c.composition))).keys())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import unittest
+import sys
+import os
+import csv
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.util.pipeline import Pipeline, fileLines
+
+def double(m):
+    return m * 2
+
+class TestPipeline(unittest.TestCase):
+    def setUp(self):
+        self.readings = [f"{i}.00 +/- 0.01 g" for i in range(1, 101)]
+        self.expected = [str(Measurement.fromStr(r).to('kg') * 2) for r in self.readings]
+
+    def test_lazy_chunks(self):
+        pulled = []
+        def source():
+            for r in self.readings:
+                pulled.append(r)
+                yield r
+        chunks = Pipeline(source(), chunkSize=10).parse().map(double).convert('kg').chunks()
+        first = next(chunks)
+        self.assertEqual(len(first), 10)
+        self.assertEqual(len(pulled), 10)
+        self.assertEqual([str(m) for m in first] + [str(m) for c in chunks for m in c], self.expected)
+
+    def test_pools(self):
+        for executor in ['thread', 'process']:
+            results = Pipeline(self.readings, chunkSize=7).parse(executor=executor, workers=2).map(double, executor=executor, workers=2).convert('kg').collect()
+            self.assertEqual([str(m) for m in results], self.expected)
+
+    def test_filter_and_sinks(self):
+        pipeline = Pipeline(self.readings, chunkSize=16).parse().filter(lambda m: m > Measurement.fromStr("50.00 g"))
+        self.assertEqual(pipeline.count(), 50)
+        self.assertEqual(str(pipeline.reduce(lambda a, b: a + b, Measurement.fromStr("0.00 g"))), str(Measurement.sum([Measurement.fromStr(r) for r in self.readings[50:]])))
+        with tempfile.TemporaryDirectory() as directory:
+            source = os.path.join(directory, 'readings.txt')
+            with open(source, 'w') as f:
+                f.write('\n'.join(self.readings[:5]) + '\n\n')
+            path = os.path.join(directory, 'out.csv')
+            self.assertEqual(Pipeline(fileLines(source), chunkSize=2).parse().write(path, name='Mass (g)'), 5)
+            with open(path, newline='') as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ['Mass (g)', 'Mass Percent Uncertainty (%)'])
+            self.assertEqual(len(rows), 6)
+
+if __name__ == '__main__':
+    unittest.main()
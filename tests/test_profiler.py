@@ -0,0 +1,68 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pymeasurement
+from pymeasurement import Measurement
+from pymeasurement.sigfig import SigFig
+from pymeasurement.util import profiler
+
+class TestProfiler(unittest.TestCase):
+    def test_counts_constructions(self):
+        m1 = Measurement("2.0", uncertainty="0.13", units="m")
+        m2 = Measurement("3.0", uncertainty="0.1", units="m")
+        with pymeasurement.profile() as p:
+            m1 + m2
+        self.assertGreater(p.counts['Measurement'], 0)
+        self.assertGreater(p.counts['SigFig'], 0)
+        self.assertGreater(p.counts['Measurement.deepCopy'], 0)
+        self.assertEqual(p.calls['Measurement.__add__'], 1)
+
+    def test_counts_unit_parses(self):
+        Measurement.unitsCache.clear()
+        with pymeasurement.profile() as p:
+            Measurement("1.0", units="kg*m/s^2")
+            Measurement("2.0", units="kg*m/s^2")
+        self.assertEqual(p.counts['units.parse'], 1)
+
+    def test_disabled_outside_block(self):
+        with pymeasurement.profile() as p:
+            pass
+        Measurement("2.0", uncertainty="0.13", units="m") * 2
+        self.assertEqual(p.counts, {})
+        self.assertIsNone(profiler.active)
+        self.assertNotIn('__wrapped__', dir(Measurement.__mul__))
+        self.assertNotIn('__wrapped__', dir(SigFig.__add__))
+
+    def test_nested_profiles(self):
+        with pymeasurement.profile() as outer:
+            SigFig("2.0")
+            with pymeasurement.profile() as inner:
+                SigFig("3", sigfigs=3)
+        self.assertEqual(inner.counts, {'SigFig': 1, 'Context': 1})
+        self.assertEqual(outer.counts, {'SigFig': 2, 'Context': 2})
+
+    def test_other_threads_not_counted(self):
+        import threading
+        started, done = threading.Event(), threading.Event()
+        def work():
+            started.set()
+            while not done.is_set():
+                Measurement("2.0", uncertainty="0.1", units="m") * 2
+        thread = threading.Thread(target=work)
+        thread.start()
+        started.wait()
+        try:
+            with pymeasurement.profile() as p:
+                SigFig("2.0")
+        finally:
+            done.set()
+            thread.join()
+        self.assertEqual(p.counts, {'SigFig': 1, 'Context': 1})
+        self.assertEqual(p.calls, {})
+        self.assertNotIn('__wrapped__', dir(Measurement.__mul__))
+
+    def test_report(self):
+        with pymeasurement.profile() as p:
+            Measurement.fromStr("2.0 +/- 0.13 m") * Measurement.fromStr("3.0 +/- 0.1 m")
+        self.assertIn('Measurement.__mul__', p.report())
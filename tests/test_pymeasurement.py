@@ -160,4 +160,51 @@ class TestMeasurement(unittest.TestCase):
         self.assertEqual(m4.sample, SigFig("3.0"))
         self.assertEqual(m4.uncertainty, SigFig("0.6"))
         self.assertEqual(m4.units, "m")
-        self.assertEqual(str(m4), "3.0 +/- 0.6 m")
\ No newline at end of file
+        self.assertEqual(str(m4), "3.0 +/- 0.6 m")
+
+    def test_argsort_measurements(self):
+        ms = [Measurement.fromStr(s) for s in ["3.0 +/- 0.1 m", "2.0 +/- 0.13 m", "4.0 +/- 0.1 m"]]
+        self.assertEqual(list(Measurement.argsort(ms)), [1, 0, 2])
+        self.assertEqual(list(Measurement.argsort(ms, reverse=True)), [2, 0, 1])
+        self.assertEqual(Measurement.argmax(ms), 2)
+        self.assertEqual(Measurement.argmin(ms), 1)
+
+    def test_median_percentile_measurements(self):
+        ms = [Measurement.fromStr(s) for s in ["3.0 +/- 0.1 m", "2.0 +/- 0.13 m", "4.0 +/- 0.2 m", "5.0 +/- 0.1 m"]]
+        m = Measurement.median(ms)
+        self.assertEqual(str(m), "3.0 +/- 0.1 m")
+        self.assertEqual(str(Measurement.percentile(ms, 100)), "5.0 +/- 0.1 m")
+        self.assertEqual(str(Measurement.percentile(ms, 0)), "2.0 +/- 0.1 m")
+
+    def test_percentile_nearest_rank(self):
+        ms = [Measurement.fromStr(f"{i}.0 +/- 0.1 m") for i in [6, 3, 1, 5, 2, 4]]
+        expected = {0: "1.0", 10: "1.0", 17: "2.0", 30: "2.0", 50: "3.0", 51: "4.0", 70: "5.0", 80: "5.0", 90: "6.0", 100: "6.0"}
+        for q, value in expected.items():
+            self.assertEqual(str(Measurement.percentile(ms, q)), f"{value} +/- 0.1 m")
+
+    def test_selection_beyond_float_precision(self):
+        ms = [Measurement.fromStr(s) for s in ["1.00000000000000000003 m", "1.00000000000000000001 m", "1.00000000000000000002 m"]]
+        self.assertEqual(list(Measurement.argsort(ms)), [1, 2, 0])
+        self.assertEqual(list(Measurement.argsort(ms, reverse=True)), [0, 2, 1])
+        self.assertEqual(Measurement.argmax(ms), 0)
+        self.assertEqual(Measurement.argmin(ms), 1)
+        self.assertIs(Measurement.median(ms), ms[2])
+        self.assertIs(Measurement.percentile(ms, 100), ms[0])
+        self.assertEqual([m is n for m, n in zip(Measurement.nlargest(ms, 2), [ms[0], ms[2]])], [True, True])
+
+    def test_nlargest_measurements(self):
+        ms = [Measurement.fromStr(s) for s in ["3.0 +/- 0.1 m", "2.0 +/- 0.13 m", "4.0 +/- 0.2 m", "5.0 +/- 0.1 m"]]
+        self.assertEqual([str(m) for m in Measurement.nlargest(ms, 2)], ["5.0 +/- 0.1 m", "4.0 +/- 0.2 m"])
+        self.assertEqual(len(Measurement.nlargest(ms, 10)), 4)
+
+    def test_sum_matches_serial_fold(self):
+        ms = [Measurement.fromStr(s) for s in ["2.0 +/- 0.13 m", "3.14d m", "4.0 +/- 2% m", "1.5c m", "0.25 m", "12a m", "0.5 +/- 0.1 km"]]
+        serial = ms[0]
+        for m in ms[1:]:
+            serial += m
+        for chunkSize in [1, 2, 3, 100]:
+            self.assertEqual(str(Measurement.sum(ms, chunkSize=chunkSize)), str(serial))
+
+    def test_sum_process_pool(self):
+        ms = [Measurement.fromStr(f"{i}.{i % 10} +/- 0.1 g") for i in range(50)]
+        self.assertEqual(str(Measurement.sum(ms, processes=2, chunkSize=10)), str(Measurement.sum(ms)))
@@ -0,0 +1,50 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.util.render import toText, toMarkdown, toLatex, latexUnits
+from pymeasurement.util.chem.compound import Compound
+
+def table():
+    return {
+        'a': [Measurement.fromStr("3.0 +/- 0.1 m/s^2"), Measurement.fromStr("25000 +/- 100 m/s^2")],
+        'b': [Measurement.fromStr("2.0 +/- 5% g"), Measurement.fromStr("1.0 g")],
+        'n': ['x_1', 'y'],
+    }
+
+class TestRender(unittest.TestCase):
+    def test_text(self):
+        lines = toText(table()).split('\n')
+        self.assertEqual(lines[0].split(), ['a', '(m/s^2)', '±', 'b', '(g)', '±', 'n'])
+        self.assertEqual(lines[1].split(), ['3.0', '0.1', '2.0', '5%', 'x_1'])
+        self.assertEqual(lines[2].split(), ['2.5E+4', '0E+3', '1.0', 'y'])
+
+    def test_markdown(self):
+        lines = toMarkdown(table()).split('\n')
+        self.assertEqual(lines[0], '| a (m/s^2) | ± | b (g) | ± | n |')
+        self.assertEqual(lines[2], '| 3.0 | 0.1 | 2.0 | 5% | x_1 |')
+
+    def test_latex(self):
+        latex = toLatex(table())
+        self.assertIn(r'a (m/s$^{2}$) & $\pm$ & b (g) & $\pm$ & n \\', latex)
+        self.assertIn(r'$2.5\times10^{4}$ & $0\times10^{3}$ & 1.0 &  & y \\', latex)
+        self.assertIn(r'5\% & x\_1', latex)
+        self.assertEqual(latexUnits('kg*m/s^2'), r'kg$\cdot$m/s$^{2}$')
+
+    def test_mixed_units_and_single_column(self):
+        ms = [Measurement.fromStr("1.0 +/- 0.1 m"), Measurement.fromStr("2.0 +/- 0.1 s")]
+        self.assertEqual(toMarkdown(ms, name='x').split('\n')[2], '| 1.0 m | 0.1 |')
+
+    def test_compound_latex(self):
+        c = Compound('C6H12O6(aq)')
+        Compound.setLatexPrint(True)
+        try:
+            self.assertEqual(str(c), 'C_{6}H_{12}O_{6}(aq)')
+            self.assertEqual(str(c), c.latexString)
+        finally:
+            Compound.setLatexPrint(False)
+        self.assertEqual(str(c), 'C6H12O6(aq)')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+import sys
+import os
+import csv
+import tempfile
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import pandas as pd
+from pymeasurement import Measurement
+from pymeasurement.util.report import ReportWriter, writeReport
+
+def frame():
+    return pd.DataFrame({
+        'Trial': [1, 2, 3],
+        'Mass (g)': [Measurement.fromStr(s) for s in ["2.00 +/- 0.01 g", "4.00 +/- 0.01 g", "6.00 g"]],
+        'Force (N)': [Measurement.fromStr(s) for s in ["1.0 +/- 5% N", "2.0 +/- 0.1 N", "3.0 +/- 0.3 N"]],
+    })
+
+def read(path):
+    with open(path, newline='') as f:
+        return list(csv.reader(f))
+
+class TestReport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'report.csv')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_matches_export_column(self):
+        df = frame()
+        rows = writeReport(self.path, df, chunkSize=2, asPercent={'Force (N)': False})
+        self.assertEqual(rows, 3)
+        saved = df.copy()
+        Measurement.exportColumn(saved, df['Mass (g)'])
+        Measurement.exportColumn(saved, df['Force (N)'], asPercent=False)
+        written = read(self.path)
+        self.assertEqual(written[0], list(saved.columns))
+        self.assertEqual(written[0], ['Trial', 'Mass (g)', 'Mass Percent Uncertainty (%)', 'Force (N)', 'Force Absolute Uncertainty (N)'])
+        for row, (_, expected) in zip(written[1:], saved.iterrows()):
+            self.assertEqual(row, [str(v) if v is not None else '' for v in expected])
+
+    def test_chunks_and_errors(self):
+        df = frame()
+        with ReportWriter(self.path, addUncertainty=False) as writer:
+            writer.write(df.iloc[:1]).write(df.iloc[1:])
+            with self.assertRaises(Exception):
+                writer.write({'Other': [1]})
+        self.assertEqual(read(self.path), [['Trial', 'Mass (g)', 'Force (N)'], ['1', '2.00', '1.0'], ['2', '4.00', '2.0'], ['3', '6.00', '3.0']])
+        with self.assertRaises(Exception):
+            ReportWriter(os.path.join(self.directory.name, 'report.txt'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,36 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.util.rolling import RollingStatistics, ExponentialStatistics
+
+readings = ["20.23d g", "13.86d g", "46.37d g", "21.4d g", "19.987d g", "30.1d g"]
+
+class TestRollingStatistics(unittest.TestCase):
+    def test_matches_average(self):
+        ms = [Measurement.fromStr(r) for r in readings]
+        stats = RollingStatistics(window=3)
+        for i, m in enumerate(ms):
+            stats.push(m)
+            window = ms[max(0, i - 2):i + 1]
+            self.assertEqual(str(stats.average()), str(Measurement.average(window)))
+            self.assertEqual(str(stats.max()), str(Measurement.max(window).sample) + " g")
+            self.assertEqual(str(stats.min()), str(Measurement.min(window).sample) + " g")
+        self.assertEqual(len(stats), 3)
+
+    def test_standard_deviation(self):
+        stats = RollingStatistics().extend([Measurement.fromStr(r) for r in ["2.0 g", "4.0 g", "6.0 g"]])
+        self.assertEqual(str(stats.standardDeviation()), "4.00 +/- 2.00 g")
+        self.assertEqual(str(stats.standardError()), "4.00 +/- 1.15 g")
+
+    def test_mixed_units(self):
+        stats = RollingStatistics(window=2).push(Measurement.fromStr("2.0 g"))
+        with self.assertRaises(Exception):
+            stats.push(Measurement.fromStr("2.0 m"))
+
+class TestExponentialStatistics(unittest.TestCase):
+    def test_weighted_mean(self):
+        stats = ExponentialStatistics(0.5).extend([Measurement.fromStr(r) for r in ["2.0 g", "4.0 g"]])
+        self.assertEqual(str(stats.average()), "3.0 +/- 1.0 g")
+        self.assertAlmostEqual(stats.effectiveCount(), 2.0)
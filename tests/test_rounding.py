@@ -0,0 +1,45 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+import numpy as np
+from pymeasurement.sigfig import SigFig
+from pymeasurement.util.rounding import roundSigFigs, roundDecimals, toSigFigs
+
+def values():
+    rng = np.random.default_rng(0)
+    ties = [0.125, 2.5, 3.5, -2.5, 0.15, 0.25, 0.35, 2.675, 1.005, 9.995, 99.95, 999.5, 0.05, 1234567.5]
+    edges = [0.0, -0.0, 1e-300, 5e-324, 9.9999, 99.999999999999, 12345.0, 1e15, 123456789012345678.0]
+    return np.concatenate([rng.uniform(-1e3, 1e3, 500), 10.0 ** rng.uniform(-12, 12, 500), np.round(rng.uniform(0, 100, 500), 3), ties, edges])
+
+class TestRounding(unittest.TestCase):
+    def test_sigfigs_match_sigfig(self):
+        vs = values()
+        for n in [1, 2, 3, 7, 15, 17]:
+            rounded, exponents = roundSigFigs(vs, n)
+            for v, r, e, s in zip(vs.tolist(), rounded.tolist(), exponents.tolist(), toSigFigs(vs, sigfigs=n)):
+                expected = SigFig(repr(v), sigfigs=n)
+                self.assertEqual(s.__getstate__(), expected.__getstate__())
+                self.assertEqual(r, float(expected.decimal))
+                self.assertEqual(e, expected.decimal.as_tuple().exponent)
+
+    def test_decimals_match_sigfig(self):
+        vs = values()
+        vs = vs[np.abs(vs) < 1e15]
+        for d in [-5, -2, -1, 0, 2]:
+            rounded, sigfigs = roundDecimals(vs, d)
+            for v, r, n, s in zip(vs.tolist(), rounded.tolist(), sigfigs.tolist(), toSigFigs(vs, decimals=d)):
+                expected = SigFig(repr(v), decimals=d)
+                self.assertEqual(s.__getstate__(), expected.__getstate__())
+                self.assertEqual(r, float(expected.decimal))
+                self.assertEqual(n, expected.sigfigs)
+
+    def test_half_even_and_trailing_zeros(self):
+        self.assertEqual([str(s) for s in toSigFigs([0.125, 0.135, 2.5, 9.996, 0.0, 12345.0], sigfigs=[2, 2, 1, 3, 3, 2])], ['0.12', '0.14', '2', '10.0', '0.000', '1.2E+4'])
+        self.assertEqual([str(s) for s in toSigFigs([2.675, 1.5, 0.004], decimals=[-2, 0, -2])], ['2.68', '2', '0.00'])
+        rounded, sigfigs = roundDecimals(np.array([[1.25, 3.0]]), np.array([-1, -2]))
+        self.assertEqual(rounded.tolist(), [[1.2, 3.0]])
+        self.assertEqual(sigfigs.tolist(), [[2, 3]])
+
+if __name__ == '__main__':
+    unittest.main()
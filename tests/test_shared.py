@@ -0,0 +1,71 @@
+import unittest
+import sys
+import os
+import pickle
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.util.formula import Formula
+from pymeasurement.util.shared import SharedMeasurementArray, parallelFormula
+
+def column(n, units):
+    return [Measurement.fromStr(f"{i + 1}.{i % 10}0 +/- {'2%' if i % 3 == 0 else '0.05'} {units}") for i in range(n)]
+
+class TestShared(unittest.TestCase):
+    def test_round_trip(self):
+        ms = column(20, 'kg') + [Measurement.fromStr("1200 kg"), Measurement.fromStr("-0.0030 +/- 0.0001 kg"), Measurement.fromFloat(2.5, 'kg'), Measurement.fromStr("0.000 +/- 0.001 kg")]
+        with SharedMeasurementArray.fromMeasurements(ms) as shared:
+            self.assertEqual([m.__getstate__() for m in shared.tolist()], [m.__getstate__() for m in ms])
+            self.assertEqual(str(shared[-1]), str(ms[-1]))
+            samples, uncertainties, units = shared.toArrays()
+            expected = Measurement.toArrays(ms)
+            self.assertEqual(samples.tolist(), expected[0].tolist())
+            self.assertEqual(units, 'kg')
+            self.assertLess(len(pickle.dumps(shared)), 200)
+            attached = pickle.loads(pickle.dumps(shared))
+            attached[0] = ms[5]
+            self.assertEqual(str(shared[0]), str(ms[5]))
+            attached.close()
+        with self.assertRaises(Exception):
+            SharedMeasurementArray.fromMeasurements([Measurement.fromStr("123456789.0123456789 +/- 1E-10 m")])
+        with SharedMeasurementArray(1, 'm') as shared:
+            with self.assertRaises(Exception):
+                shared[0] = Measurement.fromStr("123456789.0123456789 +/- 1E-10 m")
+
+    def test_round_trip_quotient(self):
+        ms = [Measurement.fromStr("1.00 m") / Measurement.fromStr("3.00 s"), Measurement.fromStr("-2.0 +/- 0.1 m") / Measurement.fromStr("7.000 +/- 0.003 s")]
+        with SharedMeasurementArray.fromMeasurements(ms) as shared:
+            for m, unpacked in zip(ms, shared.tolist()):
+                self.assertEqual(unpacked.sample.decimalValue, m.sample.decimalValue)
+                self.assertEqual(str(unpacked), str(m))
+            self.assertEqual(shared[1].uncertainty.decimalValue, ms[1].uncertainty.decimalValue)
+            self.assertEqual(str(shared[0].sample.decimalValue), "0.3333333333333333333333333333")
+
+    def test_attach_from_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        from multiprocessing import resource_tracker
+        register = resource_tracker.register
+        with SharedMeasurementArray.fromMeasurements(column(4, 'kg')) as shared:
+            with ThreadPoolExecutor(8) as pool:
+                attached = list(pool.map(lambda _: SharedMeasurementArray.attach(shared.name, 4, 'kg'), range(64)))
+            self.assertEqual(str(attached[-1][2]), str(shared[2]))
+            for a in attached:
+                a.close()
+        self.assertIs(resource_tracker.register, register)
+
+    def test_parallel_formula(self):
+        m, a = column(101, 'kg'), column(101, 'm/s^2')
+        with SharedMeasurementArray.fromMeasurements(m) as sm, SharedMeasurementArray.fromMeasurements(a) as sa:
+            with parallelFormula('F = m * a * k', {'m': sm, 'a': sa, 'k': Measurement.fromStr("2.0 +/- 0.1")}, workers=2, chunkSize=16) as result:
+                expected = Formula('F = m * a * k')(m=m, a=a, k=Measurement.fromStr("2.0 +/- 0.1"))
+                self.assertEqual(result.units, expected[0].units)
+                self.assertEqual([str(r) for r in result.tolist()], [str(e) for e in expected])
+
+    def test_errors(self):
+        with self.assertRaises(Exception):
+            SharedMeasurementArray.fromMeasurements([Measurement.fromStr("1 kg"), Measurement.fromStr("1 s")])
+        with SharedMeasurementArray(2, 'kg') as shared:
+            with self.assertRaises(Exception):
+                shared[0:2] = [Measurement.fromStr("1 kg")]
+
+if __name__ == '__main__':
+    unittest.main()
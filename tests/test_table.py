@@ -0,0 +1,59 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from pymeasurement import Measurement
+from pymeasurement.util.formula import Formula
+from pymeasurement.util.table import MeasurementTable
+
+def table():
+    t = MeasurementTable({
+        'm': [Measurement.fromStr(s) for s in ["2.00 +/- 0.01 kg", "4.00 +/- 0.01 kg", "6.00 +/- 0.02 kg"]],
+        'a': [Measurement.fromStr(s) for s in ["1.5 +/- 0.1 m/s^2", "2.5 +/- 0.1 m/s^2", "3.5 +/- 0.2 m/s^2"]],
+    })
+    t.derive('F = m * a')
+    t.derive('W = F * d', d=Measurement.fromStr("0.50 +/- 0.01 m"))
+    return t
+
+class TestTable(unittest.TestCase):
+    def test_matches_formula(self):
+        t = table()
+        force = Formula('F = m * a')(m=t['m'], a=t['a'])
+        self.assertEqual([str(f) for f in t['F']], [str(f) for f in force])
+        self.assertEqual([str(w) for w in t['W']], [str(f * Measurement.fromStr("0.50 +/- 0.01 m")) for f in force])
+        self.assertEqual(t.rowsComputed, 6)
+
+    def test_incremental_recompute(self):
+        t = table()
+        t.toDataFrame()
+        t.setCell('m', 1, Measurement.fromStr("5.00 +/- 0.01 kg"))
+        self.assertEqual(t.dirty, {'F': {1}, 'W': {1}})
+        self.assertEqual(str(t.get('W', 1)), str(Measurement.fromStr("5.00 +/- 0.01 kg") * t['a'][1] * Measurement.fromStr("0.50 +/- 0.01 m")))
+        self.assertEqual(t.rowsComputed, 8)
+        self.assertEqual(t.get('F', 0), (t['m'][0] * t['a'][0]))
+        self.assertEqual(t.rowsComputed, 8)
+        t.setColumn('a', t['a'][::-1])
+        t['W']
+        self.assertEqual(t.rowsComputed, 14)
+
+    def test_errors(self):
+        t = table()
+        with self.assertRaises(Exception):
+            t.setCell('F', 0, Measurement.fromStr("1 N"))
+        with self.assertRaises(Exception):
+            t.derive('m * a', name='a')
+        with self.assertRaises(Exception):
+            t.derive('F = W * 2')
+        with self.assertRaises(Exception):
+            t.setColumn('m', t['m'][:2])
+        with self.assertRaises(Exception):
+            t.setCell('m', 2, Measurement.fromStr("500 +/- 1 g"))
+        self.assertEqual(str(t['m'][2]), "6.00 +/- 0.02 kg")
+
+    def test_constant_column(self):
+        t = table()
+        t.derive('k = 2 * 3')
+        self.assertEqual([str(k) for k in t['k']], ["6", "6", "6"])
+
+if __name__ == '__main__':
+    unittest.main()
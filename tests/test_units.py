@@ -0,0 +1,108 @@
+import unittest
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+from decimal import Decimal
+from pymeasurement import Measurement
+from pymeasurement.util.units import registry, UnitRegistry
+
+class TestUnits(unittest.TestCase):
+    def test_conversion_factor(self):
+        self.assertEqual(registry.conversionFactor('kg', 'g'), Decimal('1000'))
+        self.assertEqual(registry.conversionFactor('N', 'g*m/s^2'), Decimal('1000'))
+        self.assertEqual(registry.conversionFactor('L', 'cm^3'), Decimal('1000'))
+        self.assertEqual(registry.conversionFactor('km/h', 'm/s'), Decimal('1000') / Decimal('3600'))
+        self.assertEqual(registry.conversionFactor('mmol/mL', 'M'), Decimal('1'))
+        with self.assertRaises(Exception):
+            registry.conversionFactor('kg', 'm')
+        with self.assertRaises(Exception):
+            registry.conversionFactor('g H2O', 'g NaCl')
+
+    def test_measurement_to(self):
+        m = Measurement.fromStr("2.50 +/- 0.01 kg").to('g')
+        self.assertEqual(str(m), "2.50E+3 +/- 1E+1 g")
+        self.assertEqual(m.units, "g")
+        m = Measurement.fromStr("2.50 +/- 2% kg").to('g')
+        self.assertEqual(str(m), "2.50E+3 +/- 2% g")
+
+    def test_add_different_units(self):
+        m = Measurement.fromStr("1.000 +/- 0.001 kg") + Measurement.fromStr("250.0 +/- 0.1 g")
+        self.assertEqual(str(m), "1.250 +/- 0.001 kg")
+        with self.assertRaises(Exception):
+            Measurement.fromStr("1.0 kg") + Measurement.fromStr("1.0 m")
+
+    def test_subtract_different_units(self):
+        m = Measurement.fromStr("1.000 +/- 0.001 kg") - Measurement.fromStr("250.0 +/- 0.1 g")
+        self.assertEqual(str(m), "0.750 +/- 0.001 kg")
+        m = Measurement.fromStr("250.0 +/- 0.1 g") - Measurement.fromStr("1.000 +/- 0.001 kg")
+        self.assertEqual(str(m), "-750 +/- 1 g")
+        with self.assertRaises(Exception):
+            Measurement.fromStr("1.0 kg") - Measurement.fromStr("1.0 m")
+
+    def test_power_units(self):
+        m = Measurement("2.0", units="m") * Measurement("3.0", units="m")
+        self.assertEqual(str(m + Measurement("1.0", units="m^2")), "7.0 m^2")
+
+    def test_convert_column(self):
+        column = [Measurement.fromStr("1.5 km"), Measurement.fromStr("250 m")]
+        self.assertEqual([str(m) for m in Measurement.convertColumn(column, 'm')], ["1.5E+3 m", "2.5E+2 m"])
+
+    def test_custom_registry(self):
+        r = UnitRegistry().define('m').define('furlong', 'm', '201.168', prefixable=False)
+        self.assertEqual(r.conversionFactor('furlong', 'km'), Decimal('0.201168'))
+
+class TestDeriveUnits(unittest.TestCase):
+    def test_derive_units(self):
+        from pymeasurement.util.units import deriveUnits
+        self.assertEqual(deriveUnits('m * a', {'m': 'kg', 'a': 'm/s^2'}), '(kg*m)/s^2')
+        self.assertEqual(deriveUnits('2 * x', {'x': 'm'}), 'm')
+        self.assertEqual(deriveUnits('1 / x', {'x': 's'}), '1/s')
+        self.assertEqual(deriveUnits('sqrt(x**2 + y**2)', {'x': 'm', 'y': 'm'}), 'm')
+        self.assertEqual(deriveUnits('log(x / y)', {'x': 'm', 'y': 'm'}), None)
+        self.assertEqual(deriveUnits('sin(t)', {'t': 'rad'}), None)
+
+    def test_dimension_errors(self):
+        from pymeasurement.util.units import deriveUnits
+        with self.assertRaises(Exception):
+            deriveUnits('log(x)', {'x': 'm'})
+        with self.assertRaises(Exception):
+            deriveUnits('x + y', {'x': 'm', 'y': 's'})
+        with self.assertRaises(Exception):
+            deriveUnits('sqrt(x)', {'x': 'm'})
+
+    def test_apply_func_units(self):
+        m = Measurement.fromStr("2.0 +/- 0.1 kg")
+        a = Measurement.fromStr("3.0 +/- 0.1 m/s^2")
+        self.assertEqual(Measurement.apply_func('m * a', m=m, a=a).units, '(kg*m)/s^2')
+        self.assertEqual(Measurement.apply_func('m * a', m=m, a=a, units='N').units, 'N')
+        self.assertEqual(str(Measurement.apply_func('2 * m', m=m, units='g')), "4.0E+3 +/- 2E+2 g")
+
+    def test_apply_func_unit_warnings(self):
+        from pymeasurement.util.units import UnitWarning
+        m = Measurement.fromStr("2.0 +/- 0.1 kg")
+        with self.assertWarns(UnitWarning):
+            self.assertIsNone(Measurement.apply_func('exp(m)', m=m).units)
+        with self.assertWarns(UnitWarning):
+            self.assertIsNone(Measurement.apply_func('x + 1', x=m).units)
+        with self.assertWarns(UnitWarning):
+            self.assertIsNone(Measurement.apply_func('sqrt(x)', x=Measurement.fromStr("4.00 +/- 0.02 m")).units)
+        with self.assertWarns(UnitWarning):
+            self.assertEqual(Measurement.apply_func('exp(m)', m=m, units='kg').units, 'kg')
+        with self.assertWarns(UnitWarning):
+            self.assertEqual(str(Measurement.apply_func('2 * m', m=m, units='s')), "4.0 +/- 0.2 kg")
+
+    def test_apply_func_strict_units(self):
+        m = Measurement.fromStr("2.0 +/- 0.1 kg")
+        Measurement.setStrictUnits(True)
+        try:
+            with self.assertRaises(Exception):
+                Measurement.apply_func('exp(m)', m=m)
+            with self.assertRaises(Exception):
+                Measurement.apply_func('exp(m)', m=m, units='kg')
+            self.assertEqual(Measurement.apply_func('2 * m', m=m, units='g').units, 'g')
+            with self.assertRaises(Exception):
+                Measurement.apply_func('2 * m', m=m, units='s')
+            with self.assertRaises(Exception):
+                Measurement.apply_func('x + 1', x=m)
+        finally:
+            Measurement.setStrictUnits(False)